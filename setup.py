@@ -1,27 +1,21 @@
-from setuptools import setup, find_packages
+# Project metadata and the package list live in pyproject.toml; this shim
+# only exists for tools that still invoke setup.py directly.
+import os
+import sys
 
-setup(
-    name="repolens",
-    # ...existing code...
-    description="AI-powered codebase understanding made simple",
-    long_description=open("README.md").read(),
-    long_description_content_type="text/markdown",
-    keywords=[
-        "ai", "codebase", "analysis", "llm", "chatgpt", "claude",
-        "developer-tools", "code-analysis", "repository", "documentation"
-    ],
-    classifiers=[
-        "Development Status :: 4 - Beta",
-        "Intended Audience :: Developers",
-        "Topic :: Software Development :: Documentation",
-        "Topic :: Software Development :: Libraries :: Python Modules",
-        "License :: OSI Approved :: MIT License",
-        "Programming Language :: Python :: 3",
-        "Programming Language :: Python :: 3.8",
-        "Programming Language :: Python :: 3.9",
-        "Programming Language :: Python :: 3.10",
-        "Programming Language :: Python :: 3.11",
-    ],
-    # ...existing code...
-)
 
+def _setup():
+    # pyproject.toml declares readme = "README.md"; fail before paying for the
+    # setuptools import when building from an incomplete checkout.
+    readme = os.path.join(os.path.dirname(os.path.abspath(__file__)), "README.md")
+    if not os.path.exists(readme):
+        sys.stderr.write("README.md missing; run from the project root\n")
+        sys.exit(2)
+
+    from setuptools import setup
+
+    setup()
+
+
+if __name__ == "__main__":
+    _setup()
@@ -15,23 +15,33 @@ SIMPLIFIED CLI - Developer-friendly interface:
 import typer
 import time
 import os
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import Tuple, Optional
+import sys
+import threading
+import multiprocessing
+from collections import deque
+from functools import lru_cache
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, wait
+from typing import TYPE_CHECKING, Iterator, List, Sequence, Tuple, Optional
 
 from rich.console import Console
-from rich.progress import Progress, SpinnerColumn, BarColumn, TextColumn, TimeRemainingColumn
-from rich.syntax import Syntax
 from rich.table import Table
 from rich.panel import Panel
 from rich.prompt import Prompt, Confirm, IntPrompt
 
-from src.librarian.watcher import start_watching, IndexingPipeline
-from src.librarian.db import LanceDBManager
-from src.librarian.embeddings import EmbeddingEngine
+from src.librarian.consts import DB_BATCH_SIZE, EMBEDDING_BATCH_SIZE
 from src.librarian.cache import FileHashCache, EmbeddingCache
+from src.librarian.query_cache import get_query_embedding_cache, get_search_result_cache
 from src.cli.workspace import get_workspace_manager
 from src.cli.services import get_service_manager
 
+# The indexing stack (LanceDB, pyarrow, embedding providers) and the heavier
+# rich widgets are imported inside the commands that need them, so --help and
+# the small commands start without paying for them.
+if TYPE_CHECKING:
+    from src.librarian.db import LanceDBManager
+    from src.librarian.embeddings import EmbeddingEngine
+    from src.librarian.watcher import IndexingPipeline
+
 app = typer.Typer(
     help="🔍 Codebase Librarian - Learn from your codebase with semantic search",
     no_args_is_help=False,
@@ -43,6 +53,58 @@ console = Console()
 workspace = get_workspace_manager()
 service_mgr = get_service_manager()
 
+# Directories never worth descending into when looking for source files
+IGNORED_DIRS = frozenset({
+    'bin', 'obj', 'node_modules', '__pycache__', 'venv', '.git', 'target', 'build', 'dist'
+})
+
+# Below this many files, worker process startup costs more than it saves
+PROCESS_POOL_MIN_FILES = 200
+
+# Indexing runs touching at least this many files rebuild the vector index
+VECTOR_INDEX_MIN_FILES = 500
+
+# Directories modified more recently than this are re-read on the next walk
+DIR_MTIME_GRACE_NS = 2_000_000_000
+
+# Mount point of the indexed codebase inside the container; stripped for display
+CODEBASE_PREFIX = '/app/codebase/'
+
+
+@lru_cache(maxsize=1)
+def _get_db() -> "LanceDBManager":
+    """Shared database handle, opened on first use."""
+    from src.librarian.db import LanceDBManager
+    return LanceDBManager()
+
+
+def _invalidate_db_caches():
+    """Forget the shared DB handle and cached search results after the index changed."""
+    _get_db.cache_clear()
+    get_search_result_cache().clear()
+
+
+@lru_cache(maxsize=1)
+def _get_engine() -> "EmbeddingEngine":
+    """Shared embedding engine for queries, created on first use."""
+    from src.librarian.embeddings import EmbeddingEngine
+    return EmbeddingEngine()
+
+
+def _prewarm():
+    """
+    Open the database and wake the embedding model in a background thread,
+    so the first search from the menu doesn't pay for either.
+    """
+    def warm():
+        try:
+            _get_db()
+            _get_engine().dimension  # Probes the provider, which loads the model
+        except Exception:
+            pass  # The menu action that needs them reports the error
+    
+    threading.Thread(target=warm, daemon=True).start()
+
 
 def format_time(seconds: float) -> str:
     """Format seconds into human-readable string"""
@@ -56,98 +118,256 @@ def format_time(seconds: float) -> str:
         return f"{hours}h {minutes}m"
 
 
-@app.command()
-def index(
-    path: str = typer.Argument(None, help="Directory to index (auto-detected if not specified)"),
-    skip_confirm: bool = typer.Option(False, "--yes", "-y", help="Skip confirmation prompt"),
-    force: bool = typer.Option(False, "--force", "-f", help="Force re-index all files (ignore delta)"),
-    workers: int = typer.Option(8, "--workers", "-w", help="Number of parallel workers")
-):
+def _list_dir(dirpath: str) -> Tuple[List[str], List[str]]:
+    """Return (file_names, subdirectory_names) of a directory, without following dir symlinks"""
+    files, subdirs = [], []
+    with os.scandir(dirpath) as it:
+        for entry in it:
+            if entry.is_dir(follow_symlinks=False):
+                subdirs.append(entry.name)
+            elif entry.is_file():
+                files.append(entry.name)
+    return files, subdirs
+
+
+def _iter_source_files(
+    root: str,
+    suffixes: Tuple[str, ...],
+    ignored_dirs: frozenset = IGNORED_DIRS,
+    file_cache: Optional[FileHashCache] = None
+) -> Iterator[str]:
     """
-    Scans and indexes a codebase.
-    
-    Features:
-    - Auto-detects directory if not specified
-    - Remembers last used path
-    - Delta indexing: only indexes changed files (use --force to re-index all)
-    - Parallel processing with configurable workers
-    - Persistent embedding cache for faster re-indexing
+    Yield paths of files under root whose extension is in suffixes.
+    
+    Walks breadth-first with os.scandir so the file/directory checks use the
+    type information cached on each entry instead of a stat per path.
+    Hidden directories and anything in ignored_dirs are skipped. Extensions
+    are compared like os.path.splitext does (last dot, not a leading one),
+    with a set lookup per file.
+    
+    With a file_cache, each directory is stat'ed first and its listing is
+    taken from the cache when its mtime is unchanged, so only directories
+    where entries were added, removed or renamed are read again. Once a
+    walk completes, cached listings under root that it no longer reached
+    (removed or renamed directories) are dropped.
     """
+    extensions = frozenset(s.lower().lstrip('.') for s in suffixes)
+    listings = file_cache.load_dir_listings() if file_cache else None
+    updated = []
+    visited = set()
+    stale = []
+    # Listings of directories modified within the mtime granularity could
+    # miss an entry created in the same tick, so they are not cached
+    racy_after = time.time_ns() - DIR_MTIME_GRACE_NS
+    pending = deque([root])
     
-    # Auto-detect path if not provided
-    if path is None:
-        path = workspace.get_default_path()
-        project_name = workspace.detect_project_name(path)
-        console.print(f"[dim]💡 Auto-detected: {project_name} ({path})[/dim]\n")
-    
-    if not os.path.exists(path):
-        console.print(f"[red]Path {path} does not exist.[/red]")
-        return
-    
-    # Save for next time
-    workspace.save_last_path(path)
+    try:
+        while pending:
+            dirpath = pending.popleft()
+            try:
+                if listings is None:
+                    files, subdirs = _list_dir(dirpath)
+                else:
+                    mtime_ns = os.stat(dirpath).st_mtime_ns
+                    cached = listings.get(dirpath)
+                    if cached and cached[0] == mtime_ns:
+                        _, files, subdirs = cached
+                    else:
+                        files, subdirs = _list_dir(dirpath)
+                        if mtime_ns < racy_after:
+                            updated.append((dirpath, mtime_ns, files, subdirs))
+                    visited.add(dirpath)
+            except OSError:
+                # Unreadable directory - skip it like os.walk does
+                continue
+            
+            # Join once per directory rather than once per entry
+            prefix = os.path.join(dirpath, '')
+            for name in subdirs:
+                if name[:1] != '.' and name not in ignored_dirs:
+                    pending.append(prefix + name)
+            for name in files:
+                stem, _, ext = name.rpartition('.')
+                if stem.strip('.') and ext.lower() in extensions:
+                    yield prefix + name
         
-    console.print(f"[bold green]Indexing {path}...[/bold green]")
+        if listings:
+            # Only a full walk shows which directories are gone
+            root_prefix = os.path.join(root, '')
+            stale = [
+                dirpath for dirpath in listings
+                if dirpath not in visited and (dirpath == root or dirpath.startswith(root_prefix))
+            ]
+    finally:
+        if updated or stale:
+            file_cache.save_dir_listings(updated, removed=stale)
+
+
+def _compute_file_delta(path: str) -> Tuple[List[str], List[str], List[str]]:
+    """
+    Walk path for supported files and split them into (new, modified, unchanged).
     
-    # Count total .cs files first
-    console.print("[yellow]Scanning directory...[/yellow]")
-    cs_files = []
+    Shared by diff and index so both classify files the same way: one walk,
+    one query against the file hash cache and one stat per file.
+    """
+    from src.librarian.chunking import get_factory
     
-    for root, dirs, files in os.walk(path):
-        # Skip ignored directories
-        dirs[:] = [d for d in dirs if not d.startswith('.') and d not in ['bin', 'obj', 'node_modules']]
-        
-        for file in files:
-            if file.endswith(".cs"):
-                cs_files.append(os.path.join(root, file))
+    suffixes = tuple(get_factory().get_supported_extensions())
+    file_cache = FileHashCache()
+    return file_cache.partition_files(
+        list(_iter_source_files(path, suffixes, file_cache=file_cache))
+    )
+
+
+def _scan_and_prepare(
+    path: str,
+    suffixes: Tuple[str, ...],
+    workers: int,
+    delta: bool = True
+) -> Tuple[List[str], List[str], "IndexingPipeline"]:
+    """
+    Collect the source files under path and build an IndexingPipeline.
     
-    total_files = len(cs_files)
+    Returns (all_files, files_to_index, pipeline). With delta, files_to_index
+    holds only new and modified files, classified on the scan thread right
+    after the walk; otherwise it is all_files.
     
-    if total_files == 0:
-        console.print("[yellow]No C# files found in the specified directory.[/yellow]")
-        return
+    The walk runs on a background thread while the pipeline (database and
+    embedding engine) is set up here, and a spinner shows the running file
+    count until the walk finishes.
+    """
+    from src.librarian.watcher import IndexingPipeline
     
-    # Initialize pipeline for delta indexing check
-    pipeline = IndexingPipeline(max_workers=workers)
+    found = []
     
-    # Check for delta indexing
-    files_to_index = cs_files
-    skipped_files = 0
+    def scan():
+        file_cache = FileHashCache()
+        for filepath in _iter_source_files(path, suffixes, file_cache=file_cache):
+            found.append(filepath)
+        if not delta:
+            return found
+        new, modified, _ = file_cache.partition_files(found)
+        return new + modified
+    
+    with ThreadPoolExecutor(max_workers=1) as scanner, \
+            console.status("[yellow]Scanning directory...[/yellow]") as spinner:
+        walk = scanner.submit(scan)
+        pipeline = IndexingPipeline(max_workers=workers)
+        while not walk.done():
+            wait([walk], timeout=0.1)
+            spinner.update(f"[yellow]Scanning directory... {len(found):,} files found[/yellow]")
+        files_to_index = walk.result()
+    
+    return found, files_to_index, pipeline
+
+
+def _index_files(pipeline: "IndexingPipeline", filepaths: Sequence[str], workers: int) -> Iterator[Tuple[int, int, str]]:
+    """
+    Index files, yielding (success, chunks, error) for each one.
+    
+    Workers only read and chunk files; for larger jobs they are separate
+    processes so the regex chunkers are not serialized on the GIL. Chunks
+    from several files are then embedded together in a single embed_batch
+    call, so the embedding backend sees a few large requests instead of one
+    small request per file. Embedded files are buffered until about
+    DB_BATCH_SIZE rows are pending and written by a background thread, one
+    write at a time, while the next batches are embedded.
+    """
+    from src.librarian.watcher import bounded_map, init_chunk_worker, prepare_file
     
-    if not force:
-        console.print("[cyan]Checking for changed files (delta indexing)...[/cyan]")
-        files_to_index = pipeline.get_changed_files(cs_files)
-        skipped_files = total_files - len(files_to_index)
-        
-        if skipped_files > 0:
-            console.print(f"[green]✓ Skipping {skipped_files:,} unchanged files[/green]")
+    write_files = []
+    write_vectors = []
+    writes = deque()
     
-    if len(files_to_index) == 0:
-        console.print("[bold green]✓ All files already indexed and up-to-date![/bold green]")
-        return
+    def report(batch, results):
+        for prepared, (success, chunks, error) in zip(batch, results):
+            yield success, chunks, f"{prepared.filepath}: {error}" if error else ""
     
-    # Estimate time (optimized: ~8-15 files/sec with caching)
-    est_rate = 10.0 if skipped_files > 0 else 5.0  # Faster with warm cache
-    est_seconds = len(files_to_index) / est_rate
-    est_time = format_time(est_seconds)
+    def finish_writes():
+        while writes:
+            batch, future = writes.popleft()
+            try:
+                results = future.result()
+            except Exception as e:
+                results = [(0, 0, str(e))] * len(batch)
+            yield from report(batch, results)
+    
+    def start_write():
+        # Keep a single write in flight so LanceDB sees one writer
+        yield from finish_writes()
+        batch = write_files[:]
+        writes.append((batch, writer.submit(pipeline.write_batch, batch, write_vectors[:])))
+        write_files.clear()
+        write_vectors.clear()
+    
+    def flush(batch):
+        try:
+            vectors = pipeline.embed_chunks(batch)
+        except Exception as e:
+            yield from report(batch, [(0, 0, str(e))] * len(batch))
+            return
+        write_files.extend(batch)
+        write_vectors.extend(vectors)
+        if len(write_vectors) >= DB_BATCH_SIZE:
+            yield from start_write()
+    
+    if len(filepaths) >= PROCESS_POOL_MIN_FILES:
+        # Chunking is CPU-bound, so size the pool by cores rather than by
+        # the I/O worker count the embedding engine uses
+        pool_size = os.cpu_count() or 1
+        # Spawn rather than fork: by now the pipeline has LanceDB (not fork
+        # safe) and the HTTP client open, and the progress, scan and prewarm
+        # threads may be running. Workers only need prepare_file.
+        executor = ProcessPoolExecutor(
+            max_workers=pool_size,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=init_chunk_worker
+        )
+    else:
+        pool_size = workers
+        executor = ThreadPoolExecutor(max_workers=workers)
     
-    console.print(f"[cyan]Files to index: {len(files_to_index):,} / {total_files:,}[/cyan]")
-    console.print(f"[yellow]Estimated time: ~{est_time}[/yellow]")
-    console.print("")
+    batch = []
+    batch_chunks = 0
     
-    # Confirmation for large jobs
-    if len(files_to_index) > 1000 and not skip_confirm:
-        console.print(f"[bold yellow]⚠️  Large indexing job ({len(files_to_index):,} files)[/bold yellow]")
-        if not Confirm.ask(f"This will take approximately {est_time}. Continue?", default=False):
-            console.print("[yellow]Indexing cancelled[/yellow]")
-            return
-        console.print("")
+    with executor, ThreadPoolExecutor(max_workers=1) as writer:
+        for filepath, future in bounded_map(executor, prepare_file, filepaths, 2 * pool_size):
+            try:
+                prepared = future.result()
+            except Exception as e:
+                yield 0, 0, f"{filepath}: {str(e)}"
+                continue
+            
+            batch.append(prepared)
+            batch_chunks += len(prepared.chunks)
+            if batch_chunks >= EMBEDDING_BATCH_SIZE:
+                yield from flush(batch)
+                batch = []
+                batch_chunks = 0
+        
+        if batch:
+            yield from flush(batch)
+        if write_files:
+            yield from start_write()
+        yield from finish_writes()
+
+
+def _index_with_progress(
+    pipeline: "IndexingPipeline",
+    files_to_index: Sequence[str],
+    workers: int
+) -> Tuple[int, int, List[str], float]:
+    """
+    Run _index_files under a progress bar.
     
+    Returns (files_indexed, total_chunks, errors, elapsed_seconds).
+    """
     files_indexed = 0
     total_chunks = 0
-    start_time = time.time()
+    start_time = time.monotonic()
     errors = []
     
+    from rich.progress import Progress, SpinnerColumn, BarColumn, TimeRemainingColumn
     with Progress(
         SpinnerColumn(),
         "[progress.description]{task.description}",
@@ -171,97 +391,230 @@ def index(
             speed="0.0"
         )
         
-        def process_file_wrapper(filepath: str) -> Tuple[int, int, str]:
-            """Process a single file and return (success, chunks, error)"""
-            try:
-                success, chunks, error = pipeline.process_file(filepath)
-                return success, chunks, error or ""
-            except Exception as e:
-                return 0, 0, f"{filepath}: {str(e)}"
+        # Redraw at most ~200 times per run or every 100ms, not once per file
+        update_every = max(1, len(files_to_index) // 200)
+        pending = 0
+        last_update = start_time
         
-        # Process files in parallel
-        with ThreadPoolExecutor(max_workers=workers) as executor:
-            futures = {executor.submit(process_file_wrapper, fp): fp for fp in files_to_index}
+        # Chunk files in parallel, embed across files in batches
+        for success, chunks, error in _index_files(pipeline, files_to_index, workers):
+            files_indexed += success
+            total_chunks += chunks
+            if error:
+                errors.append(error)
             
-            for future in as_completed(futures):
-                success, chunks, error = future.result()
-                files_indexed += success
-                total_chunks += chunks
-                if error:
-                    errors.append(error)
-                
-                # Calculate speed
-                elapsed = time.time() - start_time
-                speed = files_indexed / max(0.1, elapsed)
-                
-                progress.update(
-                    task, 
-                    advance=1,
-                    chunks=total_chunks,
-                    speed=f"{speed:.1f}"
-                )
-    
-    # Final statistics
-    elapsed_total = time.time() - start_time
-    
-    # Get actual chunk count from database
-    db = LanceDBManager()
-    actual_chunks = db.table.count_rows()
-    
-    # Get cache stats
-    cache_stats = pipeline.embeddings.get_cache_stats()
-    
-    console.print("")
-    console.print("[bold green]✓ Indexing Complete![/bold green]")
-    console.print("")
-    
-    # Statistics table
-    stats_table = Table(show_header=False, box=None)
-    stats_table.add_column("Metric", style="cyan")
-    stats_table.add_column("Value", style="green")
-    
-    stats_table.add_row("Files processed", f"{files_indexed:,}")
-    stats_table.add_row("Files skipped (unchanged)", f"{skipped_files:,}")
-    stats_table.add_row("Chunks created", f"{total_chunks:,}")
-    stats_table.add_row("Total chunks in DB", f"{actual_chunks:,}")
-    stats_table.add_row("Total time", format_time(elapsed_total))
-    stats_table.add_row("Avg per file", f"{elapsed_total/max(1, files_indexed):.2f}s")
-    stats_table.add_row("Throughput", f"{files_indexed/max(0.1, elapsed_total):.1f} files/sec")
+            pending += 1
+            now = time.monotonic()
+            if pending < update_every and now - last_update < 0.1:
+                continue
+            
+            # Calculate speed
+            speed = files_indexed / max(0.1, now - start_time)
+            progress.update(
+                task, 
+                advance=pending,
+                chunks=total_chunks,
+                speed=f"{speed:.1f}"
+            )
+            pending = 0
+            last_update = now
+        
+        if pending:
+            speed = files_indexed / max(0.1, time.monotonic() - start_time)
+            progress.update(task, advance=pending, chunks=total_chunks, speed=f"{speed:.1f}")
     
-    # Cache stats
+    return files_indexed, total_chunks, errors, time.monotonic() - start_time
+
+
+def _refresh_vector_index(pipeline: "IndexingPipeline", files_indexed: int):
+    """Compact and rebuild the ANN index after a bulk run; small updates keep the old one"""
+    if files_indexed < VECTOR_INDEX_MIN_FILES:
+        return
+    with console.status("[cyan]Building vector index...[/cyan]"):
+        pipeline.db.optimize()
+
+
+def _add_cache_rows(stats_table: Table, cache_stats: dict):
+    """Append embedding cache effectiveness rows to an indexing summary table"""
     hit_rate = cache_stats.get('hit_rate', 0) * 100
     stats_table.add_row("Embedding cache hit rate", f"{hit_rate:.1f}%")
     
-    console.print(stats_table)
+    persistent = cache_stats.get('persistent_cache')
+    if persistent:
+        stats_table.add_row("Embedding cache entries", f"{persistent['entries']:,}")
+
+
+def _top_dir_counts(db: "LanceDBManager") -> Tuple[list, int]:
+    """
+    Count chunks per top-level directory of the codebase.
+    
+    Returns ([(directory, chunk_count), ...] sorted by count, total_chunks).
+    The aggregation runs in Arrow compute kernels rather than per row in Python,
+    one record batch at a time, so only the per-directory counts are kept.
+    """
+    import pyarrow.compute as pc
     
-    if errors:
-        # Group errors by type
-        error_500 = [e for e in errors if "500" in e]
-        other_errors = [e for e in errors if "500" not in e]
+    counts = {}
+    total_chunks = 0
+    for batch in db.iter_column_batches(["filepath"]):
+        paths = batch.column(0)
+        total_chunks += len(paths)
         
-        console.print(f"\n[yellow]⚠️  {len(errors)} files had errors[/yellow]")
+        paths = pc.drop_null(paths)
+        paths = paths.filter(pc.not_equal(paths, ""))
+        if not len(paths):
+            continue
         
-        if error_500:
-            console.print(f"  [dim]• {len(error_500)} files failed due to Ollama overload (500 errors) - these can be retried[/dim]")
+        rel_paths = pc.replace_substring_regex(paths, pattern=f"^{CODEBASE_PREFIX}", replacement="")
+        top_dirs = pc.list_element(pc.split_pattern(rel_paths, pattern="/", max_splits=1), 0)
+        batch_counts = pc.value_counts(top_dirs)
         
-        if other_errors:
-            console.print(f"  [dim]• {len(other_errors)} files had other errors:[/dim]")
-            for err in other_errors[:5]:
-                console.print(f"    [red]{err}[/red]")
-            if len(other_errors) > 5:
-                console.print(f"    [dim]... and {len(other_errors) - 5} more[/dim]")
+        for top_dir, count in zip(
+            batch_counts.field("values").to_pylist(), batch_counts.field("counts").to_pylist()
+        ):
+            counts[top_dir] = counts.get(top_dir, 0) + count
     
-    console.print("")
+    return sorted(counts.items(), key=lambda x: x[1], reverse=True), total_chunks
+
+
+@app.command()
+def index(
+    path: str = typer.Argument(None, help="Directory to index (auto-detected if not specified)"),
+    skip_confirm: bool = typer.Option(False, "--yes", "-y", help="Skip confirmation prompt"),
+    force: bool = typer.Option(False, "--force", "-f", help="Force re-index all files (ignore delta)"),
+    workers: int = typer.Option(8, "--workers", "-w", help="Number of parallel workers"),
+    verify: bool = typer.Option(False, "--verify", help="Count rows in the database after indexing")
+):
+    """
+    Scans and indexes a codebase.
+    
+    Features:
+    - Auto-detects directory if not specified
+    - Remembers last used path
+    - Delta indexing: only indexes changed files (use --force to re-index all)
+    - Parallel processing with configurable workers
+    - Persistent embedding cache for faster re-indexing
+    """
+    
+    # Auto-detect path if not provided
+    if path is None:
+        path = workspace.get_default_path()
+        project_name = workspace.detect_project_name(path)
+        console.print(f"[dim]💡 Auto-detected: {project_name} ({path})[/dim]\n")
+    
+    if not os.path.exists(path):
+        console.print(f"[red]Path {path} does not exist.[/red]")
+        return
+    
+    # Save for next time
+    workspace.save_last_path(path)
+        
+    console.print(f"[bold green]Indexing {path}...[/bold green]")
+    
+    # Find .cs files and the changed ones (delta indexing) while the pipeline is initialized
+    cs_files, files_to_index, pipeline = _scan_and_prepare(
+        path, (".cs",), workers, delta=not force
+    )
+    
+    try:
+        total_files = len(cs_files)
+        
+        if total_files == 0:
+            console.print("[yellow]No C# files found in the specified directory.[/yellow]")
+            return
+        
+        skipped_files = total_files - len(files_to_index)
+        if skipped_files > 0:
+            console.print(f"[green]✓ Skipping {skipped_files:,} unchanged files[/green]")
+        
+        if len(files_to_index) == 0:
+            console.print("[bold green]✓ All files already indexed and up-to-date![/bold green]")
+            return
+        
+        # Estimate time (optimized: ~8-15 files/sec with caching)
+        est_rate = 10.0 if skipped_files > 0 else 5.0  # Faster with warm cache
+        est_seconds = len(files_to_index) / est_rate
+        est_time = format_time(est_seconds)
+        
+        console.print(f"[cyan]Files to index: {len(files_to_index):,} / {total_files:,}[/cyan]")
+        console.print(f"[yellow]Estimated time: ~{est_time}[/yellow]")
+        console.print("")
+        
+        # Confirmation for large jobs
+        if len(files_to_index) > 1000 and not skip_confirm:
+            console.print(f"[bold yellow]⚠️  Large indexing job ({len(files_to_index):,} files)[/bold yellow]")
+            if not Confirm.ask(f"This will take approximately {est_time}. Continue?", default=False):
+                console.print("[yellow]Indexing cancelled[/yellow]")
+                return
+            console.print("")
+        
+        files_indexed, total_chunks, errors, elapsed_total = _index_with_progress(
+            pipeline, files_to_index, workers
+        )
+        _refresh_vector_index(pipeline, files_indexed)
+        
+        # Counting rows touches every fragment, so only do it when asked
+        actual_chunks = pipeline.db.table.count_rows() if verify else None
+        
+        # Get cache stats
+        cache_stats = pipeline.embeddings.get_cache_stats()
+        
+        console.print("")
+        console.print("[bold green]✓ Indexing Complete![/bold green]")
+        console.print("")
+        
+        # Statistics table
+        stats_table = Table(show_header=False, box=None)
+        stats_table.add_column("Metric", style="cyan")
+        stats_table.add_column("Value", style="green")
+        
+        stats_table.add_row("Files processed", f"{files_indexed:,}")
+        stats_table.add_row("Files skipped (unchanged)", f"{skipped_files:,}")
+        stats_table.add_row("Chunks created", f"{total_chunks:,}")
+        if actual_chunks is not None:
+            stats_table.add_row("Total chunks in DB", f"{actual_chunks:,}")
+        stats_table.add_row("Total time", format_time(elapsed_total))
+        stats_table.add_row("Avg per file", f"{elapsed_total/max(1, files_indexed):.2f}s")
+        stats_table.add_row("Throughput", f"{files_indexed/max(0.1, elapsed_total):.1f} files/sec")
+        
+        # Cache stats
+        _add_cache_rows(stats_table, cache_stats)
+        
+        console.print(stats_table)
+        
+        if errors:
+            # Group errors by type
+            error_500 = [e for e in errors if "500" in e]
+            other_errors = [e for e in errors if "500" not in e]
+            
+            console.print(f"\n[yellow]⚠️  {len(errors)} files had errors[/yellow]")
+            
+            if error_500:
+                console.print(f"  [dim]• {len(error_500)} files failed due to Ollama overload (500 errors) - these can be retried[/dim]")
+            
+            if other_errors:
+                console.print(f"  [dim]• {len(other_errors)} files had other errors:[/dim]")
+                for err in other_errors[:5]:
+                    console.print(f"    [red]{err}[/red]")
+                if len(other_errors) > 5:
+                    console.print(f"    [dim]... and {len(other_errors) - 5} more[/dim]")
+        
+        console.print("")
+    finally:
+        pipeline.close()
 
 
 @app.command()
 def search(query: str, limit: int = 5):
     """Searches the codebase."""
-    db = LanceDBManager()
-    engine = EmbeddingEngine()
+    db = _get_db()
+    engine = _get_engine()
     
     start_time = time.time()
     
+    from rich.progress import Progress, SpinnerColumn, TextColumn
+    from rich.syntax import Syntax
+    
     with Progress(
         SpinnerColumn(),
         TextColumn("[cyan]{task.description}"),
@@ -312,6 +665,7 @@ def watch(path: str = typer.Argument(None, help="Directory to watch (auto-detect
     workspace.save_last_path(path)
     
     console.print(f"[bold yellow]Starting watcher on {path}...[/bold yellow]")
+    from src.librarian.watcher import start_watching
     start_watching(path)
 
 
@@ -319,34 +673,15 @@ def watch(path: str = typer.Argument(None, help="Directory to watch (auto-detect
 def status(limit: int = 20):
     """Shows the indexing status of top-level directories."""
     try:
-        db = LanceDBManager()
+        db = _get_db()
         console.print("\n[bold cyan]📊 Indexing Status[/bold cyan]")
         console.print("[dim]Analyzing indexed files...[/dim]\n")
         
-        results = db.table.search().limit(100000).select(["filepath"]).to_list()
+        sorted_stats, total_chunks = _top_dir_counts(db)
         
-        if not results:
+        if not total_chunks:
             console.print("[yellow]No files indexed.[/yellow]\n")
             return
-
-        # Aggregate by top-level directory
-        stats = {}
-        total_chunks = len(results)
-        
-        for res in results:
-            path = res.get('filepath', '')
-            if not path:
-                continue
-            
-            if path.startswith('/app/codebase/'):
-                rel_path = path[len('/app/codebase/'):]
-            else:
-                rel_path = path
-                
-            parts = rel_path.split('/')
-            if parts:
-                top_dir = parts[0]
-                stats[top_dir] = stats.get(top_dir, 0) + 1
         
         # Display results
         table = Table(show_header=True, header_style="bold cyan")
@@ -354,8 +689,6 @@ def status(limit: int = 20):
         table.add_column("Chunks", style="green", justify="right")
         table.add_column("Coverage", style="yellow", justify="right")
         
-        sorted_stats = sorted(stats.items(), key=lambda x: x[1], reverse=True)
-        
         for dirname, count in sorted_stats[:limit]:
             percentage = (count / total_chunks) * 100
             table.add_row(dirname, f"{count:,}", f"{percentage:.1f}%")
@@ -429,6 +762,7 @@ def clear_database():
         import shutil
         from src.librarian.consts import LANCEDB_PATH
         
+        _invalidate_db_caches()
         if os.path.exists(LANCEDB_PATH):
             shutil.rmtree(LANCEDB_PATH)
             console.print(f"[green]✓ Database deleted: {LANCEDB_PATH}[/green]")
@@ -454,7 +788,7 @@ def optimize():
     console.print("[cyan]Optimizing database...[/cyan]")
     
     try:
-        db = LanceDBManager()
+        db = _get_db()
         db.optimize()
         console.print("[green]✓ Database optimized[/green]")
     except Exception as e:
@@ -483,19 +817,14 @@ def services(
     
     # Discover services
     console.print("[yellow]Discovering services...[/yellow]")
-    discovered = service_mgr.discover_services(path)
+    # Service discovery, indexed info and the previous selection load in parallel
+    discovered, indexed_info, previous_selection = service_mgr.load_overview(path)
     
     if not discovered:
         console.print("[yellow]No services found in the directory.[/yellow]")
         console.print("[dim]Looking for: package.json, pyproject.toml, *.csproj, pom.xml, etc.[/dim]")
         return
     
-    # Get indexed services info
-    indexed_info = service_mgr.get_indexed_services()
-    
-    # Get previous selection
-    previous_selection = service_mgr.get_service_selection(path)
-    
     # Show discovered services
     console.print(f"\n[bold]Found {len(discovered)} services:[/bold]\n")
     
@@ -576,6 +905,7 @@ def services(
                     if svc.name in selected:
                         count = service_mgr.clear_service_index(svc.path)
                         console.print(f"  [green]Cleared {svc.name}[/green]")
+                _invalidate_db_caches()
             break
         elif choice.isdigit():
             idx = int(choice) - 1
@@ -625,33 +955,7 @@ def diff():
     
     console.print(f"[dim]Scanning: {path}[/dim]\n")
     
-    # Get current files
-    from src.librarian.chunking import get_factory
-    factory = get_factory()
-    
-    current_files = []
-    for root, dirs, files in os.walk(path):
-        dirs[:] = [d for d in dirs if not d.startswith('.') and d not in ['bin', 'obj', 'node_modules', '__pycache__', 'venv']]
-        for file in files:
-            filepath = os.path.join(root, file)
-            if factory.get_chunker(filepath):
-                current_files.append(filepath)
-    
-    # Get file cache to check what's indexed
-    file_cache = FileHashCache()
-    indexed_files = file_cache.get_indexed_files()
-
-    new_files = []
-    modified_files = []
-    unchanged_files = []
-    
-    for filepath in current_files:
-        if filepath not in indexed_files:
-            new_files.append(filepath)
-        elif file_cache.is_file_changed(filepath):
-            modified_files.append(filepath)
-        else:
-            unchanged_files.append(filepath)
+    new_files, modified_files, unchanged_files = _compute_file_delta(path)
     
     # Display results
     table = Table(show_header=True, header_style="bold cyan")
@@ -667,15 +971,15 @@ def diff():
     # Show details if there are changes
     if modified_files:
         console.print(f"\n[bold yellow]Modified Files ({len(modified_files)}):[/bold yellow]")
-        for f in modified_files[:10]:
-            console.print(f"  [yellow]~[/yellow] {os.path.basename(f)}")
+        for name in map(os.path.basename, modified_files[:10]):
+            console.print(f"  [yellow]~[/yellow] {name}")
         if len(modified_files) > 10:
             console.print(f"  [dim]... and {len(modified_files) - 10} more[/dim]")
     
     if new_files:
         console.print(f"\n[bold cyan]New Files ({len(new_files)}):[/bold cyan]")
-        for f in new_files[:10]:
-            console.print(f"  [cyan]+[/cyan] {os.path.basename(f)}")
+        for name in map(os.path.basename, new_files[:10]):
+            console.print(f"  [cyan]+[/cyan] {name}")
         if len(new_files) > 10:
             console.print(f"  [dim]... and {len(new_files) - 10} more[/dim]")
     
@@ -711,13 +1015,12 @@ def info():
     # Database info
     console.print("\n[bold]Database:[/bold]")
     try:
-        db = LanceDBManager()
+        db = _get_db()
         chunk_count = db.table.count_rows()
         console.print(f"  Chunks: [green]{chunk_count:,}[/green]")
         
         # Get unique file count
-        results = db.table.search().limit(10000).select(["filepath"]).to_list()
-        unique_files = len(set(r.get('filepath', '') for r in results))
+        unique_files = db.count_files()
         console.print(f"  Files: [green]{unique_files:,}[/green] indexed")
     except Exception as e:
         console.print(f"  Status: [yellow]Not initialized[/yellow]")
@@ -755,70 +1058,55 @@ def menu():
     - Manage caches
     - Start file watcher
     """
+    # Menu options
+    menu_options = [
+        ("1", "📂 Index Codebase", "Scan and index current workspace"),
+        ("2", "🔍 Search Code", "Search indexed codebase"),
+        ("3", "📊 View Status", "Show indexing status by directory"),
+        ("4", "🔄 View Changes", "Show files changed since last index"),
+        ("5", "📦 Manage Services", "Select specific services to index"),
+        ("6", "📁 Change Workspace", "Set a different workspace path"),
+        ("7", "👁️  Start Watcher", "Watch directory for changes"),
+        ("8", "ℹ️  System Info", "Show workspace and system details"),
+        ("9", "🗑️  Clear Data", "Clear cache or database"),
+        ("0", "⚡ Optimize DB", "Compact and optimize storage"),
+        ("q", "🚪 Quit", "Exit the menu"),
+    ]
+
+    table = Table(show_header=False, box=None, padding=(0, 2))
+    table.add_column("Key", style="bold cyan", width=3)
+    table.add_column("Action", style="white", width=20)
+    table.add_column("Description", style="dim")
+
+    for key, action, desc in menu_options:
+        table.add_row(f"[{key}]", action, desc)
+
+    header = Panel.fit(
+        "[bold cyan]🔍 Codebase Librarian[/bold cyan]\n"
+        "[dim]Semantic Code Search powered by Ollama + LanceDB[/dim]",
+        border_style="cyan"
+    )
+
+    # Workspace/database lines are only rebuilt after actions that can change them
+    status_lines = None
+    _prewarm()
+
     while True:
         console.clear()
-
-        # Header
-        console.print(Panel.fit(
-            "[bold cyan]🔍 Codebase Librarian[/bold cyan]\n"
-            "[dim]Semantic Code Search powered by Ollama + LanceDB[/dim]",
-            border_style="cyan"
-        ))
+        console.print(header)
         console.print()
 
-        # Get workspace info
-        ws_info = workspace.get_workspace_info()
-        default_path = ws_info['default_path']
-        project_name = workspace.detect_project_name(default_path)
-
-        # Show workspace status
-        if ws_info['exists']:
-            file_info = f"{ws_info.get('file_count', '?')} files" if 'file_count' in ws_info else ""
-            console.print(f"  [bold]Workspace:[/bold] {project_name}")
-            console.print(f"  [dim]Path: {default_path}[/dim]")
-            if file_info:
-                console.print(f"  [dim]{file_info} detected[/dim]")
-        else:
-            console.print(f"  [yellow]⚠ Workspace not found: {default_path}[/yellow]")
-
-        # Get quick stats
-        try:
-            db = LanceDBManager()
-            chunk_count = db.table.count_rows()
-            console.print(f"  [bold]Database:[/bold] [green]{chunk_count:,} chunks indexed[/green]")
-        except:
-            console.print(f"  [bold]Database:[/bold] [yellow]Not initialized[/yellow]")
+        if status_lines is None:
+            status_lines = _menu_status_lines()
+        for line in status_lines:
+            console.print(line)
 
         console.print()
-
-        # Menu options
-        menu_options = [
-            ("1", "📂 Index Codebase", "Scan and index current workspace"),
-            ("2", "🔍 Search Code", "Search indexed codebase"),
-            ("3", "📊 View Status", "Show indexing status by directory"),
-            ("4", "🔄 View Changes", "Show files changed since last index"),
-            ("5", "📦 Manage Services", "Select specific services to index"),
-            ("6", "📁 Change Workspace", "Set a different workspace path"),
-            ("7", "👁️  Start Watcher", "Watch directory for changes"),
-            ("8", "ℹ️  System Info", "Show workspace and system details"),
-            ("9", "🗑️  Clear Data", "Clear cache or database"),
-            ("0", "⚡ Optimize DB", "Compact and optimize storage"),
-            ("q", "🚪 Quit", "Exit the menu"),
-        ]
-
-        table = Table(show_header=False, box=None, padding=(0, 2))
-        table.add_column("Key", style="bold cyan", width=3)
-        table.add_column("Action", style="white", width=20)
-        table.add_column("Description", style="dim")
-
-        for key, action, desc in menu_options:
-            table.add_row(f"[{key}]", action, desc)
-
         console.print(table)
         console.print()
 
         # Get choice
-        choice = Prompt.ask(
+        choice = _read_key(
             "[bold]Select option[/bold]",
             choices=["1", "2", "3", "4", "5", "6", "7", "8", "9", "0", "q"],
             default="1"
@@ -850,10 +1138,101 @@ def menu():
         elif choice == "0":
             _menu_optimize()
 
+        # Index, services, workspace, watcher and clear can all change what the header shows
+        if choice in ("1", "5", "6", "7", "9"):
+            status_lines = None
+
         # Pause before returning to menu
         if choice != "q":
             console.print()
-            Prompt.ask("[dim]Press Enter to continue...[/dim]", default="")
+            _wait_for_key("[dim]Press any key to continue...[/dim]")
+
+
+def _menu_status_lines() -> List[str]:
+    """Workspace and database summary shown under the menu header"""
+    lines = []
+
+    # Get workspace info
+    ws_info = workspace.get_workspace_info()
+    default_path = ws_info['default_path']
+    project_name = workspace.detect_project_name(default_path)
+
+    # Show workspace status
+    if ws_info['exists']:
+        file_info = f"{ws_info.get('file_count', '?')} files" if 'file_count' in ws_info else ""
+        lines.append(f"  [bold]Workspace:[/bold] {project_name}")
+        lines.append(f"  [dim]Path: {default_path}[/dim]")
+        if file_info:
+            lines.append(f"  [dim]{file_info} detected[/dim]")
+    else:
+        lines.append(f"  [yellow]⚠ Workspace not found: {default_path}[/yellow]")
+
+    # Get quick stats
+    try:
+        db = _get_db()
+        chunk_count = db.table.count_rows()
+        lines.append(f"  [bold]Database:[/bold] [green]{chunk_count:,} chunks indexed[/green]")
+    except:
+        lines.append(f"  [bold]Database:[/bold] [yellow]Not initialized[/yellow]")
+
+    return lines
+
+
+def _getch() -> str:
+    """
+    Read one character from the terminal without waiting for Enter.
+
+    Ctrl+C raises KeyboardInterrupt on every platform.
+    """
+    try:
+        import msvcrt
+    except ImportError:
+        import termios
+        import tty
+
+        fd = sys.stdin.fileno()
+        old_settings = termios.tcgetattr(fd)
+        try:
+            tty.setcbreak(fd)  # cbreak keeps Ctrl+C working
+            return sys.stdin.read(1)
+        finally:
+            termios.tcsetattr(fd, termios.TCSADRAIN, old_settings)
+
+    # getwch() returns Ctrl+C as a character instead of raising
+    key = msvcrt.getwch()
+    if key == "\x03":
+        raise KeyboardInterrupt
+    return key
+
+
+def _read_key(prompt: str, choices: List[str], default: str) -> str:
+    """
+    Single-keypress version of Prompt.ask for menus.
+
+    Falls back to a regular line prompt when stdin is not a terminal.
+    """
+    if not sys.stdin.isatty():
+        return Prompt.ask(prompt, choices=choices, default=default)
+
+    console.print(f"{prompt} [magenta]\\[{'/'.join(choices)}][/magenta] [cyan]({default})[/cyan]: ", end="")
+    while True:
+        key = _getch().lower()
+        if key in ("\r", "\n"):
+            key = default
+        if key in choices:
+            console.print(key)
+            return key
+
+
+def _wait_for_key(prompt: str):
+    """Pause until any key is pressed"""
+    if not sys.stdin.isatty():
+        Prompt.ask(prompt, default="")
+        return
+
+    console.print(prompt, end="")
+    _getch()
+    console.print()
 
 
 def _menu_index():
@@ -897,127 +1276,63 @@ def _do_index(path: str, force: bool = False, workers: int = 8):
     """Core indexing logic extracted for menu use"""
     console.print(f"[bold green]Indexing {path}...[/bold green]")
     
-    # Count total files
-    console.print("[yellow]Scanning directory...[/yellow]")
-    
     from src.librarian.chunking import get_factory
     factory = get_factory()
     
-    all_files = []
-    for root, dirs, files in os.walk(path):
-        dirs[:] = [d for d in dirs if not d.startswith('.') and d not in ['bin', 'obj', 'node_modules']]
-        for file in files:
-            filepath = os.path.join(root, file)
-            if factory.get_chunker(filepath):
-                all_files.append(filepath)
-    
-    total_files = len(all_files)
-    
-    if total_files == 0:
-        console.print("[yellow]No supported files found in the specified directory.[/yellow]")
-        return
-    
-    # Initialize pipeline
-    pipeline = IndexingPipeline(max_workers=workers)
-    
-    # Check for delta indexing
-    files_to_index = all_files
-    skipped_files = 0
+    # Find supported files and the changed ones while the pipeline is initialized
+    all_files, files_to_index, pipeline = _scan_and_prepare(
+        path, tuple(factory.get_supported_extensions()), workers, delta=not force
+    )
     
-    if not force:
-        console.print("[cyan]Checking for changed files (delta indexing)...[/cyan]")
-        files_to_index = pipeline.get_changed_files(all_files)
-        skipped_files = total_files - len(files_to_index)
+    try:
+        total_files = len(all_files)
+        
+        if total_files == 0:
+            console.print("[yellow]No supported files found in the specified directory.[/yellow]")
+            return
         
+        skipped_files = total_files - len(files_to_index)
         if skipped_files > 0:
             console.print(f"[green]✓ Skipping {skipped_files:,} unchanged files[/green]")
-    
-    if len(files_to_index) == 0:
-        console.print("[bold green]✓ All files already indexed and up-to-date![/bold green]")
-        return
-    
-    est_rate = 10.0 if skipped_files > 0 else 5.0
-    est_seconds = len(files_to_index) / est_rate
-    
-    console.print(f"[cyan]Files to index: {len(files_to_index):,} / {total_files:,}[/cyan]")
-    console.print(f"[yellow]Estimated time: ~{format_time(est_seconds)}[/yellow]")
-    console.print()
-    
-    files_indexed = 0
-    total_chunks = 0
-    start_time = time.time()
-    errors = []
-    
-    with Progress(
-        SpinnerColumn(),
-        "[progress.description]{task.description}",
-        BarColumn(),
-        "[progress.percentage]{task.percentage:>3.0f}%",
-        "•",
-        "[cyan]{task.completed}/{task.total}",
-        "•",
-        "[green]{task.fields[chunks]} chunks",
-        "•",
-        "[yellow]{task.fields[speed]}/s",
-        "•",
-        TimeRemainingColumn(),
-        console=console
-    ) as progress:
         
-        task = progress.add_task(
-            "[bold blue]Indexing...", 
-            total=len(files_to_index),
-            chunks=0,
-            speed="0.0"
+        if len(files_to_index) == 0:
+            console.print("[bold green]✓ All files already indexed and up-to-date![/bold green]")
+            return
+        
+        est_rate = 10.0 if skipped_files > 0 else 5.0
+        est_seconds = len(files_to_index) / est_rate
+        
+        console.print(f"[cyan]Files to index: {len(files_to_index):,} / {total_files:,}[/cyan]")
+        console.print(f"[yellow]Estimated time: ~{format_time(est_seconds)}[/yellow]")
+        console.print()
+        
+        files_indexed, total_chunks, errors, elapsed_total = _index_with_progress(
+            pipeline, files_to_index, workers
         )
+        _refresh_vector_index(pipeline, files_indexed)
+        _invalidate_db_caches()  # The pipeline wrote through its own handle
         
-        def process_file_wrapper(filepath: str) -> Tuple[int, int, str]:
-            try:
-                success, chunks, error = pipeline.process_file(filepath)
-                return success, chunks, error or ""
-            except Exception as e:
-                return 0, 0, f"{filepath}: {str(e)}"
+        console.print()
+        console.print("[bold green]✓ Indexing Complete![/bold green]")
+        console.print()
         
-        with ThreadPoolExecutor(max_workers=workers) as executor:
-            futures = {executor.submit(process_file_wrapper, fp): fp for fp in files_to_index}
-            
-            for future in as_completed(futures):
-                success, chunks, error = future.result()
-                files_indexed += success
-                total_chunks += chunks
-                if error:
-                    errors.append(error)
-                
-                elapsed = time.time() - start_time
-                speed = files_indexed / max(0.1, elapsed)
-                
-                progress.update(
-                    task, 
-                    advance=1,
-                    chunks=total_chunks,
-                    speed=f"{speed:.1f}"
-                )
-    
-    elapsed_total = time.time() - start_time
-    
-    console.print()
-    console.print("[bold green]✓ Indexing Complete![/bold green]")
-    console.print()
-    
-    stats_table = Table(show_header=False, box=None)
-    stats_table.add_column("Metric", style="cyan")
-    stats_table.add_column("Value", style="green")
-    
-    stats_table.add_row("Files processed", f"{files_indexed:,}")
-    stats_table.add_row("Files skipped", f"{skipped_files:,}")
-    stats_table.add_row("Chunks created", f"{total_chunks:,}")
-    stats_table.add_row("Total time", format_time(elapsed_total))
-    stats_table.add_row("Throughput", f"{files_indexed/max(0.1, elapsed_total):.1f} files/sec")
-    
-    console.print(stats_table)
-    
-    if errors:
-        console.print(f"\n[yellow]⚠️  {len(errors)} files had errors[/yellow]")
+        stats_table = Table(show_header=False, box=None)
+        stats_table.add_column("Metric", style="cyan")
+        stats_table.add_column("Value", style="green")
+        
+        stats_table.add_row("Files processed", f"{files_indexed:,}")
+        stats_table.add_row("Files skipped", f"{skipped_files:,}")
+        stats_table.add_row("Chunks created", f"{total_chunks:,}")
+        stats_table.add_row("Total time", format_time(elapsed_total))
+        stats_table.add_row("Throughput", f"{files_indexed/max(0.1, elapsed_total):.1f} files/sec")
+        _add_cache_rows(stats_table, pipeline.embeddings.get_cache_stats())
+        
+        console.print(stats_table)
+        
+        if errors:
+            console.print(f"\n[yellow]⚠️  {len(errors)} files had errors[/yellow]")
+    finally:
+        pipeline.close()
 
 
 def _menu_search():
@@ -1033,21 +1348,27 @@ def _menu_search():
     
     console.print()
     
-    db = LanceDBManager()
-    engine = EmbeddingEngine()
+    db = _get_db()
+    engine = _get_engine()
     
     start_time = time.time()
     
+    from rich.progress import Progress, SpinnerColumn, TextColumn
+    from rich.syntax import Syntax
+    
     with Progress(
         SpinnerColumn(),
         TextColumn("[cyan]{task.description}"),
         console=console
     ) as progress:
         task = progress.add_task("Embedding query...", total=None)
-        query_vec = engine.embed_sync(query)
         
-        progress.update(task, description="Searching vector DB...")
-        results = db.search(query_vec, limit=limit)
+        def run_search():
+            query_vec = get_query_embedding_cache().get_or_compute(query, engine.embed_sync)
+            progress.update(task, description="Searching vector DB...")
+            return db.search(query_vec, limit=limit)
+        
+        results = get_search_result_cache().get_or_search(query, limit, run_search)
     
     search_time = time.time() - start_time
     
@@ -1077,38 +1398,18 @@ def _menu_status():
     console.print("[bold]📊 Indexing Status[/bold]\n")
     
     try:
-        db = LanceDBManager()
-        results = db.table.search().limit(100000).select(["filepath"]).to_list()
+        db = _get_db()
+        sorted_stats, total_chunks = _top_dir_counts(db)
         
-        if not results:
+        if not total_chunks:
             console.print("[yellow]No files indexed.[/yellow]")
             return
-
-        stats = {}
-        total_chunks = len(results)
-        
-        for res in results:
-            path = res.get('filepath', '')
-            if not path:
-                continue
-            
-            if path.startswith('/app/codebase/'):
-                rel_path = path[len('/app/codebase/'):]
-            else:
-                rel_path = path
-                
-            parts = rel_path.split('/')
-            if parts:
-                top_dir = parts[0]
-                stats[top_dir] = stats.get(top_dir, 0) + 1
         
         table = Table(show_header=True, header_style="bold cyan")
         table.add_column("Directory", style="white")
         table.add_column("Chunks", style="green", justify="right")
         table.add_column("Coverage", style="yellow", justify="right")
         
-        sorted_stats = sorted(stats.items(), key=lambda x: x[1], reverse=True)
-        
         for dirname, count in sorted_stats[:20]:
             percentage = (count / total_chunks) * 100
             table.add_row(dirname, f"{count:,}", f"{percentage:.1f}%")
@@ -1151,6 +1452,7 @@ def _menu_watch():
     console.print(f"\n[yellow]Starting watcher on {path}...[/yellow]")
     console.print("[dim]Press Ctrl+C to stop watching[/dim]\n")
     
+    from src.librarian.watcher import start_watching
     try:
         start_watching(path)
     except KeyboardInterrupt:
@@ -1176,6 +1478,20 @@ def _menu_cache_stats():
         console.print(f"  Indexed files: [green]{file_stats['indexed_files']:,}[/green]")
         console.print(f"  Total chunks: [green]{file_stats['total_chunks']:,}[/green]")
         
+        for title, cache in (
+            ("Query Embedding Cache", get_query_embedding_cache()),
+            ("Search Result Cache", get_search_result_cache()),
+        ):
+            stats = cache.get_stats()
+            console.print(f"\n[bold]{title} (this session):[/bold]")
+            console.print(f"  Entries: [green]{stats['entries']:,}[/green]")
+            console.print(
+                f"  Hits: [green]{stats['hits']:,}[/green] • "
+                f"Misses: [yellow]{stats['misses']:,}[/yellow] • "
+                f"Evictions: [yellow]{stats['evictions']:,}[/yellow] • "
+                f"Hit rate: [green]{stats['hit_rate'] * 100:.1f}%[/green]"
+            )
+        
     except Exception as e:
         console.print(f"[red]Error: {e}[/red]")
 
@@ -1203,13 +1519,11 @@ def _menu_info():
     # Database info
     console.print("\n[bold]Database:[/bold]")
     try:
-        db = LanceDBManager()
+        db = _get_db()
         chunk_count = db.table.count_rows()
         console.print(f"  Chunks: [green]{chunk_count:,}[/green]")
         
-        # Get sample to count unique files
-        results = db.table.search().limit(10000).select(["filepath"]).to_list()
-        unique_files = len(set(r.get('filepath', '') for r in results))
+        unique_files = db.count_files()
         console.print(f"  Files: [green]{unique_files:,}[/green] indexed")
     except Exception as e:
         console.print(f"  Status: [yellow]Not initialized[/yellow]")
@@ -1258,6 +1572,7 @@ def _menu_clear_database():
         import shutil
         from src.librarian.consts import LANCEDB_PATH
         
+        _invalidate_db_caches()
         if os.path.exists(LANCEDB_PATH):
             shutil.rmtree(LANCEDB_PATH)
             console.print(f"[green]✓ Database deleted[/green]")
@@ -1277,8 +1592,9 @@ def _menu_optimize():
     console.print("[bold]⚡ Optimize Database[/bold]\n")
     
     try:
-        db = LanceDBManager()
+        db = _get_db()
         db.optimize()
+        get_search_result_cache().clear()  # A new vector index can change results
         console.print("[green]✓ Database optimized[/green]")
     except Exception as e:
         console.print(f"[red]Error: {e}[/red]")
@@ -1296,33 +1612,7 @@ def _menu_diff():
     
     console.print(f"[dim]Scanning: {path}[/dim]\n")
     
-    # Get current files
-    from src.librarian.chunking import get_factory
-    factory = get_factory()
-    
-    current_files = []
-    for root, dirs, files in os.walk(path):
-        dirs[:] = [d for d in dirs if not d.startswith('.') and d not in ['bin', 'obj', 'node_modules', '__pycache__', 'venv']]
-        for file in files:
-            filepath = os.path.join(root, file)
-            if factory.get_chunker(filepath):
-                current_files.append(filepath)
-    
-    # Get file cache to check what's indexed
-    file_cache = FileHashCache()
-    indexed_files = file_cache.get_indexed_files()
-
-    new_files = []
-    modified_files = []
-    unchanged_files = []
-    
-    for filepath in current_files:
-        if filepath not in indexed_files:
-            new_files.append(filepath)
-        elif file_cache.is_file_changed(filepath):
-            modified_files.append(filepath)
-        else:
-            unchanged_files.append(filepath)
+    new_files, modified_files, unchanged_files = _compute_file_delta(path)
     
     # Display results
     table = Table(show_header=True, header_style="bold cyan")
@@ -1338,15 +1628,15 @@ def _menu_diff():
     # Show details if there are changes
     if modified_files:
         console.print(f"\n[bold yellow]Modified Files:[/bold yellow]")
-        for f in modified_files[:10]:
-            console.print(f"  [yellow]~[/yellow] {os.path.basename(f)}")
+        for name in map(os.path.basename, modified_files[:10]):
+            console.print(f"  [yellow]~[/yellow] {name}")
         if len(modified_files) > 10:
             console.print(f"  [dim]... and {len(modified_files) - 10} more[/dim]")
     
     if new_files:
         console.print(f"\n[bold cyan]New Files:[/bold cyan]")
-        for f in new_files[:10]:
-            console.print(f"  [cyan]+[/cyan] {os.path.basename(f)}")
+        for name in map(os.path.basename, new_files[:10]):
+            console.print(f"  [cyan]+[/cyan] {name}")
         if len(new_files) > 10:
             console.print(f"  [dim]... and {len(new_files) - 10} more[/dim]")
     
@@ -1371,20 +1661,14 @@ def _menu_services():
     console.print(f"[dim]Discovering services in: {path}[/dim]\n")
     console.print("[yellow]Scanning...[/yellow]")
     
-    # Discover services
-    discovered = service_mgr.discover_services(path)
+    # Discover services while indexed info and the previous selection load
+    discovered, indexed_info, previous_selection = service_mgr.load_overview(path)
     
     if not discovered:
         console.print("\n[yellow]No services found.[/yellow]")
         console.print("[dim]Looking for: package.json, pyproject.toml, *.csproj, pom.xml, etc.[/dim]")
         return
     
-    # Get indexed services info
-    indexed_info = service_mgr.get_indexed_services()
-    
-    # Get previous selection
-    previous_selection = service_mgr.get_service_selection(path)
-    
     # Show discovered services
     console.print(f"\n[bold]Found {len(discovered)} services:[/bold]\n")
     
@@ -1522,6 +1806,7 @@ def _menu_clear_data():
                 import shutil
                 from src.librarian.consts import LANCEDB_PATH
 
+                _invalidate_db_caches()
                 if os.path.exists(LANCEDB_PATH):
                     shutil.rmtree(LANCEDB_PATH)
                     console.print("[green]✓ Database deleted[/green]")
@@ -1536,6 +1821,7 @@ def _menu_clear_data():
                 import shutil
                 from src.librarian.consts import LANCEDB_PATH
 
+                _invalidate_db_caches()
                 if os.path.exists(LANCEDB_PATH):
                     shutil.rmtree(LANCEDB_PATH)
                     console.print("[green]✓ Database deleted[/green]")
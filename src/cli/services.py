@@ -9,12 +9,19 @@ Features:
 """
 
 import os
+import re
 import json
+import fnmatch
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
 from pathlib import Path
-from typing import List, Dict, Optional, Set
+from typing import Iterator, List, Dict, Optional, Set, Tuple
 from datetime import datetime
 from dataclasses import dataclass, asdict
 
+# Discovery threads mostly wait on readdir/stat, so use several per core
+DISCOVERY_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
 
 @dataclass
 class ServiceInfo:
@@ -47,19 +54,29 @@ class ServiceManager:
         'docker-compose.yaml',
     ]
     
+    # Indicators split for matching against a directory listing: exact names
+    # are a set lookup, glob patterns one combined regex (matched like glob,
+    # so hidden files never match a wildcard)
+    _PLAIN_INDICATORS = frozenset(i for i in SERVICE_INDICATORS if '*' not in i)
+    _GLOB_INDICATORS_RE = re.compile(
+        "|".join(fnmatch.translate(i) for i in SERVICE_INDICATORS if '*' in i)
+    )
+    
     # Directories to skip when discovering services
-    SKIP_DIRS = {
+    SKIP_DIRS = frozenset({
         '.git', '.svn', '.hg',
         'node_modules', 'vendor', 'venv', '.venv',
         'bin', 'obj', 'target', 'dist', 'build',
         '__pycache__', '.pytest_cache', '.mypy_cache',
         '.idea', '.vscode', '.vs',
-    }
+    })
     
     def __init__(self):
         self.config_dir = Path("/data/services")
         self.config_file = self.config_dir / "service_config.json"
         self.config_dir.mkdir(parents=True, exist_ok=True)
+        # (config file st_mtime_ns, parsed config) from the last read or write
+        self._config_cache: Optional[Tuple[int, dict]] = None
     
     def discover_services(self, root_path: str, max_depth: int = 3) -> List[ServiceInfo]:
         """
@@ -73,14 +90,34 @@ class ServiceManager:
         if not os.path.exists(root_path):
             return services
         
+        try:
+            with os.scandir(root_path) as it:
+                entries = list(it)
+        except OSError:
+            return services
+        
         # Check if root itself is a service
-        if self._is_service_root(root_path):
+        if self._is_service_root(root_path, [entry.name for entry in entries]):
             services.append(self._create_service_info(root_path, os.path.basename(root_path)))
         
-        # Walk directory tree
-        for entry in os.scandir(root_path):
-            if entry.is_dir() and entry.name not in self.SKIP_DIRS and not entry.name.startswith('.'):
-                self._discover_recursive(entry.path, services, 1, max_depth)
+        # Walk each top-level directory on its own thread; the walks (and the
+        # per-service file counts) are I/O bound and independent
+        subdirs = [
+            entry.path for entry in entries
+            if entry.is_dir()
+            and entry.name not in self.SKIP_DIRS
+            and not entry.name.startswith('.')
+        ]
+        
+        def discover(path: str) -> List[ServiceInfo]:
+            found = []
+            self._discover_recursive(path, found, 1, max_depth)
+            return found
+        
+        if subdirs:
+            with ThreadPoolExecutor(max_workers=min(DISCOVERY_WORKERS, len(subdirs))) as executor:
+                for found in executor.map(discover, subdirs):
+                    services.extend(found)
         
         # Sort by name
         services.sort(key=lambda s: s.name.lower())
@@ -92,50 +129,71 @@ class ServiceManager:
         if depth > max_depth:
             return
         
-        if self._is_service_root(path):
+        # One listing serves both the indicator check and the descent
+        try:
+            with os.scandir(path) as it:
+                entries = list(it)
+        except OSError:
+            return
+        
+        if self._is_service_root(path, [entry.name for entry in entries]):
             services.append(self._create_service_info(path, os.path.basename(path)))
             return  # Don't look deeper once we find a service
         
         # Continue searching
-        try:
-            for entry in os.scandir(path):
-                if entry.is_dir() and entry.name not in self.SKIP_DIRS and not entry.name.startswith('.'):
-                    self._discover_recursive(entry.path, services, depth + 1, max_depth)
-        except PermissionError:
-            pass
+        for entry in entries:
+            if entry.is_dir() and entry.name not in self.SKIP_DIRS and not entry.name.startswith('.'):
+                self._discover_recursive(entry.path, services, depth + 1, max_depth)
+    
+    def _is_service_root(self, path: str, names: Optional[List[str]] = None) -> bool:
+        """
+        Check if a directory is a service root.
+        
+        names is the directory's listing when the caller already has it;
+        otherwise the directory is listed once here.
+        """
+        if names is None:
+            try:
+                names = os.listdir(path)
+            except OSError:
+                return False
+        
+        if not self._PLAIN_INDICATORS.isdisjoint(names):
+            return True
+        return any(
+            self._GLOB_INDICATORS_RE.match(name) for name in names if not name.startswith('.')
+        )
     
-    def _is_service_root(self, path: str) -> bool:
-        """Check if a directory is a service root."""
-        import glob
-        
-        for indicator in self.SERVICE_INDICATORS:
-            if '*' in indicator:
-                # Glob pattern
-                matches = glob.glob(os.path.join(path, indicator))
-                if matches:
-                    return True
-            else:
-                if os.path.exists(os.path.join(path, indicator)):
-                    return True
-        
-        return False
+    def _iter_supported_files(self, path: str, suffixes: Tuple[str, ...]) -> Iterator[str]:
+        """
+        Yield files under path ending in one of suffixes.
+        
+        Uses os.scandir directly so directory checks come from the entry's
+        cached type, and skipped directories are never opened. Symlinked
+        directories are not followed, as with os.walk.
+        """
+        pending = [path]
+        while pending:
+            try:
+                with os.scandir(pending.pop()) as entries:
+                    for entry in entries:
+                        if entry.is_dir():
+                            if (entry.name not in self.SKIP_DIRS and not entry.name.startswith('.')
+                                    and not entry.is_symlink()):
+                                pending.append(entry.path)
+                        elif entry.name.lower().endswith(suffixes):
+                            yield entry.path
+            except OSError:
+                continue
     
     def _create_service_info(self, path: str, name: str) -> ServiceInfo:
         """Create ServiceInfo with file counts."""
         from src.librarian.chunking import get_factory
-        factory = get_factory()
-        
-        file_count = 0
-        for root, dirs, files in os.walk(path):
-            dirs[:] = [d for d in dirs if d not in self.SKIP_DIRS and not d.startswith('.')]
-            for file in files:
-                filepath = os.path.join(root, file)
-                if factory.get_chunker(filepath):
-                    file_count += 1
-                    if file_count > 5000:  # Limit for performance
-                        break
-            if file_count > 5000:
-                break
+        suffixes = tuple(get_factory().get_supported_extensions())
+        
+        # Counting stops just past the limit (5001 reads as "more than 5000")
+        files = self._iter_supported_files(path, suffixes)
+        file_count = sum(1 for _ in islice(files, 5001))
         
         return ServiceInfo(
             name=name,
@@ -143,52 +201,57 @@ class ServiceManager:
             file_count=file_count
         )
     
+    def load_overview(self, root_path: str) -> Tuple[List[ServiceInfo], Dict[str, dict], List[str]]:
+        """
+        Discover services, load index info and the saved selection in parallel.
+        
+        Returns (discovered_services, indexed_services, selected_names).
+        """
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            discovered = executor.submit(self.discover_services, root_path)
+            indexed = executor.submit(self.get_indexed_services)
+            selection = executor.submit(self.get_service_selection, root_path)
+            return discovered.result(), indexed.result(), selection.result()
+    
     def get_indexed_services(self) -> Dict[str, dict]:
-        """Get information about what's been indexed from each service path."""
+        """
+        Get information about what's been indexed from each service path.
+        
+        Returns {service_name: {'chunks': n, 'file_count': n}}. Grouping runs
+        in Arrow compute kernels over the filepath column.
+        """
+        import pyarrow as pa
+        import pyarrow.compute as pc
         from src.librarian.db import LanceDBManager
         
         try:
             db = LanceDBManager()
-            results = db.table.search().limit(100000).select(["filepath", "indexed_at"]).to_list()
-        except:
+            paths = db.scan_columns(["filepath"]).column("filepath")
+        except Exception:
             return {}
         
-        # Group by service path
-        services = {}
-        for res in results:
-            filepath = res.get('filepath', '')
-            indexed_at = res.get('indexed_at', '')
-            
-            # Find the service root from filepath
-            # Assumes paths like /app/codebase/service-name/... or /path/to/service-name/...
-            parts = filepath.split('/')
-            
-            # Try to find a meaningful service name
-            service_name = None
-            for i, part in enumerate(parts):
-                if part in ['app', 'codebase', '']:
-                    continue
-                service_name = part
-                break
-            
-            if service_name:
-                if service_name not in services:
-                    services[service_name] = {
-                        'chunks': 0,
-                        'files': set(),
-                        'last_indexed': indexed_at
-                    }
-                services[service_name]['chunks'] += 1
-                services[service_name]['files'].add(filepath)
-                if indexed_at > services[service_name]['last_indexed']:
-                    services[service_name]['last_indexed'] = indexed_at
-        
-        # Convert sets to counts
-        for name, info in services.items():
-            info['file_count'] = len(info['files'])
-            del info['files']
+        # The service is the first path segment after any leading "app" and
+        # "codebase" parts, e.g. /app/codebase/service-name/... or
+        # /path/to/service-name/...
+        names = pc.struct_field(
+            pc.extract_regex(paths, pattern=r"^(?:(?:app|codebase)?/)*(?P<service>[^/]+)"), [0]
+        )
+        rows = pa.table({"service": names, "filepath": paths}).filter(
+            pc.invert(pc.fill_null(pc.is_in(names, pa.array(["app", "codebase"])), True))
+        )
+        grouped = rows.group_by("service").aggregate([
+            ("filepath", "count"),
+            ("filepath", "count_distinct"),
+        ])
         
-        return services
+        return {
+            name: {'chunks': chunks, 'file_count': files}
+            for name, chunks, files in zip(
+                grouped.column("service").to_pylist(),
+                grouped.column("filepath_count").to_pylist(),
+                grouped.column("filepath_count_distinct").to_pylist(),
+            )
+        }
     
     def save_service_selection(self, root_path: str, selected_services: List[str]):
         """Save the selected services for a root path."""
@@ -207,19 +270,31 @@ class ServiceManager:
         return config.get(root_path, {}).get('selected_services', [])
     
     def _load_config(self) -> dict:
-        """Load configuration from file."""
-        if not self.config_file.exists():
+        """Load configuration from file (parsed again only when its mtime changes)."""
+        try:
+            mtime_ns = self.config_file.stat().st_mtime_ns
+        except OSError:
             return {}
+        
+        cached = self._config_cache
+        if cached and cached[0] == mtime_ns:
+            return dict(cached[1])
+        
         try:
             with open(self.config_file, 'r') as f:
-                return json.load(f)
+                config = json.load(f)
         except (json.JSONDecodeError, IOError):
             return {}
+        
+        self._config_cache = (mtime_ns, config)
+        return dict(config)
     
     def _save_config(self, config: dict):
         """Save configuration to file."""
+        self._config_cache = None
         with open(self.config_file, 'w') as f:
             json.dump(config, f, indent=2)
+        self._config_cache = (self.config_file.stat().st_mtime_ns, dict(config))
     
     def clear_service_index(self, service_path: str) -> int:
         """
@@ -227,35 +302,34 @@ class ServiceManager:
         
         Returns the number of chunks removed.
         """
+        import pyarrow.compute as pc
         from src.librarian.db import LanceDBManager
         from src.librarian.cache import FileHashCache
         
         db = LanceDBManager()
         
         # Find all chunks that belong to this service
-        results = db.table.search().limit(100000).select(["filepath"]).to_list()
+        paths = db.scan_columns(["filepath"]).column("filepath")
         
         # Normalize path for comparison
         service_path = os.path.abspath(service_path)
         
-        chunks_to_remove = []
-        files_to_clear = set()
-        
-        for i, res in enumerate(results):
-            filepath = res.get('filepath', '')
-            # Check if file is under service path
-            if filepath.startswith(service_path) or f"/codebase/{os.path.basename(service_path)}/" in filepath:
-                chunks_to_remove.append(i)
-                files_to_clear.add(filepath)
+        # Check if file is under service path
+        in_service = pc.or_(
+            pc.starts_with(paths, service_path),
+            pc.match_substring(paths, f"/codebase/{os.path.basename(service_path)}/")
+        )
+        service_paths = paths.filter(in_service)
         
-        if chunks_to_remove:
-            # LanceDB doesn't have easy row deletion, so we'll need to recreate
-            # For now, we'll clear the file hash cache for these files
-            file_cache = FileHashCache()
-            for filepath in files_to_clear:
-                file_cache.remove(filepath)
+        file_cache = FileHashCache()
+        if len(service_paths):
+            files_to_clear = pc.unique(service_paths).to_pylist()
+            db.delete_by_files_batch(files_to_clear)
+            file_cache.remove_files_batch(files_to_clear)
+        # Its cached directory listings would otherwise outlive the service
+        file_cache.remove_dir_listings(service_path)
         
-        return len(chunks_to_remove)
+        return len(service_paths)
 
 
 # Global singleton
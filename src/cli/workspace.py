@@ -9,10 +9,38 @@ Features:
 
 import os
 import json
+import time
+from itertools import islice
 from pathlib import Path
-from typing import Optional
+from typing import Iterator, Optional, Tuple
 from datetime import datetime
 
+# How long get_workspace_info() results are reused (the file count walks the tree)
+WORKSPACE_INFO_TTL = 5.0
+
+# Directories skipped when counting source files
+IGNORED_DIRS = frozenset({'bin', 'obj', 'node_modules', '__pycache__', 'venv'})
+
+# get_workspace_info stops counting past this many files
+FILE_COUNT_LIMIT = 1000
+
+
+def _iter_supported_files(path: str, suffixes: Tuple[str, ...]) -> Iterator[str]:
+    """Yield files under path ending in one of suffixes, skipping ignored and hidden dirs."""
+    pending = [path]
+    while pending:
+        try:
+            with os.scandir(pending.pop()) as entries:
+                for entry in entries:
+                    if entry.is_dir():
+                        if (entry.name not in IGNORED_DIRS and not entry.name.startswith('.')
+                                and not entry.is_symlink()):
+                            pending.append(entry.path)
+                    elif entry.name.lower().endswith(suffixes):
+                        yield entry.path
+        except OSError:
+            continue
+
 
 class WorkspaceManager:
     """Manages workspace paths and persistence."""
@@ -22,6 +50,10 @@ class WorkspaceManager:
         self.config_dir = Path("/data/workspace")
         self.config_file = self.config_dir / "last_workspace.json"
         self.config_dir.mkdir(parents=True, exist_ok=True)
+        # (default_path, computed_at, info) from the last get_workspace_info()
+        self._info_cache: Optional[Tuple[str, float, dict]] = None
+        # (config file st_mtime_ns, last_path) from the last read or write
+        self._last_path_cache: Optional[Tuple[int, Optional[str]]] = None
     
     def get_default_path(self) -> str:
         """
@@ -46,16 +78,29 @@ class WorkspaceManager:
         return os.getcwd()
     
     def get_last_path(self) -> Optional[str]:
-        """Get the last used path from cache."""
-        if not self.config_file.exists():
+        """
+        Get the last used path from cache.
+        
+        The file is only parsed again when its mtime changes, so menu redraws
+        cost a stat instead of an open and a JSON parse.
+        """
+        try:
+            mtime_ns = self.config_file.stat().st_mtime_ns
+        except OSError:
             return None
         
+        cached = self._last_path_cache
+        if cached and cached[0] == mtime_ns:
+            return cached[1]
+        
         try:
             with open(self.config_file, 'r') as f:
-                data = json.load(f)
-                return data.get('last_path')
+                last_path = json.load(f).get('last_path')
         except (json.JSONDecodeError, IOError):
             return None
+        
+        self._last_path_cache = (mtime_ns, last_path)
+        return last_path
     
     def save_last_path(self, path: str):
         """Save path for future use."""
@@ -71,14 +116,27 @@ class WorkspaceManager:
         try:
             with open(self.config_file, 'w') as f:
                 json.dump(data, f, indent=2)
+            self._last_path_cache = (self.config_file.stat().st_mtime_ns, path)
         except IOError:
             # Fail silently - not critical
-            pass
+            self._last_path_cache = None
+        
+        self._info_cache = None
     
     def get_workspace_info(self) -> dict:
-        """Get information about the current workspace."""
+        """
+        Get information about the current workspace.
+        
+        Results are reused for WORKSPACE_INFO_TTL seconds while the default
+        path stays the same, so repeated menu redraws don't re-walk the tree.
+        """
         default_path = self.get_default_path()
         
+        cached = self._info_cache
+        if cached and cached[0] == default_path:
+            if time.monotonic() - cached[1] < WORKSPACE_INFO_TTL:
+                return dict(cached[2])
+        
         info = {
             'default_path': default_path,
             'exists': os.path.exists(default_path),
@@ -89,50 +147,22 @@ class WorkspaceManager:
         if info['exists']:
             # Count supported files
             from src.librarian.chunking import get_factory
-            factory = get_factory()
+            suffixes = tuple(get_factory().get_supported_extensions())
             
-            file_count = 0
-            for root, dirs, files in os.walk(default_path):
-                # Skip common ignored directories
-                dirs[:] = [d for d in dirs if not d.startswith('.') and 
-                          d not in ['bin', 'obj', 'node_modules', '__pycache__', 'venv']]
-                
-                for file in files:
-                    filepath = os.path.join(root, file)
-                    if factory.get_chunker(filepath):
-                        file_count += 1
-                        
-                # Limit scan to avoid long delays
-                if file_count > 1000:
-                    info['file_count'] = f"{file_count}+"
-                    break
+            # Limit scan to avoid long delays
+            files = _iter_supported_files(default_path, suffixes)
+            file_count = sum(1 for _ in islice(files, FILE_COUNT_LIMIT + 1))
+            if file_count > FILE_COUNT_LIMIT:
+                info['file_count'] = f"{FILE_COUNT_LIMIT}+"
             else:
                 info['file_count'] = file_count
         
-        return info
+        self._info_cache = (default_path, time.monotonic(), info)
+        return dict(info)
     
     def detect_project_name(self, path: str) -> str:
-        """Detect a friendly project name from path."""
-        path = os.path.abspath(path)
-        
-        # Try common project indicators
-        indicators = [
-            '.git',
-            '.sln',  # Visual Studio solution
-            'package.json',  # Node project
-            'pyproject.toml',  # Python project
-            'pom.xml',  # Maven project
-            'build.gradle'  # Gradle project
-        ]
-        
-        for indicator in indicators:
-            indicator_path = os.path.join(path, indicator)
-            if os.path.exists(indicator_path):
-                # Use directory name
-                return os.path.basename(path)
-        
-        # Fall back to directory name
-        return os.path.basename(path)
+        """Detect a friendly project name from path (the directory name)."""
+        return os.path.basename(os.path.abspath(path))
 
 
 # Global singleton
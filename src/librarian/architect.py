@@ -5,8 +5,24 @@ from .providers import get_llm_provider
 
 logger = logging.getLogger(__name__)
 
+# Only the start of a file goes into the summary prompt
+SUMMARY_MAX_CHARS = 8000
+
 
 class ArchitectAnalyzer:
+    # Markers to look for. Plain strings are found with str's substring
+    # search, which is several times faster than running them through the
+    # regex engine; only the route attribute needs a pattern
+    ARCHITECTURE_LITERALS = (
+        'builder.Services.',  # DI
+        'app.UseMiddleware',  # Middleware
+        '[ApiController]',    # Entry Point
+        '[HttpGet]',          # Entry Point
+        'IConfiguration',     # Config
+        'appsettings.json',   # Config (in string)
+    )
+    _ROUTE_RE = re.compile(r'\[Route\(.*\)\]')  # Entry Point
+
     def __init__(self, model: str = LLM_MODEL, provider: str = LLM_PROVIDER, **provider_kwargs):
         self.model = model
         self.provider_name = provider
@@ -25,22 +41,9 @@ class ArchitectAnalyzer:
     def analyze_structure(self, filepath: str, content: str) -> bool:
         # Dynamic Architecture Detection
         # Returns True if is_architecture_node
-
-        # Patterns to look for
-        patterns = [
-            r'builder\.Services\.',  # DI
-            r'app\.UseMiddleware',   # Middleware
-            r'\[ApiController\]',    # Entry Point
-            r'\[Route\(.*\)\]',      # Entry Point
-            r'\[HttpGet\]',          # Entry Point
-            r'IConfiguration',       # Config
-            r'appsettings\.json'     # Config (in string)
-        ]
-
-        for p in patterns:
-            if re.search(p, content):
-                return True
-        return False
+        if any(literal in content for literal in self.ARCHITECTURE_LITERALS):
+            return True
+        return self._ROUTE_RE.search(content) is not None
 
     def generate_summary(self, content: str) -> str:
         prompt = (
@@ -49,7 +52,7 @@ class ArchitectAnalyzer:
             "2) The Interfaces it implements\n"
             "3) Any database tables it modifies.\n"
             "Output as concise bullet points."
-            f"\n\nCode:\n{content[:8000]}" # Truncate for safety
+            f"\n\nCode:\n{content[:SUMMARY_MAX_CHARS]}" # Truncate for safety
         )
 
         try:
@@ -5,17 +5,59 @@ Provides disk-based caching to speed up re-indexing.
 
 import hashlib
 import json
+import mmap
 import os
 import pickle
 import sqlite3
+import struct
 import threading
-from typing import Dict, List, Optional, Tuple
+from array import array
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
 from pathlib import Path
 from .consts import LANCEDB_PATH
 
 # Cache directory alongside LanceDB
 CACHE_DIR = os.path.join(os.path.dirname(LANCEDB_PATH), ".cache")
 
+# Older SQLite builds cap bound parameters at 999 per statement
+SQLITE_MAX_PARAMS = 900
+
+# Connection tuning shared by both caches: map up to 256 MB of the database
+# file instead of copying pages through read(), and keep up to 64 MB of
+# B-tree pages cached (negative cache_size is in KiB)
+SQLITE_MMAP_SIZE = 256 * 1024 * 1024
+SQLITE_CACHE_KIB = 64 * 1024
+
+# struct/array typecode of packed embedding blobs: half floats, the same
+# precision LanceDB stores vectors at (db.VECTOR_VALUE_TYPE), at half the
+# size of float32 blobs. Older 'f' (float32) rows are still read.
+EMBEDDING_DTYPE = 'e'
+
+# Block size for hashing files that can't be memory-mapped
+HASH_READ_SIZE = 1 << 20
+
+# PRAGMA user_version of file_hashes.db: 1 added mtime_ns, 2 switched
+# content hashes from truncated SHA-256 to BLAKE2b
+FILE_CACHE_SCHEMA_VERSION = 2
+
+
+def _connect(db_path: str, page_size: Optional[int] = None) -> sqlite3.Connection:
+    """
+    Open a cache database with WAL and the shared tuning PRAGMAs.
+    
+    page_size only takes effect on a new database, so it is set before
+    anything (including the switch to WAL) writes the file header.
+    """
+    conn = sqlite3.connect(db_path, check_same_thread=False)
+    if page_size:
+        conn.execute(f"PRAGMA page_size={page_size}")
+    conn.execute("PRAGMA journal_mode=WAL")  # Better concurrent access
+    conn.execute("PRAGMA synchronous=NORMAL")  # Faster writes
+    conn.execute(f"PRAGMA mmap_size={SQLITE_MMAP_SIZE}")
+    conn.execute(f"PRAGMA cache_size=-{SQLITE_CACHE_KIB}")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    return conn
+
 
 class EmbeddingCache:
     """
@@ -34,9 +76,8 @@ class EmbeddingCache:
     def _get_conn(self) -> sqlite3.Connection:
         """Get thread-local connection"""
         if not hasattr(self._local, 'conn') or self._local.conn is None:
-            self._local.conn = sqlite3.connect(self.db_path, check_same_thread=False)
-            self._local.conn.execute("PRAGMA journal_mode=WAL")  # Better concurrent access
-            self._local.conn.execute("PRAGMA synchronous=NORMAL")  # Faster writes
+            # Larger pages fit more ~1.5 KB embedding blobs per page
+            self._local.conn = _connect(self.db_path, page_size=8192)
         return self._local.conn
     
     def _init_db(self):
@@ -51,6 +92,11 @@ class EmbeddingCache:
             )
         """)
         conn.execute("CREATE INDEX IF NOT EXISTS idx_model ON embeddings(model)")
+        
+        # Entries from before vectors were packed are pickles and have no dtype
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(embeddings)")}
+        if "dtype" not in columns:
+            conn.execute("ALTER TABLE embeddings ADD COLUMN dtype TEXT")
         conn.commit()
     
     @staticmethod
@@ -58,41 +104,69 @@ class EmbeddingCache:
         """Generate a hash for content"""
         return hashlib.sha256(text.encode('utf-8')).hexdigest()[:32]
     
+    @staticmethod
+    def _encode(embedding: List[float]) -> bytes:
+        """Pack an embedding as raw half-float bytes (array has no 'e' typecode)"""
+        return struct.pack(f"{len(embedding)}{EMBEDDING_DTYPE}", *embedding)
+    
+    @staticmethod
+    def _decode(blob: bytes, dtype: Optional[str]) -> List[float]:
+        """Unpack a stored embedding"""
+        if dtype is None:
+            return pickle.loads(blob)
+        if dtype == 'e':
+            return list(struct.unpack(f"{len(blob) // 2}e", blob))
+        values = array(dtype)
+        values.frombytes(blob)
+        return values.tolist()
+    
     def get(self, content_hash: str) -> Optional[List[float]]:
         """Get embedding from cache"""
         conn = self._get_conn()
         cursor = conn.execute(
-            "SELECT embedding FROM embeddings WHERE content_hash = ?",
+            "SELECT embedding, dtype FROM embeddings WHERE content_hash = ?",
             (content_hash,)
         )
         row = cursor.fetchone()
         if row:
-            return pickle.loads(row[0])
+            return self._decode(row[0], row[1])
         return None
     
-    def get_batch(self, content_hashes: List[str]) -> Dict[str, List[float]]:
-        """Get multiple embeddings from cache"""
+    def get_batch(self, content_hashes: List[str], decode=None) -> Dict[str, List[float]]:
+        """
+        Get multiple embeddings from cache.
+        
+        Looks up all hashes with a handful of IN (...) queries, chunked to
+        stay under SQLite's bound-parameter limit. decode(blob, dtype)
+        replaces the list-of-floats decoding (e.g. to build arrays).
+        """
+        decode = decode or self._decode
         if not content_hashes:
             return {}
         
         conn = self._get_conn()
-        placeholders = ','.join('?' * len(content_hashes))
-        cursor = conn.execute(
-            f"SELECT content_hash, embedding FROM embeddings WHERE content_hash IN ({placeholders})",
-            content_hashes
-        )
-        
+        unique_hashes = list(dict.fromkeys(content_hashes))
         results = {}
-        for row in cursor.fetchall():
-            results[row[0]] = pickle.loads(row[1])
+        
+        for i in range(0, len(unique_hashes), SQLITE_MAX_PARAMS):
+            chunk = unique_hashes[i:i + SQLITE_MAX_PARAMS]
+            placeholders = ','.join('?' * len(chunk))
+            cursor = conn.execute(
+                f"SELECT content_hash, embedding, dtype FROM embeddings "
+                f"WHERE content_hash IN ({placeholders})",
+                chunk
+            )
+            for row in cursor.fetchall():
+                results[row[0]] = decode(row[1], row[2])
         return results
     
     def set(self, content_hash: str, embedding: List[float], model: str = ""):
         """Store embedding in cache"""
         conn = self._get_conn()
         conn.execute(
-            "INSERT OR REPLACE INTO embeddings (content_hash, embedding, model) VALUES (?, ?, ?)",
-            (content_hash, pickle.dumps(embedding), model)
+            "INSERT OR REPLACE INTO embeddings (content_hash, embedding, model, dtype) "
+            "VALUES (?, ?, ?, ?)",
+            (content_hash, self._encode(embedding), model, EMBEDDING_DTYPE)
         )
         conn.commit()
     
@@ -103,8 +177,9 @@ class EmbeddingCache:
         
         conn = self._get_conn()
         conn.executemany(
-            "INSERT OR REPLACE INTO embeddings (content_hash, embedding, model) VALUES (?, ?, ?)",
-            [(h, pickle.dumps(e), model) for h, e in items]
+            "INSERT OR REPLACE INTO embeddings (content_hash, embedding, model, dtype) "
+            "VALUES (?, ?, ?, ?)",
+            [(h, self._encode(e), model, EMBEDDING_DTYPE) for h, e in items]
         )
         conn.commit()
     
@@ -142,9 +217,7 @@ class FileHashCache:
     def _get_conn(self) -> sqlite3.Connection:
         """Get thread-local connection"""
         if not hasattr(self._local, 'conn') or self._local.conn is None:
-            self._local.conn = sqlite3.connect(self.db_path, check_same_thread=False)
-            self._local.conn.execute("PRAGMA journal_mode=WAL")
-            self._local.conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = _connect(self.db_path)
         return self._local.conn
     
     def _init_db(self):
@@ -160,15 +233,114 @@ class FileHashCache:
                 indexed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
             )
         """)
+        
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        if version < FILE_CACHE_SCHEMA_VERSION:
+            # Caches created before mtime_ns was tracked only have the float mtime
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(file_hashes)")}
+            if "mtime_ns" not in columns:
+                conn.execute("ALTER TABLE file_hashes ADD COLUMN mtime_ns INTEGER")
+            if version < 2:
+                # SHA-256 digests can never match BLAKE2b ones; dropping them
+                # marks touched files changed without hashing them first
+                conn.execute("UPDATE file_hashes SET content_hash = NULL")
+            conn.execute(f"PRAGMA user_version = {FILE_CACHE_SCHEMA_VERSION}")
+        
+        # Directory listings, reused while a directory's mtime is unchanged
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS dir_listings (
+                dirpath TEXT PRIMARY KEY,
+                mtime_ns INTEGER,
+                files TEXT,
+                subdirs TEXT
+            )
+        """)
         conn.commit()
     
     @staticmethod
-    def hash_file(filepath: str) -> Tuple[str, float, int]:
+    def hash_content(data: bytes) -> str:
+        """
+        Hash file content for change detection.
+        
+        BLAKE2b from the standard library is several times faster than
+        SHA-256 and we don't need a cryptographic guarantee here; 16 bytes
+        keeps the same 32 hex chars as the old truncated SHA-256.
+        """
+        return hashlib.blake2b(data, digest_size=16).hexdigest()
+    
+    @staticmethod
+    def hash_path(filepath: str) -> str:
+        """
+        Hash a file's content without reading it into memory.
+        
+        Gives the same digest as hash_content() on the file's bytes. The file
+        is mapped and hashed straight from the page cache; empty files (which
+        can't be mapped) and file systems without mmap fall back to reading
+        HASH_READ_SIZE blocks.
+        """
+        digest = hashlib.blake2b(digest_size=16)
+        with open(filepath, 'rb', buffering=0) as f:
+            try:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    digest.update(mapped)
+            except (ValueError, OSError):
+                f.seek(0)
+                while block := f.read(HASH_READ_SIZE):
+                    digest.update(block)
+        return digest.hexdigest()
+    
+    @classmethod
+    def hash_file(cls, filepath: str) -> Tuple[str, float, int]:
         """Generate hash for a file, returns (hash, mtime, size)"""
         stat = os.stat(filepath)
-        with open(filepath, 'rb') as f:
-            content_hash = hashlib.sha256(f.read()).hexdigest()[:32]
-        return content_hash, stat.st_mtime, stat.st_size
+        return cls.hash_path(filepath), stat.st_mtime, stat.st_size
+    
+    @staticmethod
+    def _stat_matches(mtime: float, size: int, mtime_ns: Optional[int], stat: os.stat_result) -> bool:
+        """Compare a recorded (mtime, size) against a fresh stat"""
+        if size != stat.st_size:
+            return False
+        if mtime_ns is not None:
+            return mtime_ns == stat.st_mtime_ns
+        # Legacy rows without nanosecond precision
+        return mtime == stat.st_mtime
+    
+    def _is_changed(self, filepath: str, recorded: Tuple, refreshed: List[Tuple]) -> bool:
+        """
+        Compare a file against its recorded (mtime, size, mtime_ns, content_hash).
+        
+        Metadata is checked first so unchanged files cost a single stat. Only
+        when the size matches but the mtime differs (touched, re-checked-out)
+        is the file hashed; if the content turns out identical, its fresh stat
+        is appended to refreshed so the next check is stat-only again.
+        """
+        mtime, size, mtime_ns, content_hash = recorded
+        try:
+            stat = os.stat(filepath)
+            if self._stat_matches(mtime, size, mtime_ns, stat):
+                return False
+            if size != stat.st_size or not content_hash:
+                return True
+            
+            if self.hash_path(filepath) != content_hash:
+                return True
+        except OSError:
+            return True  # File might have been deleted
+        
+        refreshed.append((stat.st_mtime, stat.st_size, stat.st_mtime_ns, filepath))
+        return False
+    
+    def _refresh_stats(self, refreshed: List[Tuple]):
+        """Record new metadata for files whose content hash still matched"""
+        if not refreshed:
+            return
+        
+        conn = self._get_conn()
+        conn.executemany(
+            "UPDATE file_hashes SET mtime = ?, size = ?, mtime_ns = ? WHERE filepath = ?",
+            refreshed
+        )
+        conn.commit()
     
     def get_indexed_files(self) -> Dict[str, Tuple[str, float, int]]:
         """Get all indexed files with their hashes"""
@@ -180,7 +352,7 @@ class FileHashCache:
         """Check if a file has changed since last indexing"""
         conn = self._get_conn()
         cursor = conn.execute(
-            "SELECT content_hash, mtime, size FROM file_hashes WHERE filepath = ?",
+            "SELECT mtime, size, mtime_ns, content_hash FROM file_hashes WHERE filepath = ?",
             (filepath,)
         )
         row = cursor.fetchone()
@@ -188,59 +360,110 @@ class FileHashCache:
         if not row:
             return True  # Not indexed yet
         
-        try:
-            stat = os.stat(filepath)
-            # Quick check: mtime and size
-            if row[1] != stat.st_mtime or row[2] != stat.st_size:
-                return True
-            return False
-        except OSError:
-            return True  # File might have been deleted
+        refreshed = []
+        changed = self._is_changed(filepath, row, refreshed)
+        self._refresh_stats(refreshed)
+        return changed
+    
+    def _load_stat_records(
+        self, filepaths: Optional[Sequence[str]] = None
+    ) -> Dict[str, Tuple[float, int, Optional[int], str]]:
+        """
+        Load the recorded (mtime, size, mtime_ns, content_hash) of indexed files.
+        
+        With filepaths, only their records are read, with IN (...) queries
+        chunked under SQLite's parameter limit; otherwise the whole table is.
+        """
+        conn = self._get_conn()
+        query = "SELECT filepath, mtime, size, mtime_ns, content_hash FROM file_hashes"
+        if filepaths is None:
+            return {row[0]: row[1:] for row in conn.execute(query)}
+        
+        records = {}
+        for i in range(0, len(filepaths), SQLITE_MAX_PARAMS):
+            chunk = filepaths[i:i + SQLITE_MAX_PARAMS]
+            placeholders = ','.join('?' * len(chunk))
+            for row in conn.execute(f"{query} WHERE filepath IN ({placeholders})", chunk):
+                records[row[0]] = row[1:]
+        return records
     
-    def get_changed_files(self, filepaths: List[str]) -> List[str]:
-        """Filter list to only files that have changed"""
-        indexed = self.get_indexed_files()
-        changed = []
+    def _iter_changed(self, filepaths: Iterable[str], indexed: Dict[str, Tuple]) -> Iterator[str]:
+        """Yield the filepaths that are new or changed relative to indexed"""
+        refreshed = []
         
         for fp in filepaths:
-            if fp not in indexed:
-                changed.append(fp)
-                continue
-            
-            try:
-                stat = os.stat(fp)
-                old_hash, old_mtime, old_size = indexed[fp]
-                
-                # Quick check: mtime and size
-                if old_mtime != stat.st_mtime or old_size != stat.st_size:
-                    changed.append(fp)
-            except OSError:
-                changed.append(fp)
+            recorded = indexed.get(fp)
+            if recorded is None or self._is_changed(fp, recorded, refreshed):
+                yield fp
         
-        return changed
+        self._refresh_stats(refreshed)
     
-    def update_file(self, filepath: str, content_hash: str, mtime: float, size: int, chunk_count: int):
+    def iter_changed_files(self, filepaths: Iterable[str]) -> Iterator[str]:
+        """Lazily filter filepaths down to files that have changed"""
+        yield from self._iter_changed(filepaths, self._load_stat_records())
+    
+    def get_changed_files(self, filepaths: Iterable[str]) -> List[str]:
+        """
+        Filter list to only files that have changed.
+        
+        Reads only the records of the given files, so checking a handful of
+        files (the watcher's hot path) doesn't load the whole cache.
+        """
+        filepaths = list(filepaths)
+        return list(self._iter_changed(filepaths, self._load_stat_records(filepaths)))
+    
+    def partition_files(self, filepaths: Iterable[str]) -> Tuple[List[str], List[str], List[str]]:
+        """
+        Split filepaths into (new, modified, unchanged) lists.
+        
+        Uses one query for the whole cache and, for unchanged files, one stat
+        per file like iter_changed_files, so callers that need both the change
+        set and the breakdown don't have to check each file twice.
+        """
+        indexed = self._load_stat_records()
+        refreshed = []
+        new, modified, unchanged = [], [], []
+        
+        for fp in filepaths:
+            recorded = indexed.get(fp)
+            if recorded is None:
+                new.append(fp)
+            elif self._is_changed(fp, recorded, refreshed):
+                modified.append(fp)
+            else:
+                unchanged.append(fp)
+        
+        self._refresh_stats(refreshed)
+        return new, modified, unchanged
+    
+    def update_file(self, filepath: str, content_hash: str, mtime: float, size: int, chunk_count: int,
+                    mtime_ns: Optional[int] = None):
         """Update hash record for a file"""
         conn = self._get_conn()
         conn.execute(
             """INSERT OR REPLACE INTO file_hashes 
-               (filepath, content_hash, mtime, size, chunk_count, indexed_at) 
-               VALUES (?, ?, ?, ?, ?, CURRENT_TIMESTAMP)""",
-            (filepath, content_hash, mtime, size, chunk_count)
+               (filepath, content_hash, mtime, size, chunk_count, mtime_ns, indexed_at) 
+               VALUES (?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)""",
+            (filepath, content_hash, mtime, size, chunk_count, mtime_ns)
         )
         conn.commit()
     
-    def update_files_batch(self, items: List[Tuple[str, str, float, int, int]]):
-        """Batch update hash records"""
+    def update_files_batch(self, items: List[Tuple]):
+        """
+        Batch update hash records.
+        
+        Items are (filepath, content_hash, mtime, size, chunk_count) with an
+        optional trailing mtime_ns.
+        """
         if not items:
             return
         
         conn = self._get_conn()
         conn.executemany(
             """INSERT OR REPLACE INTO file_hashes 
-               (filepath, content_hash, mtime, size, chunk_count, indexed_at) 
-               VALUES (?, ?, ?, ?, ?, CURRENT_TIMESTAMP)""",
-            items
+               (filepath, content_hash, mtime, size, chunk_count, mtime_ns, indexed_at) 
+               VALUES (?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)""",
+            [item if len(item) == 6 else (*item, None) for item in items]
         )
         conn.commit()
     
@@ -250,6 +473,15 @@ class FileHashCache:
         conn.execute("DELETE FROM file_hashes WHERE filepath = ?", (filepath,))
         conn.commit()
     
+    def remove_files_batch(self, filepaths: List[str]):
+        """Remove several files from the hash cache in one transaction"""
+        if not filepaths:
+            return
+        
+        conn = self._get_conn()
+        conn.executemany("DELETE FROM file_hashes WHERE filepath = ?", [(fp,) for fp in filepaths])
+        conn.commit()
+    
     def get_stats(self) -> Dict:
         """Get cache statistics"""
         conn = self._get_conn()
@@ -260,8 +492,52 @@ class FileHashCache:
             "total_chunks": row[1] or 0
         }
     
+    def load_dir_listings(self) -> Dict[str, Tuple[int, List[str], List[str]]]:
+        """Load every cached directory listing as {dirpath: (mtime_ns, files, subdirs)}"""
+        conn = self._get_conn()
+        cursor = conn.execute("SELECT dirpath, mtime_ns, files, subdirs FROM dir_listings")
+        split = lambda names: names.split("\0") if names else []
+        return {
+            dirpath: (mtime_ns, split(files), split(subdirs))
+            for dirpath, mtime_ns, files, subdirs in cursor.fetchall()
+        }
+    
+    def save_dir_listings(
+        self,
+        listings: Iterable[Tuple[str, int, List[str], List[str]]],
+        removed: Iterable[str] = ()
+    ):
+        """
+        Store (dirpath, mtime_ns, files, subdirs) listings.
+        
+        A directory's mtime changes whenever an entry is added, removed or
+        renamed in it, so a listing stays valid while the mtime matches.
+        Names are NUL-separated since they can't contain NUL. Listings of
+        the removed directories (gone since the last walk) are deleted in
+        the same transaction.
+        """
+        conn = self._get_conn()
+        conn.executemany("DELETE FROM dir_listings WHERE dirpath = ?", [(d,) for d in removed])
+        conn.executemany(
+            """INSERT OR REPLACE INTO dir_listings (dirpath, mtime_ns, files, subdirs)
+               VALUES (?, ?, ?, ?)""",
+            [(d, m, "\0".join(files), "\0".join(subdirs)) for d, m, files, subdirs in listings]
+        )
+        conn.commit()
+    
+    def remove_dir_listings(self, root: str):
+        """Forget the cached listings of root and every directory under it"""
+        prefix = os.path.join(root, '')
+        conn = self._get_conn()
+        conn.execute(
+            "DELETE FROM dir_listings WHERE dirpath = ? OR substr(dirpath, 1, ?) = ?",
+            (root, len(prefix), prefix)
+        )
+        conn.commit()
+    
     def clear(self):
         """Clear the hash cache"""
         conn = self._get_conn()
         conn.execute("DELETE FROM file_hashes")
+        conn.execute("DELETE FROM dir_listings")
         conn.commit()
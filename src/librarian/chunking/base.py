@@ -5,10 +5,9 @@ Base classes for the chunking strategy pattern.
 import hashlib
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
-from typing import List
+from typing import List, Tuple
 
 from ..consts import (
-    CHUNK_OVERLAP_LINES,
     CHUNK_SIZE_LINES,
     MAX_EMBEDDING_TEXT_LENGTH,
     MIN_CHUNK_SIZE_CHARS,
@@ -43,12 +42,10 @@ class BaseChunker(ABC):
     def __init__(
         self,
         max_chunk_lines: int = CHUNK_SIZE_LINES,
-        overlap_lines: int = CHUNK_OVERLAP_LINES,
         max_text_length: int = MAX_EMBEDDING_TEXT_LENGTH,
         min_chunk_chars: int = MIN_CHUNK_SIZE_CHARS,
     ):
         self.max_chunk_lines = max_chunk_lines
-        self.overlap_lines = overlap_lines
         self.max_text_length = max_text_length
         self.min_chunk_chars = min_chunk_chars
     
@@ -79,10 +76,15 @@ class BaseChunker(ABC):
         pass
     
     def _generate_chunk_id(self, filepath: str, start_line: int, end_line: int, content: str) -> str:
-        """Generate a unique chunk ID."""
-        return hashlib.md5(
-            f"{filepath}:{start_line}:{end_line}:{hash(content)}".encode()
-        ).hexdigest()
+        """
+        Generate a unique chunk ID.
+        
+        One BLAKE2b pass over the location and the content itself, so IDs are
+        stable across runs (str hash() is salted per process).
+        """
+        digest = hashlib.blake2b(f"{filepath}:{start_line}:{end_line}:".encode(), digest_size=16)
+        digest.update(content.encode())
+        return digest.hexdigest()
     
     def _create_embedding_text(self, context_header: str, filepath: str, chunk_type: str, content: str) -> str:
         """Create the embedding text with context header."""
@@ -108,17 +110,20 @@ Type: {chunk_type}
         file_type: str,
         arch_indicators: List[str],
     ) -> List[ChunkData]:
-        """Split large content into overlapping chunks."""
+        """
+        Split large content into chunks of at most max_chunk_lines, without overlap.
+        
+        See _split_ranges() for where the cuts fall.
+        """
         chunks = []
-        i = 0
-        part = 1
+        deltas = [line.count('{') - line.count('}') for line in lines]
+        ranges = self._split_ranges(deltas, 0, len(lines))
         
-        while i < len(lines):
-            end_idx = min(i + self.max_chunk_lines, len(lines))
+        for part, (i, end_idx) in enumerate(ranges, 1):
             chunk_lines = lines[i:end_idx]
             content = "\n".join(chunk_lines)
             
-            header = f"{context_header} (part {part})" if len(lines) > self.max_chunk_lines else context_header
+            header = f"{context_header} (part {part})" if len(ranges) > 1 else context_header
             
             if len(content) >= self.min_chunk_chars:
                 content = self._truncate_content(content)
@@ -136,8 +141,73 @@ Type: {chunk_type}
                     embedding_text=self._create_embedding_text(header, filepath, chunk_type, content),
                     file_type=file_type,
                 ))
-            
-            i += self.max_chunk_lines - self.overlap_lines
-            part += 1
         
         return chunks
+    
+    def _split_ranges(
+        self, deltas: List[int], lo: int, hi: int, head: int = 0, level: int = 0
+    ) -> List[Tuple[int, int]]:
+        """
+        Split lines [lo, hi) into (start, end) ranges of at most max_chunk_lines.
+        
+        Recursive split-then-merge: the range is cut into units that each
+        leave the brace depth where it started (a statement, or a whole
+        block), oversized units are split again inside their outer braces,
+        and adjacent pieces are merged greedily while they fit. Cuts therefore
+        land between statements rather than at a fixed stride.
+        
+        deltas holds each line's net brace change. head is the length of the
+        caller's pending piece just before lo; the first range is kept small
+        enough to be merged into it (so a signature stays with its body).
+        """
+        size = self.max_chunk_lines
+        if hi - lo <= size:
+            return [(lo, hi)]
+        
+        units = []
+        start = lo
+        depth = 0
+        for i in range(lo, hi):
+            # A stray '}' (from slicing a member out of its class) just ends the unit
+            depth = max(depth + deltas[i], 0)
+            if depth == 0:
+                units.append((start, i + 1))
+                start = i + 1
+        if start < hi:
+            units.append((start, hi))
+        
+        # Seeded with the caller's pending piece so the first merge accounts for it
+        merged = [(lo - head, lo)] if head else []
+        
+        def add(start: int, end: int):
+            if merged and end - merged[-1][0] <= size:
+                merged[-1] = (merged[-1][0], end)
+            else:
+                merged.append((start, end))
+        
+        def pending() -> int:
+            return merged[-1][1] - merged[-1][0] if merged else 0
+        
+        for start, end in units:
+            if end - start <= size:
+                add(start, end)
+            elif len(units) > 1:
+                for piece in self._split_ranges(deltas, start, end, pending() % size, level + 1):
+                    add(*piece)
+            elif end - start > 2 and level < 32:
+                # One block spans the range: recurse between its first and last line
+                add(start, start + 1)
+                for piece in self._split_ranges(deltas, start + 1, end - 1, pending() % size, level + 1):
+                    add(*piece)
+                add(end - 1, end)
+            else:
+                for i in range(start, end, size):
+                    add(i, min(i + size, end))
+        
+        if head:
+            # Hand the seed back: the caller merges the first range into its own piece
+            if merged[0][1] == lo:
+                merged.pop(0)
+            else:
+                merged[0] = (lo, merged[0][1])
+        return merged
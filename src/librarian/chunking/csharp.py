@@ -2,13 +2,18 @@
 C# language chunker implementation.
 """
 
+import logging
 import re
 from typing import Dict, List, Optional
 
 from .base import BaseChunker, ChunkData
 
+logger = logging.getLogger(__name__)
 
-# Patterns for C# semantic boundary detection
+
+# Patterns for C# semantic boundary detection. The method and property
+# patterns backtrack heavily, so _parse_structure only tries a pattern on
+# lines containing the literals it requires (cheap C-level substring checks)
 PATTERNS = {
     'namespace': re.compile(r'^namespace\s+([\w\.]+)'),
     'class': re.compile(r'^(?:public|private|internal|protected)?\s*(?:static|sealed|abstract|partial)?\s*(?:class|interface|struct|record|enum)\s+(\w+)'),
@@ -25,12 +30,44 @@ ARCH_INDICATORS = [
     'Startup', 'Program.cs', 'appsettings',
 ]
 
+# tree-sitter node types mapped onto the structure _parse_structure returns
+AST_NAMESPACES = {'namespace_declaration', 'file_scoped_namespace_declaration'}
+AST_CLASSES = {
+    'class_declaration', 'interface_declaration', 'struct_declaration',
+    'record_declaration', 'record_struct_declaration', 'enum_declaration',
+}
+AST_METHODS = {
+    'method_declaration', 'constructor_declaration', 'destructor_declaration',
+    'operator_declaration', 'conversion_operator_declaration',
+}
+AST_PROPERTIES = {'property_declaration'}
+AST_MEMBERS = AST_METHODS | AST_PROPERTIES
+
+
+def _load_parser():
+    """The tree-sitter C# parser, or None when tree_sitter_languages isn't installed."""
+    try:
+        from tree_sitter_languages import get_parser
+        return get_parser('c_sharp')
+    except Exception as e:
+        logger.debug(f"tree-sitter C# parser unavailable, using regex parsing: {e}")
+        return None
+
 
 class CSharpChunker(BaseChunker):
     """
     C# semantic chunker that splits files at class/method boundaries.
+    
+    Boundaries come from a tree-sitter syntax tree when the optional
+    tree_sitter_languages package is installed (one C-level parse, and
+    braces in strings or comments can't throw it off); otherwise from the
+    line-based regex parser.
     """
     
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._parser = _load_parser()
+    
     @property
     def supported_extensions(self) -> List[str]:
         return ['.cs', '.csx']
@@ -45,7 +82,16 @@ class CSharpChunker(BaseChunker):
         if not lines:
             return []
         
-        structure = self._parse_structure(lines)
+        structure = None
+        # Syntax tree rows count '\n' only; splitlines() also breaks on rarer
+        # separators, and then rows and line indexes would disagree
+        if self._parser is not None and len(lines) == content.count('\n') + (not content.endswith('\n')):
+            try:
+                structure = self._parse_structure_ast(content)
+            except Exception as e:
+                logger.debug(f"tree-sitter parse failed for {filepath}, using regex parsing: {e}")
+        if structure is None:
+            structure = self._parse_structure(lines)
         
         if structure['methods'] or structure['properties']:
             chunks = self._chunk_by_members(filepath, lines, structure)
@@ -58,6 +104,62 @@ class CSharpChunker(BaseChunker):
         
         return chunks
     
+    def _parse_structure_ast(self, content: str) -> Dict:
+        """
+        Build the _parse_structure() result from a tree-sitter syntax tree.
+        
+        Start and end lines are the declaration nodes' rows, so members need
+        no brace matching. As with the regex parser, only members with a
+        block body (methods) or accessor list (properties) are kept.
+        """
+        tree = self._parser.parse(content.encode('utf-8'))
+        structure = {
+            'namespace': None,
+            'classes': [],
+            'methods': [],
+            'properties': [],
+            'usings_end': 0,
+        }
+        
+        def name_of(node) -> str:
+            name = node.child_by_field_name('name')
+            return name.text.decode('utf-8', errors='replace') if name is not None else node.type
+        
+        # (node, enclosing class name, class nesting depth), in document order
+        stack = [(tree.root_node, None, 0)]
+        while stack:
+            node, current_class, depth = stack.pop()
+            node_type = node.type
+            
+            if node_type == 'using_directive':
+                structure['usings_end'] = node.end_point[0] + 1
+            elif node_type in AST_NAMESPACES:
+                structure['namespace'] = name_of(node)
+            elif node_type in AST_CLASSES:
+                current_class = name_of(node)
+                structure['classes'].append({
+                    'name': current_class,
+                    'start': node.start_point[0],
+                    'end': node.end_point[0],
+                    'depth': depth
+                })
+                depth += 1
+            elif current_class and node_type in AST_MEMBERS:
+                body = 'block' if node_type in AST_METHODS else 'accessor_list'
+                if any(child.type == body for child in node.children):
+                    kind = 'methods' if node_type in AST_METHODS else 'properties'
+                    structure[kind].append({
+                        'name': name_of(node),
+                        'start': node.start_point[0],
+                        'end': node.end_point[0],
+                        'class': current_class
+                    })
+                continue  # Members hold no further declarations of interest
+            
+            stack.extend((child, current_class, depth) for child in reversed(node.children))
+        
+        return structure
+    
     def _parse_structure(self, lines: List[str]) -> Dict:
         """Parse C# file structure to find semantic boundaries."""
         structure = {
@@ -68,6 +170,11 @@ class CSharpChunker(BaseChunker):
             'usings_end': 0,
         }
         
+        # Braces per line, counted once for this pass and _find_member_ends
+        # (stripping doesn't change the counts)
+        opens = [line.count('{') for line in lines]
+        deltas = [n - line.count('}') for n, line in zip(opens, lines)]
+        
         brace_depth = 0
         current_class = None
         current_class_depth = 0
@@ -75,17 +182,15 @@ class CSharpChunker(BaseChunker):
         for i, line in enumerate(lines):
             stripped = line.strip()
             
-            # Track using statements
-            if stripped.startswith('using ') and structure['usings_end'] == 0:
+            # Track using statements (first line that isn't blank or a comment)
+            if structure['usings_end'] == 0 and stripped and not stripped.startswith('//'):
                 structure['usings_end'] = i
-            elif not stripped.startswith('using ') and not stripped.startswith('//') and stripped:
-                if structure['usings_end'] == 0:
-                    structure['usings_end'] = i
             
             # Namespace
-            match = PATTERNS['namespace'].match(stripped)
-            if match:
-                structure['namespace'] = match.group(1)
+            if stripped.startswith('namespace'):
+                match = PATTERNS['namespace'].match(stripped)
+                if match:
+                    structure['namespace'] = match.group(1)
             
             # Class/Interface/Struct
             match = PATTERNS['class'].match(stripped)
@@ -111,17 +216,18 @@ class CSharpChunker(BaseChunker):
                     })
             
             # Property
-            match = PATTERNS['property'].match(stripped)
-            if match and current_class:
-                structure['properties'].append({
-                    'name': match.group(1),
-                    'start': i,
-                    'end': None,
-                    'class': current_class
-                })
+            if current_class and '{' in stripped and ('get' in stripped or 'set' in stripped):
+                match = PATTERNS['property'].match(stripped)
+                if match:
+                    structure['properties'].append({
+                        'name': match.group(1),
+                        'start': i,
+                        'end': None,
+                        'class': current_class
+                    })
             
             # Track braces
-            brace_depth += stripped.count('{') - stripped.count('}')
+            brace_depth += deltas[i]
             
             # Close class
             if structure['classes'] and brace_depth < structure['classes'][-1]['depth']:
@@ -129,11 +235,15 @@ class CSharpChunker(BaseChunker):
                 if current_class_depth >= brace_depth:
                     current_class = None
         
-        self._find_member_ends(lines, structure)
+        self._find_member_ends(lines, structure, opens, deltas)
         return structure
     
-    def _find_member_ends(self, lines: List[str], structure: Dict):
-        """Find end lines for methods and properties."""
+    def _find_member_ends(self, lines: List[str], structure: Dict, opens: List[int], deltas: List[int]):
+        """
+        Find end lines for methods and properties.
+        
+        opens and deltas are the per-line '{' counts and net brace changes.
+        """
         all_members = structure['methods'] + structure['properties']
         all_members.sort(key=lambda x: x['start'])
         
@@ -143,10 +253,9 @@ class CSharpChunker(BaseChunker):
             in_body = False
             
             for j in range(start, len(lines)):
-                stripped = lines[j].strip()
-                brace_count += stripped.count('{') - stripped.count('}')
+                brace_count += deltas[j]
                 
-                if '{' in stripped:
+                if opens[j]:
                     in_body = True
                 
                 if in_body and brace_count == 0:
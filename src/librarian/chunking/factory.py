@@ -26,6 +26,8 @@ class ChunkerFactory:
     def __init__(self):
         self._chunkers: Dict[str, BaseChunker] = {}
         self._extension_map: Dict[str, str] = {}
+        # Raw (not lowercased) extension -> chunker, filled on first lookup
+        self._chunker_cache: Dict[str, Optional[BaseChunker]] = {}
         
         # Register built-in chunkers
         self.register(CSharpChunker())
@@ -37,6 +39,7 @@ class ChunkerFactory:
         
         for ext in chunker.supported_extensions:
             self._extension_map[ext.lower()] = lang
+        self._chunker_cache.clear()
     
     def get_chunker(self, filepath_or_extension: str) -> Optional[BaseChunker]:
         """
@@ -49,12 +52,19 @@ class ChunkerFactory:
             Chunker instance or None if no chunker supports this file type
         """
         if '.' in filepath_or_extension:
-            ext = os.path.splitext(filepath_or_extension)[1].lower()
+            ext = os.path.splitext(filepath_or_extension)[1]
         else:
-            ext = filepath_or_extension.lower()
+            ext = filepath_or_extension
         
-        lang = self._extension_map.get(ext)
-        return self._chunkers.get(lang) if lang else None
+        try:
+            return self._chunker_cache[ext]
+        except KeyError:
+            pass
+        
+        lang = self._extension_map.get(ext.lower())
+        chunker = self._chunkers.get(lang) if lang else None
+        self._chunker_cache[ext] = chunker
+        return chunker
     
     def get_supported_extensions(self) -> List[str]:
         """Get list of all supported file extensions."""
@@ -9,6 +9,10 @@ from typing import Any
 
 import yaml
 
+# libyaml's loader parses config.yaml ~10x faster than the pure-Python one,
+# which dominated this module's import time
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
 def _load_config() -> dict[str, Any]:
     """Load configuration from YAML file."""
     config_paths = [
@@ -19,7 +23,7 @@ def _load_config() -> dict[str, Any]:
     for path in config_paths:
         if path.exists():
             with open(path) as f:
-                return yaml.safe_load(f)
+                return yaml.load(f, Loader=_YAML_LOADER) or {}
 
     return {}
 
@@ -27,8 +31,8 @@ _config = _load_config()
 
 def _get(section: str, key: str, default: Any, env_var: str | None = None) -> Any:
     """Get config value with env override."""
-    if env_var and os.getenv(env_var):
-        val = os.getenv(env_var)
+    val = os.getenv(env_var) if env_var else None
+    if val:
         if isinstance(default, bool):
             return val.lower() == "true"
         if isinstance(default, int):
@@ -65,15 +69,18 @@ OLLAMA_LLM_MODEL = _get("ollama", "llm_model", "qwen3:8b")
 # Performance
 MAX_WORKERS = _get("performance", "max_workers", 4, "MAX_WORKERS")
 EMBEDDING_BATCH_SIZE = _get("embedding", "batch_size", 50, "EMBEDDING_BATCH_SIZE")
+# Texts per embedding provider request (sub-batches of an embed_batch call)
+EMBEDDING_REQUEST_SIZE = _get("embedding", "request_size", 16, "EMBEDDING_REQUEST_SIZE")
 DB_BATCH_SIZE = _get("database", "batch_size", 500, "DB_BATCH_SIZE")
 
 # Chunking
 CHUNK_SIZE_LINES = _get("chunking", "chunk_size_lines", 15, "CHUNK_SIZE_LINES")
-CHUNK_OVERLAP_LINES = _get("chunking", "overlap_lines", 3, "CHUNK_OVERLAP_LINES")
 MAX_CONTEXT_STACK_DEPTH = _get("chunking", "max_context_stack_depth", 10)
 
 # Embedding limits
 MAX_EMBEDDING_TEXT_LENGTH = _get("embedding", "max_text_length", 1500, "MAX_EMBEDDING_TEXT_LENGTH")
+# Characters shared by consecutive pieces when an oversized text is split
+EMBEDDING_SPLIT_OVERLAP = _get("embedding", "split_overlap", 150, "EMBEDDING_SPLIT_OVERLAP")
 MIN_CHUNK_SIZE_CHARS = _get("chunking", "min_chunk_chars", 50, "MIN_CHUNK_SIZE_CHARS")
 
 # Watching
@@ -7,15 +7,50 @@ LanceDB database manager with performance optimizations:
 """
 
 import lancedb
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
 from lancedb.pydantic import LanceModel, Vector
 from lancedb.embeddings import get_registry
-from typing import List, Optional, Dict, Set
+from typing import Iterator, List, Optional, Dict, Set
 import os
 import logging
+import time
 from .consts import LANCEDB_PATH, DB_TABLE_NAME
 
 logger = logging.getLogger(__name__)
 
+# Filepaths per "filepath IN (...)" delete predicate
+DELETE_BATCH_SIZE = 500
+
+# How long searches skip the row count once a table is found too small to index
+INDEX_RECHECK_SECONDS = 60.0
+
+# Vectors are stored as half floats: half the disk footprint and scan
+# bandwidth of float32, with negligible recall loss for retrieval
+VECTOR_VALUE_TYPE = pa.float16()
+
+# Every provider now returns unit-length vectors (Ollama's /api/embed does,
+# its older /api/embeddings did not). Tables are checked on open by sampling
+# this many rows spread over the table; a norm further than the tolerance
+# from 1 means the table predates that. optimize() then rescales it, so L2
+# search ranks stored rows against unit-length queries without re-embedding.
+NORM_SAMPLE_ROWS = 256
+UNIT_NORM_TOLERANCE = 0.01
+
+# Rows per batch when a table's vectors are rewritten
+MIGRATE_BATCH_ROWS = 10000
+
+
+def _sql_literal(value: str) -> str:
+    """Quote a string for a LanceDB SQL predicate (where/delete/update)."""
+    return "'" + value.replace("'", "''") + "'"
+
+
+def _like_escape(value: str) -> str:
+    """Escape LIKE wildcards (and the backslash escape character) in value."""
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
 
 class CodeChunk(LanceModel):
     id: str
@@ -24,10 +59,25 @@ class CodeChunk(LanceModel):
     context_header: str
     summary: str = ""
     is_architecture_node: bool = False
-    vector: Vector(768)
+    vector: Vector(768, value_type=VECTOR_VALUE_TYPE)
     file_type: str
 
 
+def create_code_chunk_model(dimension: int = 768):
+    """Create a CodeChunk model whose vector column has the given dimension."""
+    class DimensionedCodeChunk(LanceModel):
+        id: str
+        content: str
+        filepath: str
+        context_header: str
+        summary: str = ""
+        is_architecture_node: bool = False
+        vector: Vector(dimension, value_type=VECTOR_VALUE_TYPE)
+        file_type: str
+
+    return DimensionedCodeChunk
+
+
 class LanceDBManager:
     """
     Optimized LanceDB manager with:
@@ -44,7 +94,6 @@ class LanceDBManager:
         self.dimension = dimension
         self._code_chunk_model = None
         self._init_table()
-        self._index_created = False
 
     def set_dimension(self, dimension: int):
         """
@@ -92,13 +141,38 @@ class LanceDBManager:
                 )
 
         self.table = self.db.open_table(self.table_name)
+        self._index_created = False
+        # monotonic() deadline before which a too-small table isn't re-checked;
+        # writes through this manager clear it, other writers are seen once it passes
+        self._index_deferred_until = 0.0
 
-        # Create FTS index on content
+        # Rewriting the table is left to optimize(): here it would run in
+        # every process that opens the database, racing their writes
+        try:
+            if self._has_unnormalized_vectors():
+                logger.warning(
+                    f"Table {self.table_name} holds vectors that are not unit length "
+                    f"(written before Ollama's /api/embed); search ranking suffers until "
+                    f"'librarian optimize' rescales them."
+                )
+        except Exception as e:
+            logger.debug(f"Vector norm check skipped: {e}")
+
+        self._create_secondary_indexes()
+
+    def _create_secondary_indexes(self):
+        """Create the full-text index on content and a scalar index on filepath."""
         try:
             self.table.create_fts_index("content")
         except Exception:
             pass  # Might already exist or not supported
 
+        # Turns per-file lookups and "filepath IN (...)" deletes into index seeks
+        try:
+            self.table.create_scalar_index("filepath", replace=False)
+        except Exception:
+            pass  # Already exists, or not supported by this LanceDB version
+
     def _save_metadata(self):
         """Save dimension metadata to a separate metadata table."""
         try:
@@ -113,8 +187,7 @@ class LanceDBManager:
                 meta_table = self.db.open_table("_metadata")
                 # Delete old entry for this table
                 try:
-                    safe_name = self.table_name.replace("'", "''")
-                    meta_table.delete(f"table_name = '{safe_name}'")
+                    meta_table.delete(f"table_name = {_sql_literal(self.table_name)}")
                 except Exception:
                     pass
                 meta_table.add([metadata])
@@ -126,20 +199,35 @@ class LanceDBManager:
         try:
             if "_metadata" in self.db.table_names():
                 meta_table = self.db.open_table("_metadata")
-                safe_name = self.table_name.replace("'", "''")
-                results = meta_table.search().where(f"table_name = '{safe_name}'").limit(1).to_list()
+                where = f"table_name = {_sql_literal(self.table_name)}"
+                results = meta_table.search().where(where).limit(1).to_list()
                 if results:
                     return results[0].get("dimension")
         except Exception as e:
             logger.debug(f"Could not load metadata: {e}")
         return None
 
-    def _ensure_vector_index(self):
+    def _has_vector_index(self) -> bool:
+        """Check whether the table already has an index on the vector column."""
+        try:
+            return any("vector" in index.columns for index in self.table.list_indices())
+        except Exception:
+            return False
+
+    def _ensure_vector_index(self, rebuild: bool = False):
         """
         Create optimized vector index for faster search on large datasets.
         Only creates index if table has enough rows.
+
+        An index built by an earlier process is reused, so only the first
+        search after a large import pays for training; rebuild forces a
+        fresh index over the current rows (optimize()).
         """
-        if self._index_created:
+        if not rebuild and (self._index_created or time.monotonic() < self._index_deferred_until):
+            return
+
+        if not rebuild and self._has_vector_index():
+            self._index_created = True
             return
 
         try:
@@ -149,62 +237,113 @@ class LanceDBManager:
                 # num_partitions should be sqrt(n) approximately
                 num_partitions = min(256, max(8, int(row_count ** 0.5)))
 
+                # PQ needs sub-vectors that evenly divide the dimension;
+                # 16 dimensions each (48 for 768) when possible
+                dimension = self.dimension or 768
+                num_sub_vectors = dimension // 16 if dimension % 16 == 0 else 1
+
                 self.table.create_index(
-                    metric="L2",
+                    metric="L2",  # Must match the metric search() uses
                     num_partitions=num_partitions,
-                    num_sub_vectors=48,  # 768 / 16 = 48 for PQ
+                    num_sub_vectors=num_sub_vectors,
+                    vector_column_name="vector",
                     index_type="IVF_PQ",
                     replace=True
                 )
                 self._index_created = True
                 logger.info(f"Created IVF-PQ index with {num_partitions} partitions")
+            else:
+                self._index_deferred_until = time.monotonic() + INDEX_RECHECK_SECONDS
         except Exception as e:
             # Index creation might fail on older LanceDB versions
             logger.debug(f"Vector index creation skipped: {e}")
 
     def add_chunks_batch(self, chunks: List[CodeChunk], batch_size: int = 500):
-        """Batch insert chunks."""
-        for i in range(0, len(chunks), batch_size):
-            self.table.add(chunks[i:i + batch_size])
+        """
+        Batch insert chunks.
+
+        The models are converted to one Arrow table column by column (see
+        replace_files()) rather than handing LanceDB pydantic objects to
+        convert row by row; batch_size still bounds the rows per write.
+        """
+        if not chunks:
+            return
+        names = [f.name for f in self.table.schema if f.name != "vector"]
+        columns = {name: [getattr(chunk, name) for chunk in chunks] for name in names}
+        data = self._chunk_table(columns, [chunk.vector for chunk in chunks])
+        for i in range(0, data.num_rows, batch_size):
+            self.table.add(data.slice(i, batch_size))
+        self._index_deferred_until = 0.0
 
     def upsert_chunks(self, chunks: List[CodeChunk], filepath: str):
         """Delete old chunks for file and insert new ones."""
         if not chunks:
             return
 
-        # Sanitize filepath for query
-        safe_path = filepath.replace("'", "''")
         try:
-            self.table.delete(f"filepath = '{safe_path}'")
+            self.delete_by_file(filepath)
         except Exception:
             pass
 
         self.add_chunks_batch(chunks)
 
+    def replace_files(self, filepaths: List[str], columns: Dict[str, list], vectors: List[List[float]]):
+        """
+        Replace all rows of several files with one delete pass and one write.
+
+        columns maps every non-vector field of the chunk schema to its values,
+        row-aligned with vectors. Rows go to LanceDB as a single Arrow table
+        (vectors as a FixedSizeListArray) instead of one pydantic model per
+        chunk, so the per-call write overhead is paid once per batch and each
+        batch lands in one fragment.
+        """
+        self.delete_by_files_batch(filepaths)
+        if len(vectors):
+            self.table.add(self._chunk_table(columns, vectors))
+            self._index_deferred_until = 0.0
+
+    def _vector_dtype(self) -> np.dtype:
+        """NumPy dtype of the stored vectors (float32 for tables not yet migrated)."""
+        return np.dtype(self.table.schema.field("vector").type.value_type.to_pandas_dtype())
+
+    def _chunk_table(self, columns: Dict[str, list], vectors: List[List[float]]) -> pa.Table:
+        """Build an Arrow table matching the schema of the open table."""
+        schema = self.table.schema
+        vector_type = schema.field("vector").type
+        flat = np.asarray(vectors, dtype=self._vector_dtype()).reshape(-1)
+        vector_array = pa.FixedSizeListArray.from_arrays(pa.array(flat), vector_type.list_size)
+
+        arrays = [
+            vector_array if f.name == "vector" else pa.array(columns[f.name], type=f.type)
+            for f in schema
+        ]
+        return pa.Table.from_arrays(arrays, schema=schema)
+
     def upsert_files_batch(self, files_chunks: Dict[str, List[CodeChunk]]):
         """Batch upsert for multiple files."""
         if not files_chunks:
             return
 
-        for fp in files_chunks:
-            safe_path = fp.replace("'", "''")
-            try:
-                self.table.delete(f"filepath = '{safe_path}'")
-            except Exception:
-                pass
+        self.delete_by_files_batch(list(files_chunks))
 
         all_chunks = [c for chunks in files_chunks.values() for c in chunks]
         if all_chunks:
             self.add_chunks_batch(all_chunks)
 
     def search(self, query_vector: List[float], limit: int = 10, file_type: Optional[str] = None):
-        """Vector search with optional filtering."""
+        """
+        Vector search with optional filtering.
+
+        Rows come back without their vector column (nothing downstream uses
+        it, and it is by far the costliest column to turn into Python).
+        """
         self._ensure_vector_index()
 
-        search_builder = self.table.search(query_vector).limit(limit)
+        query = np.asarray(query_vector, dtype=self._vector_dtype())
+        columns = [f.name for f in self.table.schema if f.name != "vector"]
+        search_builder = self.table.search(query).select(columns).limit(limit)
         if file_type:
-            safe_type = file_type.replace("'", "''")
-            search_builder = search_builder.where(f"file_type = '{safe_type}'")
+            search_builder = search_builder.where(f"file_type = {_sql_literal(file_type)}")
         return search_builder.to_list()
 
     def search_hybrid(self, query: str, limit: int = 10):
@@ -216,39 +355,117 @@ class LanceDBManager:
 
     def search_by_file(self, filepath: str, limit: int = 100) -> List[Dict]:
         """Get all chunks for a specific file."""
-        safe_path = filepath.replace("'", "''")
         try:
-            return self.table.search().where(f"filepath = '{safe_path}'").limit(limit).to_list()
+            # Plain filtered scan of the Lance dataset; the filter is an Arrow
+            # expression, so the path needs no SQL quoting
+            dataset = self.table.to_lance()
+            return dataset.to_table(filter=pc.field("filepath") == filepath, limit=limit).to_pylist()
+        except Exception:
+            pass  # pylance not installed or not a local table
+        try:
+            where = f"filepath = {_sql_literal(filepath)}"
+            return self.table.search().where(where).limit(limit).to_list()
         except Exception:
             return []
 
+    def get_summaries(self, directory: str, limit: int = 50) -> Dict[str, str]:
+        """
+        Summaries of up to limit files under directory, as {filepath: summary}.
+
+        An absolute directory is matched as a path prefix, which the filepath
+        scalar index can serve; anything else matches anywhere in the path.
+        Only the filepath and summary columns are read, and the scan stops
+        once limit distinct files have been seen (every chunk of a file
+        carries the same summary).
+        """
+        pattern = _like_escape(directory) + "%"
+        if not os.path.isabs(directory):
+            pattern = "%" + pattern
+        where = f"filepath LIKE {_sql_literal(pattern)} AND summary != ''"
+        columns = ["filepath", "summary"]
+
+        try:
+            batches = self.table.to_lance().to_batches(columns=columns, filter=where)
+        except Exception:
+            # pylance not installed or not a local table: a bounded query
+            # instead, allowing for several chunks per file
+            rows = self.table.search().where(where).select(columns).limit(limit * 20).to_arrow()
+            batches = rows.to_batches()
+
+        summaries: Dict[str, str] = {}
+        for batch in batches:
+            for filepath, summary in zip(batch.column(0).to_pylist(), batch.column(1).to_pylist()):
+                if filepath not in summaries:
+                    if len(summaries) >= limit:
+                        return summaries
+                    summaries[filepath] = summary
+        return summaries
+
+    def scan_columns(self, columns: List[str]) -> pa.Table:
+        """
+        Read whole columns as an Arrow table.
+
+        Much cheaper than to_list() for aggregations: values stay in Arrow
+        buffers instead of becoming one Python dict per row. Reads the Lance
+        dataset directly when pylance is installed, otherwise goes through a
+        full-table query.
+        """
+        try:
+            return self.table.to_lance().to_table(columns=columns)
+        except Exception:
+            pass  # pylance not installed or not a local table
+
+        row_count = self.table.count_rows()
+        if not row_count:
+            return pa.table({name: pa.array([], type=pa.string()) for name in columns})
+        return self.table.search().select(columns).limit(row_count).to_arrow()
+
+    def iter_column_batches(self, columns: List[str]) -> Iterator[pa.RecordBatch]:
+        """
+        Stream whole columns as Arrow record batches.
+
+        For aggregations whose result is small (per-group counts), so memory
+        stays proportional to one batch instead of the whole column. Falls
+        back to batches of scan_columns() without pylance.
+        """
+        try:
+            batches = self.table.to_lance().to_batches(columns=columns)
+        except Exception:
+            batches = self.scan_columns(columns).to_batches()
+        yield from batches
+
+    def count_files(self) -> int:
+        """Number of distinct files with chunks in the table."""
+        return pc.count_distinct(self.scan_columns(["filepath"]).column("filepath")).as_py()
+
     def get_indexed_filepaths(self) -> Set[str]:
         """Get set of all indexed filepaths."""
         try:
-            results = self.table.search().limit(1000000).select(["filepath"]).to_list()
-            return {r['filepath'] for r in results}
+            # Deduplicate each batch in Arrow; only distinct paths become Python strings
+            filepaths = set()
+            for batch in self.iter_column_batches(["filepath"]):
+                filepaths.update(pc.unique(batch.column(0)).to_pylist())
+            return filepaths
         except Exception:
             return set()
 
     def delete_by_file(self, filepath: str):
         """Delete all chunks for a file."""
-        safe_path = filepath.replace("'", "''")
-        self.table.delete(f"filepath = '{safe_path}'")
+        self.table.delete(f"filepath = {_sql_literal(filepath)}")
 
     def delete_by_files_batch(self, filepaths: List[str]):
         """Batch delete chunks for multiple files."""
-        for fp in filepaths:
-            safe_path = fp.replace("'", "''")
+        for i in range(0, len(filepaths), DELETE_BATCH_SIZE):
+            quoted = ", ".join(map(_sql_literal, filepaths[i:i + DELETE_BATCH_SIZE]))
             try:
-                self.table.delete(f"filepath = '{safe_path}'")
+                self.table.delete(f"filepath IN ({quoted})")
             except Exception:
                 pass
 
     def update_summary(self, filepath: str, summary: str):
         """Update summary for a filepath."""
-        safe_path = filepath.replace("'", "''")
         try:
-            self.table.update(where=f"filepath = '{safe_path}'", values={"summary": summary})
+            self.table.update(where=f"filepath = {_sql_literal(filepath)}", values={"summary": summary})
         except Exception:
             pass
 
@@ -256,22 +473,23 @@ class LanceDBManager:
         """Get database statistics."""
         return {
             "num_rows": self.table.count_rows(),
-            "num_files": len(self.get_indexed_filepaths()),
+            "num_files": self.count_files(),
             "has_index": self._index_created
         }
 
     def get_detailed_stats(self) -> Dict:
         """Get detailed statistics."""
         try:
-            results = self.table.search().limit(1000000).select(["filepath", "is_architecture_node"]).to_list()
-            files = {r['filepath'] for r in results}
-            arch_chunks = sum(1 for r in results if r.get('is_architecture_node'))
+            data = self.scan_columns(["filepath", "is_architecture_node"])
+            total_chunks = data.num_rows
+            total_files = pc.count_distinct(data.column("filepath")).as_py()
+            arch_chunks = pc.sum(data.column("is_architecture_node")).as_py() if total_chunks else 0
 
             return {
-                "total_chunks": len(results),
-                "total_files": len(files),
-                "architecture_chunks": arch_chunks,
-                "avg_chunks_per_file": len(results) / max(1, len(files))
+                "total_chunks": total_chunks,
+                "total_files": total_files,
+                "architecture_chunks": arch_chunks or 0,
+                "avg_chunks_per_file": total_chunks / max(1, total_files)
             }
         except Exception:
             return {"error": "Failed to get stats"}
@@ -280,12 +498,104 @@ class LanceDBManager:
         """Clear all data and recreate table."""
         self.db.drop_table(self.table_name)
         self._init_table()
+
+    def _has_unnormalized_vectors(self) -> bool:
+        """
+        Check a sample of stored vectors for any that are not unit length (zeros excepted).
+
+        Rows are taken evenly across the table, since re-indexed files (and
+        the normalized /api/embeddings fallback) append unit-length rows to
+        tables whose older rows can sit anywhere.
+        """
+        try:
+            dataset = self.table.to_lance()
+            row_count = dataset.count_rows()
+            positions = np.unique(np.linspace(0, row_count - 1, NORM_SAMPLE_ROWS).astype(np.int64))
+            sample = dataset.take(positions.tolist(), columns=["vector"]) if row_count else None
+        except Exception:
+            # pylance not installed or not a local table: the first rows only
+            sample = self.table.search().select(["vector"]).limit(NORM_SAMPLE_ROWS).to_arrow()
+        if sample is None or not sample.num_rows:
+            return False
+
+        list_size = self.table.schema.field("vector").type.list_size
+        vectors = sample.column("vector").combine_chunks()
+        values = vectors.flatten().to_numpy(zero_copy_only=False).astype(np.float32)
+        norms = np.linalg.norm(values.reshape(-1, list_size), axis=1)
+        norms = norms[norms > 0]
+        return bool(np.any(np.abs(norms - 1.0) > UNIT_NORM_TOLERANCE))
+
+    def _migrate_vector_type(self, normalize: Optional[bool] = None):
+        """
+        Rewrite a table whose vectors are not VECTOR_VALUE_TYPE or not unit length yet.
+
+        Tables created before vectors were stored as half floats keep working
+        as they are (writes and queries follow the table's own schema); this
+        converts them in one pass. Tables written from Ollama's unnormalized
+        /api/embeddings vectors are rescaled, since their rows would otherwise
+        be ranked against unit-length queries. normalize is the result of an
+        earlier _has_unnormalized_vectors() check, sampled here if not given.
+
+        Only optimize() calls this: rows written by another process while the
+        table is rewritten are lost, so it must not run on every open. Rows
+        are streamed batch by batch from the current version of the table.
+        """
+        vector_field = self.table.schema.field("vector")
+        vector_type = vector_field.type
+        convert = vector_type.value_type != VECTOR_VALUE_TYPE
+        if normalize is None:
+            normalize = self._has_unnormalized_vectors()
+        if not convert and not normalize:
+            return
+
+        logger.info(
+            f"Rewriting {self.table_name} vectors"
+            f"{f' as {VECTOR_VALUE_TYPE}' if convert else ''}"
+            f"{' at unit length' if normalize else ''}"
+        )
+        list_size = vector_type.list_size
+        index = self.table.schema.get_field_index("vector")
+        schema = self.table.schema.set(
+            index, vector_field.with_type(pa.list_(VECTOR_VALUE_TYPE, list_size))
+        )
+        value_dtype = VECTOR_VALUE_TYPE.to_pandas_dtype()
+
+        try:
+            # A Lance dataset is pinned to its version, so it can be read
+            # while the overwrite below writes the next one
+            batches = self.table.to_lance().to_batches(batch_size=MIGRATE_BATCH_ROWS)
+        except Exception:
+            # pylance not installed or not a local table
+            batches = self.table.to_arrow().to_batches(max_chunksize=MIGRATE_BATCH_ROWS)
+
+        def rewritten():
+            for batch in batches:
+                values = batch.column(index).flatten().to_numpy(zero_copy_only=False)
+                if normalize:
+                    rows = values.astype(np.float32).reshape(-1, list_size)
+                    norms = np.linalg.norm(rows, axis=1, keepdims=True)
+                    # Zero vectors (failed embeddings) stay zero
+                    values = (rows / np.where(norms > 0, norms, 1.0)).reshape(-1)
+                columns = list(batch.columns)
+                columns[index] = pa.FixedSizeListArray.from_arrays(
+                    pa.array(values.astype(value_dtype)), list_size
+                )
+                yield pa.RecordBatch.from_arrays(columns, schema=schema)
+
+        self.db.create_table(self.table_name, data=rewritten(), schema=schema, mode="overwrite")
+        self.table = self.db.open_table(self.table_name)
         self._index_created = False
+        self._index_deferred_until = 0.0
+        self._create_secondary_indexes()
 
     def optimize(self):
-        """Optimize the database."""
-        self._ensure_vector_index()
+        """Optimize the database: migrate legacy vectors, compact, then rebuild the vector index."""
+        try:
+            self._migrate_vector_type()
+        except Exception as e:
+            logger.warning(f"Vector conversion skipped: {e}")
         try:
             self.table.compact_files()
         except Exception as e:
             logger.debug(f"Compaction skipped: {e}")
+        self._ensure_vector_index(rebuild=True)
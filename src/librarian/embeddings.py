@@ -5,16 +5,21 @@ Embedding engine with rate-limited queue, persistent cache, and connection pooli
 import hashlib
 import logging
 import os
+import re
 import threading
 import time
 from concurrent.futures import ThreadPoolExecutor, as_completed
-from functools import lru_cache
+from contextlib import contextmanager
 from typing import Dict, List, Optional, Tuple
 
 import httpx
+import numpy as np
 
 from .cache import EmbeddingCache
-from .consts import EMBEDDING_MODEL, EMBEDDING_PROVIDER, OLLAMA_HOST, MAX_EMBEDDING_TEXT_LENGTH
+from .consts import (
+    EMBEDDING_MODEL, EMBEDDING_PROVIDER, EMBEDDING_REQUEST_SIZE, EMBEDDING_SPLIT_OVERLAP, OLLAMA_HOST,
+    MAX_EMBEDDING_TEXT_LENGTH
+)
 from .providers import get_embedding_provider
 
 logging.getLogger("httpx").setLevel(logging.WARNING)
@@ -23,7 +28,61 @@ logging.getLogger("httpcore").setLevel(logging.WARNING)
 logger = logging.getLogger(__name__)
 
 
-def split_text_into_chunks(text: str, max_length: int = MAX_EMBEDDING_TEXT_LENGTH) -> List[str]:
+def split_text_into_spans(
+    text: str,
+    max_length: int = MAX_EMBEDDING_TEXT_LENGTH,
+    overlap: int = EMBEDDING_SPLIT_OVERLAP,
+) -> List[Tuple[int, int]]:
+    """
+    (start, end) character offsets of the pieces split_text_into_chunks returns.
+
+    Pieces are packed greedily from whole lines; a line longer than a piece is
+    packed word by word, and a single word longer than a piece is cut. Each
+    piece after the first starts up to ``overlap`` characters (whole lines or
+    words) before the previous one ended, so text near a boundary is embedded
+    with its surrounding context in at least one piece.
+    """
+    if len(text) <= max_length:
+        return [(0, len(text))]
+
+    chunk_size = max_length - 50  # Leave room for metadata
+
+    # Units are lines, or words (and slices of words) of lines too long for a piece
+    units: List[Tuple[int, int]] = []
+    pos = 0
+    for line in text.split('\n'):
+        if len(line) <= chunk_size:
+            units.append((pos, pos + len(line)))
+        else:
+            for match in re.finditer(r'\S+', line):
+                for word_start in range(match.start(), match.end(), chunk_size):
+                    units.append((pos + word_start, pos + min(word_start + chunk_size, match.end())))
+        pos += len(line) + 1
+
+    spans = []
+    current: List[Tuple[int, int]] = []
+    for unit in units:
+        if current and unit[1] - current[0][0] > chunk_size:
+            spans.append((current[0][0], current[-1][1]))
+            # Carry the trailing units that fit in the overlap and leave room for this one
+            boundary = current[-1][1]
+            current = [u for u in current[1:]
+                       if boundary - u[0] <= overlap and unit[1] - u[0] <= chunk_size]
+        current.append(unit)
+    if current:
+        spans.append((current[0][0], current[-1][1]))
+
+    if len(spans) > 1:
+        logger.info(f"Split text into {len(spans)} chunks (original: {len(text)} chars)")
+
+    return spans
+
+
+def split_text_into_chunks(
+    text: str,
+    max_length: int = MAX_EMBEDDING_TEXT_LENGTH,
+    overlap: int = EMBEDDING_SPLIT_OVERLAP,
+) -> List[str]:
     """
     Split text into chunks to fit within Ollama's token limit.
 
@@ -37,68 +96,11 @@ def split_text_into_chunks(text: str, max_length: int = MAX_EMBEDDING_TEXT_LENGT
     - Each chunk gets embedded separately
     - All chunks are stored and searchable
     - No data is lost!
-    """
-    if len(text) <= max_length:
-        return [text]
-
-    chunks = []
-    chunk_size = max_length - 50  # Leave room for overlap and metadata
-
-    # Try to split at natural boundaries (newlines, sentences, etc.)
-    lines = text.split('\n')
-    current_chunk = []
-    current_length = 0
-
-    for line in lines:
-        line_length = len(line) + 1  # +1 for newline
-
-        # If single line is too long, split it
-        if line_length > chunk_size:
-            # Save current chunk if any
-            if current_chunk:
-                chunks.append('\n'.join(current_chunk))
-                current_chunk = []
-                current_length = 0
-
-            # Split long line by words
-            words = line.split()
-            word_chunk = []
-            word_length = 0
-
-            for word in words:
-                word_len = len(word) + 1  # +1 for space
-                if word_length + word_len > chunk_size:
-                    if word_chunk:
-                        chunks.append(' '.join(word_chunk))
-                    word_chunk = [word]
-                    word_length = word_len
-                else:
-                    word_chunk.append(word)
-                    word_length += word_len
-
-            if word_chunk:
-                chunks.append(' '.join(word_chunk))
-
-        # If adding this line exceeds chunk size, save current chunk
-        elif current_length + line_length > chunk_size:
-            if current_chunk:
-                chunks.append('\n'.join(current_chunk))
-            current_chunk = [line]
-            current_length = line_length
-
-        # Add line to current chunk
-        else:
-            current_chunk.append(line)
-            current_length += line_length
 
-    # Add remaining chunk
-    if current_chunk:
-        chunks.append('\n'.join(current_chunk))
-
-    if len(chunks) > 1:
-        logger.info(f"Split text into {len(chunks)} chunks (original: {len(text)} chars)")
-
-    return chunks
+    Consecutive chunks share up to ``overlap`` characters so that code near a
+    boundary is not embedded without context (see split_text_into_spans).
+    """
+    return [text[start:end] for start, end in split_text_into_spans(text, max_length, overlap)]
 
 
 def truncate_text(text: str, max_length: int = MAX_EMBEDDING_TEXT_LENGTH) -> str:
@@ -115,56 +117,103 @@ def truncate_text(text: str, max_length: int = MAX_EMBEDDING_TEXT_LENGTH) -> str
     return truncated
 
 
+def _is_overload_error(error: BaseException) -> bool:
+    """True for failures that mean the server is saturated (5xx, 429, timeouts)"""
+    if isinstance(error, httpx.HTTPStatusError):
+        status = error.response.status_code
+        return status >= 500 or status == 429
+    return isinstance(error, httpx.TimeoutException)
+
+
 class RateLimitedQueue:
     """
     Rate-limited queue for Ollama requests.
-    Uses a semaphore to limit concurrent requests and prevent 500 errors.
+    Limits concurrent requests to prevent 500 errors.
+
+    The concurrency limit adapts to the server (AIMD): every ``window``
+    completed requests it grows by one if no request failed with an overload
+    error (see _is_overload_error), and is halved otherwise, staying within
+    [1, max_limit]. It starts at max_concurrent.
+
+    The request rate is limited separately: each acquire() reserves the next
+    start time (min_interval after the previous one) under a short lock and
+    sleeps outside it, so waiting callers don't hold each other up.
     """
 
-    def __init__(self, max_concurrent: int = 4, requests_per_second: float = 10.0):
+    def __init__(self, max_concurrent: int = 4, requests_per_second: float = 10.0,
+                 max_limit: Optional[int] = None, window: int = 20):
         self.max_concurrent = max_concurrent
+        self.max_limit = max(max_limit or max_concurrent, max_concurrent)
+        self.window = window
         self.min_interval = 1.0 / requests_per_second
-        self._semaphore = threading.Semaphore(max_concurrent)
-        self._last_request_time = 0.0
+        # Counters are only written under _slot_available, which acquire()
+        # and release() hold anyway; get_stats() reads them without it
+        self._limit = max_concurrent
+        self._active = 0
+        self._queued = 0
+        self._total = 0
+        self._overload_errors = 0
+        self._slot_available = threading.Condition()
+        self._window_completed = 0
+        self._window_errors = 0
+        self._next_request_time = 0.0
         self._time_lock = threading.Lock()
-        self._stats = {
-            "total_requests": 0,
-            "queued_requests": 0,
-            "active_requests": 0,
-        }
-        self._stats_lock = threading.Lock()
 
     def acquire(self):
         """Acquire a slot in the queue (blocks if at capacity)"""
-        with self._stats_lock:
-            self._stats["queued_requests"] += 1
-
-        # Wait for a slot
-        self._semaphore.acquire()
-
-        with self._stats_lock:
-            self._stats["queued_requests"] -= 1
-            self._stats["active_requests"] += 1
-            self._stats["total_requests"] += 1
-
-        # Rate limiting - ensure minimum interval between requests
+        with self._slot_available:
+            self._queued += 1
+            while self._active >= self._limit:
+                self._slot_available.wait()
+            self._queued -= 1
+            self._active += 1
+            self._total += 1
+
+        # Rate limiting - reserve a start time at least min_interval after the last one
         with self._time_lock:
-            now = time.time()
-            elapsed = now - self._last_request_time
-            if elapsed < self.min_interval:
-                time.sleep(self.min_interval - elapsed)
-            self._last_request_time = time.time()
-
-    def release(self):
-        """Release a slot back to the queue"""
-        with self._stats_lock:
-            self._stats["active_requests"] -= 1
-        self._semaphore.release()
+            now = time.monotonic()
+            start = max(now, self._next_request_time)
+            self._next_request_time = start + self.min_interval
+        if start > now:
+            time.sleep(start - now)
+
+    def release(self, overloaded: bool = False):
+        """Release a slot back to the queue, recording whether the request hit an overload"""
+        with self._slot_available:
+            self._active -= 1
+            self._overload_errors += overloaded
+            self._window_completed += 1
+            self._window_errors += overloaded
+            if self._window_completed >= self.window:
+                if self._window_errors:
+                    self._limit = max(1, self._limit // 2)
+                else:
+                    self._limit = min(self.max_limit, self._limit + 1)
+                self._window_completed = self._window_errors = 0
+            self._slot_available.notify_all()
+
+    @contextmanager
+    def slot(self):
+        """Hold a slot for the duration of one request"""
+        self.acquire()
+        overloaded = False
+        try:
+            yield
+        except BaseException as e:
+            overloaded = _is_overload_error(e)
+            raise
+        finally:
+            self.release(overloaded)
 
     def get_stats(self) -> Dict:
-        """Get queue statistics"""
-        with self._stats_lock:
-            return self._stats.copy()
+        """Get queue statistics (a lock-free snapshot; counters may be mid-update)"""
+        return {
+            "total_requests": self._total,
+            "queued_requests": self._queued,
+            "active_requests": self._active,
+            "overload_errors": self._overload_errors,
+            "concurrency_limit": self._limit,
+        }
 
 
 class ConnectionPool:
@@ -230,19 +279,27 @@ class EmbeddingEngine:
         except Exception as e:
             logger.error(f"Failed to initialize provider: {e}")
             raise
+        self._cache_namespace = getattr(self._provider, "cache_namespace", "")
 
         # Auto-detect dimension
         self._dimension = None
 
         # Rate-limited queue for backward compatibility (mainly for Ollama)
+        # OLLAMA_MAX_CONCURRENT is the starting limit; it adapts up to the ceiling
         max_concurrent = int(os.getenv('OLLAMA_MAX_CONCURRENT', '2'))
         self._request_queue = RateLimitedQueue(
             max_concurrent=max_concurrent,
-            requests_per_second=8.0
+            requests_per_second=8.0,
+            max_limit=int(os.getenv('OLLAMA_MAX_CONCURRENT_CEILING', '8'))
         )
+        # Providers that support it take a slot per HTTP attempt, so retry
+        # backoff sleeps don't hold one (Ollama)
+        if self.provider_name.lower() == "ollama" and hasattr(self._provider, "request_slot"):
+            self._provider.request_slot = self._request_queue.slot
 
-        # Thread pool for parallel processing
+        # Thread pool for parallel processing (created on first multi-request batch)
         self.max_workers = max_workers
+        self._executor: Optional[ThreadPoolExecutor] = None
         self._lock = threading.Lock()
 
         # Legacy connection pool (kept for backward compatibility)
@@ -257,38 +314,53 @@ class EmbeddingEngine:
             logger.info(f"Embedding dimension: {self._dimension}")
         return self._dimension
 
+    def _cache_key(self, text: str) -> str:
+        """Persistent cache key for text, scoped by the provider's cache namespace."""
+        return EmbeddingCache.hash_content(f"{self._cache_namespace}{text}")
+
+    def _cache_keys(self, texts: List[str], prefix: str = "") -> List[str]:
+        """
+        _cache_key(prefix + text) for each text, without building the
+        prefixed strings: the namespace and prefix are hashed once and the
+        hasher state copied per text.
+        """
+        base = hashlib.sha256(f"{self._cache_namespace}{prefix}".encode('utf-8'))
+        keys = []
+        for text in texts:
+            h = base.copy()
+            h.update(text.encode('utf-8'))
+            keys.append(h.hexdigest()[:32])
+        return keys
+
+    @staticmethod
+    def _safe_text(text: str) -> str:
+        """
+        Text cut to the first chunk if oversized (as a fallback).
+        Ideally, text should be pre-split by the caller (see watcher.py).
+        """
+        if len(text) <= MAX_EMBEDDING_TEXT_LENGTH:
+            return text
+        chunks = split_text_into_chunks(text)
+        if len(chunks) > 1:
+            logger.warning(
+                f"Oversized text ({len(text)} chars) passed for embedding. "
+                f"Using first of {len(chunks)} chunks. "
+                f"Caller should pre-split using split_text_into_chunks()!"
+            )
+        return chunks[0]
+
     def _get_embedding_direct(self, text: str, max_retries: int = 5) -> List[float]:
         """
         Get embedding using the configured provider.
 
-        Handles oversized text by using first chunk only (as a fallback).
-        Ideally, text should be pre-split by the caller (see watcher.py).
+        Handles oversized text by using first chunk only (see _safe_text).
         """
-        # Safety check: if text is too long, use first chunk
-        if len(text) > MAX_EMBEDDING_TEXT_LENGTH:
-            chunks = split_text_into_chunks(text)
-            safe_text = chunks[0]
-            if len(chunks) > 1:
-                logger.warning(
-                    f"Oversized text ({len(text)} chars) passed to _get_embedding_direct. "
-                    f"Using first of {len(chunks)} chunks. "
-                    f"Caller should pre-split using split_text_into_chunks()!"
-                )
-        else:
-            safe_text = text
+        safe_text = self._safe_text(text)
 
-        # Use provider's embed_sync method
+        # Use provider's embed_sync method; rate-limited providers (Ollama)
+        # take queue slots themselves, cloud providers handle rate limiting
         try:
-            # For rate-limited providers (Ollama), use the queue
-            if self.provider_name.lower() == "ollama":
-                self._request_queue.acquire()
-                try:
-                    return self._provider.embed_sync(safe_text)
-                finally:
-                    self._request_queue.release()
-            else:
-                # For cloud providers, use directly (they handle rate limiting)
-                return self._provider.embed_sync(safe_text)
+            return self._provider.embed_sync(safe_text)
         except Exception as e:
             logger.error(f"Embedding error: {e}")
             raise
@@ -296,7 +368,7 @@ class EmbeddingEngine:
     def _get_embedding_cached(self, text: str) -> List[float]:
         """Get embedding with persistent cache"""
         if self._cache:
-            content_hash = EmbeddingCache.hash_content(text)
+            content_hash = self._cache_key(text)
             cached = self._cache.get(content_hash)
             if cached is not None:
                 self._cache_hits += 1
@@ -309,93 +381,168 @@ class EmbeddingEngine:
         else:
             return self._get_embedding_direct(text)
 
-    @lru_cache(maxsize=5000)
-    def _get_embedding_lru_cached(self, text: str) -> Tuple[float, ...]:
-        """LRU cache wrapper (returns tuple for hashability)."""
-        return tuple(self._get_embedding_cached(text))
-
     def embed_sync(self, text: str, prefix: str = "") -> List[float]:
-        """Get embedding for a single text."""
-        return list(self._get_embedding_lru_cached(f"{prefix}{text}"))
+        """
+        Get embedding for a single text.
 
-    def embed_batch(self, texts: List[str], prefix: str = "") -> List[List[float]]:
+        Backed by the persistent cache only; callers that repeat queries keep
+        an in-memory cache in front of this (query_cache).
+        """
+        return self._get_embedding_cached(f"{prefix}{text}")
+
+    def embed_batch(
+        self, texts: List[str], prefix: str = "", on_error: str = "raise"
+    ) -> List[List[float]]:
         """
         Batch embedding with caching and parallel processing.
 
         Args:
             texts: List of texts to embed
             prefix: Optional prefix for search queries vs documents
+            on_error: "raise" (after the other requests finish and are cached)
+                or "zero" to return zero vectors for texts whose request failed
 
         Returns:
             List of embedding vectors
         """
         if not texts:
             return []
+        return self.embed_batch_np(texts, prefix, on_error).tolist()
+
+    @staticmethod
+    def _decode_array(blob: bytes, dtype: Optional[str]) -> np.ndarray:
+        """Cached blob -> array, reading packed floats in place (no per-float objects)."""
+        if dtype is None:
+            return np.asarray(EmbeddingCache._decode(blob, dtype), dtype=np.float32)
+        return np.frombuffer(blob, dtype=dtype)
+
+    def embed_batch_np(self, texts: List[str], prefix: str = "", on_error: str = "raise") -> np.ndarray:
+        """
+        embed_batch() as one (len(texts), dimension) float32 array.
+
+        Cache hits are decoded straight from their packed bytes, so for the
+        usual mostly-cached batch no Python float is created per component.
+        Failed texts are never cached, whatever on_error says.
+        """
+        if on_error not in ("raise", "zero"):
+            raise ValueError(f"on_error must be 'raise' or 'zero', not {on_error!r}")
+        if not texts:
+            return np.empty((0, 0), dtype=np.float32)
 
-        prefixed_texts = [f"{prefix}{t}" for t in texts]
-        results: List[Optional[List[float]]] = [None] * len(prefixed_texts)
-        uncached_indices: List[int] = []
-        uncached_texts: List[str] = []
+        results: List[Optional[np.ndarray]] = [None] * len(texts)
+        # Uncached text -> every index it appears at; repeated texts
+        # (boilerplate headers, identical blocks) are embedded once
+        pending: Dict[str, List[int]] = {}
 
         # Check cache first
         if self._cache:
-            hashes = [EmbeddingCache.hash_content(t) for t in prefixed_texts]
-            cached = self._cache.get_batch(hashes)
+            hashes = self._cache_keys(texts, prefix)
+            cached = self._cache.get_batch(hashes, decode=self._decode_array)
 
-            for i, (text, h) in enumerate(zip(prefixed_texts, hashes)):
+            for i, (text, h) in enumerate(zip(texts, hashes)):
                 if h in cached:
                     results[i] = cached[h]
                     self._cache_hits += 1
                 else:
-                    uncached_indices.append(i)
-                    uncached_texts.append(text)
+                    pending.setdefault(text, []).append(i)
                     self._cache_misses += 1
         else:
-            uncached_indices = list(range(len(prefixed_texts)))
-            uncached_texts = prefixed_texts
+            for i, text in enumerate(texts):
+                pending.setdefault(text, []).append(i)
 
-        # Process uncached texts in parallel
-        if uncached_texts:
-            new_embeddings = self._embed_parallel(uncached_texts)
+        # Process uncached texts in parallel (only these need the prefix attached)
+        if pending:
+            new_embeddings, errors = self._embed_parallel([f"{prefix}{t}" for t in pending])
 
             if self._cache:
+                # Same keys as the lookup above, not hashed a second time
                 cache_items = [
-                    (EmbeddingCache.hash_content(text), new_embeddings[i])
-                    for i, text in enumerate(uncached_texts)
+                    (hashes[indices[0]], embedding)
+                    for indices, embedding in zip(pending.values(), new_embeddings)
+                    if embedding is not None
                 ]
                 self._cache.set_batch(cache_items, self.model)
 
-            for i, idx in enumerate(uncached_indices):
-                results[idx] = new_embeddings[i]
+            if errors:
+                failed = sum(embedding is None for embedding in new_embeddings)
+                if on_error == "raise":
+                    raise RuntimeError(
+                        f"{len(errors)} embedding requests failed ({failed} texts): {errors[0][1]}"
+                    )
+                logger.warning(f"{len(errors)} embedding requests failed, using zero vectors")
+                # Width of any vector we do have, rather than asking the provider
+                dimension = self._dimension or next(
+                    (len(e) for e in [*results, *new_embeddings] if e is not None), 768
+                )
+                zero = [0.0] * dimension
+                new_embeddings = [zero if e is None else e for e in new_embeddings]
+
+            for indices, embedding in zip(pending.values(), new_embeddings):
+                for idx in indices:
+                    results[idx] = embedding
 
-        return results
+        return np.array(results, dtype=np.float32)
+
+    def _get_embeddings_bulk(self, texts: List[str]) -> List[List[float]]:
+        """
+        Embed several texts with one provider request.
 
-    def _embed_parallel(self, texts: List[str]) -> List[List[float]]:
-        """Embed texts in parallel with rate limiting."""
+        For Ollama the whole request takes a single slot of the rate-limited
+        queue (per attempt), the same as one text used to.
+        """
+        embeddings = self._provider.embed_batch([self._safe_text(text) for text in texts])
+
+        if len(embeddings) != len(texts):
+            raise RuntimeError(f"Provider returned {len(embeddings)} embeddings for {len(texts)} texts")
+        return embeddings
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Shared request pool, reused across calls instead of one pool per batch"""
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="embed"
+                )
+            return self._executor
+
+    def _embed_parallel(
+        self, texts: List[str]
+    ) -> Tuple[List[Optional[List[float]]], List[Tuple[int, str]]]:
+        """
+        Embed texts in parallel with rate limiting.
+
+        Texts are sent EMBEDDING_REQUEST_SIZE at a time, so N texts cost
+        N / EMBEDDING_REQUEST_SIZE round-trips instead of N.
+
+        Returns the embeddings (None for texts whose request failed) and a
+        (first text index, error message) pair per failed request.
+        """
         results: List[Optional[List[float]]] = [None] * len(texts)
         errors: List[Tuple[int, str]] = []
+        size = max(1, EMBEDDING_REQUEST_SIZE)
 
-        def embed_one(idx: int, text: str) -> Tuple[int, Optional[List[float]], Optional[str]]:
+        def embed_some(start: int, batch: List[str]) -> Tuple[int, int, Optional[list], Optional[str]]:
             try:
-                return idx, self._get_embedding_direct(text), None
+                return start, len(batch), self._get_embeddings_bulk(batch), None
             except Exception as e:
-                return idx, None, str(e)
-
-        num_workers = min(len(texts), self.max_workers)
-        with ThreadPoolExecutor(max_workers=num_workers) as executor:
-            futures = [executor.submit(embed_one, i, t) for i, t in enumerate(texts)]
-            for future in as_completed(futures):
-                idx, embedding, error = future.result()
-                if error:
-                    errors.append((idx, error))
-                    results[idx] = [0.0] * 768  # Zero vector fallback
-                else:
-                    results[idx] = embedding
+                return start, len(batch), None, str(e)
+
+        batches = [(i, texts[i:i + size]) for i in range(0, len(texts), size)]
+        if len(batches) == 1:
+            # One request: no point handing it to another thread
+            outcomes = [embed_some(*batches[0])]
+        else:
+            executor = self._get_executor()
+            futures = [executor.submit(embed_some, start, batch) for start, batch in batches]
+            outcomes = (future.result() for future in as_completed(futures))
 
-        if errors:
-            logger.warning(f"{len(errors)} embeddings failed, using zero vectors")
+        for start, count, embeddings, error in outcomes:
+            if error:
+                errors.append((start, error))
+            else:
+                results[start:start + count] = embeddings
 
-        return results
+        return results, sorted(errors)
 
     def get_cache_stats(self) -> Dict[str, any]:
         """Get cache and queue statistics."""
@@ -410,7 +557,6 @@ class EmbeddingEngine:
 
     def clear_cache(self):
         """Clear all caches."""
-        self._get_embedding_lru_cached.cache_clear()
         if self._cache:
             self._cache.clear()
         self._cache_hits = 0
@@ -418,6 +564,9 @@ class EmbeddingEngine:
 
     def close(self):
         """Cleanup connections."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
         if self._conn_pool:
             self._conn_pool.close()
         # Provider cleanup if needed
@@ -15,6 +15,10 @@ class BaseEmbeddingProvider(ABC):
     Supports automatic dimension detection.
     """
 
+    # Mixed into embedding cache keys; change it when the vectors a provider
+    # returns for the same text change, so older cached vectors aren't reused
+    cache_namespace: str = ""
+
     def __init__(self, model: str, **kwargs):
         self.model = model
         self._dimension: Optional[int] = None
@@ -0,0 +1,82 @@
+"""
+Factory functions that build providers by name.
+
+Backends are imported lazily so that optional SDKs (openai, anthropic) are
+only needed when their provider is actually selected.
+"""
+
+from typing import Optional
+
+from .base import BaseEmbeddingProvider, BaseLLMProvider
+
+# Default model per provider when none is given
+DEFAULT_EMBEDDING_MODELS = {
+    "ollama": "nomic-embed-text",
+    "openai": "text-embedding-3-small",
+}
+DEFAULT_LLM_MODELS = {
+    "ollama": "llama3.2:3b",
+    "openai": "gpt-4o-mini",
+    "anthropic": "claude-3-5-haiku-20241022",
+}
+
+
+def get_embedding_provider(provider: str = "ollama", model: Optional[str] = None,
+                           **kwargs) -> BaseEmbeddingProvider:
+    """
+    Create an embedding provider.
+
+    Args:
+        provider: Backend name ("ollama" or "openai")
+        model: Model name (defaults to the backend's usual embedding model)
+        **kwargs: Backend-specific options (host, api_key, timeout, ...)
+
+    Raises:
+        ValueError: if the provider is unknown
+    """
+    name = provider.lower()
+    model = model or DEFAULT_EMBEDDING_MODELS.get(name)
+
+    if name == "ollama":
+        from .ollama import OllamaEmbeddingProvider
+        return OllamaEmbeddingProvider(model=model, **kwargs)
+    if name == "openai":
+        from .openai import OpenAIEmbeddingProvider
+        return OpenAIEmbeddingProvider(model=model, **kwargs)
+
+    raise ValueError(
+        f"Unknown embedding provider: {provider}. "
+        f"Supported: {', '.join(DEFAULT_EMBEDDING_MODELS)}"
+    )
+
+
+def get_llm_provider(provider: str = "ollama", model: Optional[str] = None,
+                     **kwargs) -> BaseLLMProvider:
+    """
+    Create an LLM provider.
+
+    Args:
+        provider: Backend name ("ollama", "openai" or "anthropic")
+        model: Model name (defaults to the backend's usual chat model)
+        **kwargs: Backend-specific options (host, api_key, ...)
+
+    Raises:
+        ValueError: if the provider is unknown
+    """
+    name = provider.lower()
+    model = model or DEFAULT_LLM_MODELS.get(name)
+
+    if name == "ollama":
+        from .ollama import OllamaLLMProvider
+        return OllamaLLMProvider(model=model, **kwargs)
+    if name == "openai":
+        from .openai import OpenAILLMProvider
+        return OpenAILLMProvider(model=model, **kwargs)
+    if name == "anthropic":
+        from .anthropic import AnthropicLLMProvider
+        return AnthropicLLMProvider(model=model, **kwargs)
+
+    raise ValueError(
+        f"Unknown LLM provider: {provider}. "
+        f"Supported: {', '.join(DEFAULT_LLM_MODELS)}"
+    )
@@ -3,25 +3,77 @@ Ollama provider implementation.
 """
 
 import httpx
+import json
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+import math
 import os
+import threading
 import time
 import logging
 from typing import List, Optional
 from .base import BaseEmbeddingProvider, BaseLLMProvider
 
+try:
+    # Optional: parses float-heavy embedding responses several times faster
+    from orjson import loads as _json_loads
+except ImportError:
+    _json_loads = json.loads
+
 logger = logging.getLogger(__name__)
 
 
+def _is_missing_endpoint(response: httpx.Response) -> bool:
+    """
+    Whether a 404 means the endpoint doesn't exist (older servers).
+
+    Those are the router's plain-text "404 page not found"; a 404 from an
+    existing endpoint carries a JSON error, e.g. for a model that isn't pulled.
+    """
+    try:
+        body = _json_loads(response.content)
+    except ValueError:
+        return True
+    return not (isinstance(body, dict) and "error" in body)
+
+
+def _normalize(vector: List[float]) -> List[float]:
+    """Scale a vector to unit length, as /api/embed does for its results."""
+    norm = math.sqrt(sum(x * x for x in vector))
+    return [x / norm for x in vector] if norm else vector
+
+
 class OllamaEmbeddingProvider(BaseEmbeddingProvider):
     """
     Ollama embedding provider using HTTP API.
+
+    Texts go to /api/embed, which embeds a whole list per request and
+    returns unit-length vectors. Servers older than that endpoint fall back
+    to one /api/embeddings request per text (a few at a time), normalized
+    the same way. Rows stored from unnormalized vectors by earlier versions
+    are reported when LanceDBManager opens their table and rescaled by
+    LanceDBManager.optimize().
     """
 
+    # /api/embed vectors are normalized; /api/embeddings ones were not
+    cache_namespace = "api/embed"
+
     def __init__(self, model: str = "nomic-embed-text", host: Optional[str] = None, **kwargs):
         super().__init__(model, **kwargs)
         self.host = host or os.getenv('OLLAMA_HOST', 'http://localhost:11434')
         self.timeout = kwargs.get('timeout', 60.0)
         self.max_retries = kwargs.get('max_retries', 5)
+        self.fallback_workers = kwargs.get('fallback_workers', 4)
+
+        # Cleared when the server turns out not to have /api/embed
+        self._embed_api = True
+        # Pool for the per-text /api/embeddings fallback, created on first use
+        self._fallback_executor: Optional[ThreadPoolExecutor] = None
+        self._fallback_lock = threading.Lock()
+        # Context manager held around each HTTP attempt (but not the backoff
+        # sleeps between them); EmbeddingEngine sets its rate-limited queue's
+        # slot(), which also sees the errors an attempt raises
+        self.request_slot = nullcontext
 
         # Create HTTP client with connection pooling
         self.client = httpx.Client(
@@ -35,18 +87,16 @@ class OllamaEmbeddingProvider(BaseEmbeddingProvider):
         )
         logger.info(f"Initialized Ollama embedding provider: {self.model} @ {self.host}")
 
-    def embed_sync(self, text: str) -> List[float]:
-        """Generate embedding for a single text."""
+    def _post(self, path: str, payload: dict) -> dict:
+        """POST to the Ollama API, retrying 500s and connection failures with backoff."""
         last_error: Optional[Exception] = None
 
         for attempt in range(self.max_retries):
             try:
-                response = self.client.post(
-                    "/api/embeddings",
-                    json={"model": self.model, "prompt": text}
-                )
-                response.raise_for_status()
-                return response.json()["embedding"]
+                with self.request_slot():
+                    response = self.client.post(path, json=payload)
+                    response.raise_for_status()
+                return _json_loads(response.content)
             except httpx.HTTPStatusError as e:
                 last_error = e
                 if e.response.status_code == 500 and attempt < self.max_retries - 1:
@@ -70,9 +120,38 @@ class OllamaEmbeddingProvider(BaseEmbeddingProvider):
 
         raise last_error or RuntimeError("Embedding failed after all retries")
 
+    def embed_sync(self, text: str) -> List[float]:
+        """Generate embedding for a single text."""
+        return self.embed_batch([text])[0]
+
     def embed_batch(self, texts: List[str]) -> List[List[float]]:
-        """Generate embeddings for multiple texts."""
-        return [self.embed_sync(text) for text in texts]
+        """Generate embeddings for multiple texts in one request."""
+        if not texts:
+            return []
+
+        if self._embed_api:
+            try:
+                return self._post("/api/embed", {"model": self.model, "input": texts})["embeddings"]
+            except httpx.HTTPStatusError as e:
+                # A missing model is a 404 too; only fall back for a missing endpoint
+                if e.response.status_code != 404 or not _is_missing_endpoint(e.response):
+                    raise
+                logger.info("Ollama server has no /api/embed, falling back to /api/embeddings")
+                self._embed_api = False
+
+        if len(texts) == 1:
+            return [self._embed_legacy(texts[0])]
+        with self._fallback_lock:
+            if self._fallback_executor is None:
+                self._fallback_executor = ThreadPoolExecutor(
+                    max_workers=self.fallback_workers, thread_name_prefix="ollama-embed"
+                )
+            executor = self._fallback_executor
+        return list(executor.map(self._embed_legacy, texts))
+
+    def _embed_legacy(self, text: str) -> List[float]:
+        """Embed one text with the pre-/api/embed endpoint."""
+        return _normalize(self._post("/api/embeddings", {"model": self.model, "prompt": text})["embedding"])
 
     def health_check(self) -> bool:
         """Check if Ollama is responsive."""
@@ -83,10 +162,17 @@ class OllamaEmbeddingProvider(BaseEmbeddingProvider):
             logger.warning(f"Ollama health check failed: {e}")
             return False
 
+    def close(self):
+        """Close the HTTP client (called from EmbeddingEngine.close())."""
+        if self._fallback_executor is not None:
+            self._fallback_executor.shutdown(wait=False)
+            self._fallback_executor = None
+        self.client.close()
+
     def __del__(self):
         """Cleanup HTTP client."""
         try:
-            self.client.close()
+            self.close()
         except Exception:
             pass
 
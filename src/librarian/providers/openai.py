@@ -4,20 +4,78 @@ OpenAI provider implementation.
 
 import os
 import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Optional
 from .base import BaseEmbeddingProvider, BaseLLMProvider
 
 logger = logging.getLogger(__name__)
 
+# The embeddings endpoint takes at most this many inputs per request
+MAX_EMBEDDING_INPUTS = 2048
 
-class OpenAIEmbeddingProvider(BaseEmbeddingProvider):
+# Texts per request and requests in flight when embed_batch splits a list
+EMBEDDING_SUB_BATCH_SIZE = 512
+EMBEDDING_MAX_CONCURRENCY = 5
+
+# How long a successful health check is trusted before probing again
+HEALTH_CHECK_TTL_SECONDS = 30.0
+
+
+def _http2_client():
+    """
+    An HTTP/2 client for the SDK, or None to keep its default HTTP/1.1 one.
+
+    Concurrent requests then share one multiplexed TLS connection instead of
+    each opening its own. Needs the h2 package (the openai extra installs it)
+    and an SDK recent enough to export DefaultHttpxClient, whose pool limits
+    (1000 connections, 100 kept alive) and timeouts are the SDK's own.
+    """
+    try:
+        import h2  # noqa: F401
+        from openai import DefaultHttpxClient
+    except ImportError:
+        return None
+    return DefaultHttpxClient(http2=True)
+
+
+class _ModelProbe:
+    """
+    Health check by model lookup (no tokens billed), remembered for
+    HEALTH_CHECK_TTL_SECONDS after a success.
+    """
+
+    _healthy_until = 0.0
+
+    def _model_reachable(self) -> bool:
+        now = time.monotonic()
+        if now < self._healthy_until:
+            return True
+        self.client.models.retrieve(self.model)
+        self._healthy_until = now + HEALTH_CHECK_TTL_SECONDS
+        return True
+
+
+class OpenAIEmbeddingProvider(_ModelProbe, BaseEmbeddingProvider):
     """
     OpenAI embedding provider using official SDK.
+
+    Long lists are split into sub_batch_size requests, up to max_concurrency
+    of them in flight. Rate-limited (429) requests are retried by the SDK,
+    which honours Retry-After and backs off with jitter.
     """
 
     def __init__(self, model: str = "text-embedding-3-small", api_key: Optional[str] = None, **kwargs):
         super().__init__(model, **kwargs)
         self.api_key = api_key or os.getenv('OPENAI_API_KEY')
+        self.sub_batch_size = min(kwargs.get('sub_batch_size', EMBEDDING_SUB_BATCH_SIZE),
+                                  MAX_EMBEDDING_INPUTS)
+        self.max_concurrency = kwargs.get('max_concurrency', EMBEDDING_MAX_CONCURRENCY)
+
+        # Pool for the sub-requests of a long list, created on first use
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
 
         if not self.api_key:
             raise ValueError(
@@ -28,7 +86,11 @@ class OpenAIEmbeddingProvider(BaseEmbeddingProvider):
         # Import OpenAI SDK
         try:
             from openai import OpenAI
-            self.client = OpenAI(api_key=self.api_key)
+            self.client = OpenAI(
+                api_key=self.api_key,
+                http_client=_http2_client(),
+                max_retries=kwargs.get('max_retries', 5)
+            )
         except ImportError:
             raise ImportError("openai package not installed. Run: pip install openai")
 
@@ -47,7 +109,28 @@ class OpenAIEmbeddingProvider(BaseEmbeddingProvider):
             raise
 
     def embed_batch(self, texts: List[str]) -> List[List[float]]:
-        """Generate embeddings for multiple texts (batched for efficiency)."""
+        """
+        Generate embeddings for multiple texts (batched for efficiency).
+
+        Lists longer than sub_batch_size are sent as concurrent requests and
+        reassembled in input order.
+        """
+        batches = [texts[start:start + self.sub_batch_size]
+                   for start in range(0, len(texts), self.sub_batch_size)]
+        if len(batches) <= 1:
+            return self._embed_request(texts) if texts else []
+
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_concurrency, thread_name_prefix="openai-embed"
+                )
+            executor = self._executor
+        return [embedding for batch in executor.map(self._embed_request, batches)
+                for embedding in batch]
+
+    def _embed_request(self, texts: List[str]) -> List[List[float]]:
+        """Embed up to MAX_EMBEDDING_INPUTS texts with one request."""
         try:
             # OpenAI supports batching natively
             response = self.client.embeddings.create(
@@ -63,15 +146,20 @@ class OpenAIEmbeddingProvider(BaseEmbeddingProvider):
     def health_check(self) -> bool:
         """Check if OpenAI API is accessible."""
         try:
-            # Try a minimal embedding
-            self.embed_sync("test")
-            return True
+            return self._model_reachable()
         except Exception as e:
             logger.warning(f"OpenAI health check failed: {e}")
             return False
 
+    def close(self):
+        """Close the SDK's HTTP client (called from EmbeddingEngine.close())."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+        self.client.close()
 
-class OpenAILLMProvider(BaseLLMProvider):
+
+class OpenAILLMProvider(_ModelProbe, BaseLLMProvider):
     """
     OpenAI LLM provider using official SDK.
     """
@@ -89,7 +177,7 @@ class OpenAILLMProvider(BaseLLMProvider):
         # Import OpenAI SDK
         try:
             from openai import OpenAI
-            self.client = OpenAI(api_key=self.api_key)
+            self.client = OpenAI(api_key=self.api_key, http_client=_http2_client())
         except ImportError:
             raise ImportError("openai package not installed. Run: pip install openai")
 
@@ -122,8 +210,10 @@ class OpenAILLMProvider(BaseLLMProvider):
                 stream=True
             )
             for chunk in stream:
-                if chunk.choices[0].delta.content:
-                    yield chunk.choices[0].delta.content
+                # Trailing chunks (e.g. usage) can have no choices
+                content = chunk.choices[0].delta.content if chunk.choices else None
+                if content:
+                    yield content
         except Exception as e:
             logger.error(f"OpenAI stream error: {e}")
             yield f"Error: {e}"
@@ -131,9 +221,7 @@ class OpenAILLMProvider(BaseLLMProvider):
     def health_check(self) -> bool:
         """Check if OpenAI API is accessible."""
         try:
-            # Try a minimal completion
-            self.generate("test", max_tokens=5)
-            return True
+            return self._model_reachable()
         except Exception as e:
             logger.warning(f"OpenAI health check failed: {e}")
             return False
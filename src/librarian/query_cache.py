@@ -0,0 +1,148 @@
+"""
+In-memory caches for interactive searches.
+
+Queries in a CLI session repeat a lot (refining a search, paging back to an
+earlier one), so the query embedding is kept in a bounded, process-wide LRU
+cache keyed by the SHA-256 of the query text. Search results are cached the
+same way for a few minutes and must be cleared whenever the index changes.
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, List, Optional
+
+
+class LRUCache:
+    """
+    Thread-safe LRU cache with hit/miss/eviction counters.
+
+    With a ttl (seconds), entries older than that are treated as missing.
+    """
+
+    def __init__(self, maxsize: int, ttl: Optional[float] = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        # key -> (value, expires_at or None)
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached value (marking it recently used) or None"""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None and entry[1] is not None and entry[1] <= time.monotonic():
+                del self._data[key]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def set(self, key: Hashable, value: Any):
+        """Store a value, evicting the least recently used entry when full"""
+        expires_at = time.monotonic() + self.ttl if self.ttl is not None else None
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        """Drop all entries (counters are kept)"""
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get_stats(self) -> Dict:
+        """Get cache statistics"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "entries": len(self._data),
+                "max_entries": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / max(1, total),
+            }
+
+
+class QueryEmbeddingCache(LRUCache):
+    """
+    Query text -> embedding vector.
+
+    Embeddings of a given text never change for a model, so entries have no
+    TTL; the cache is only bounded in size.
+    """
+
+    def __init__(self, maxsize: int = 10000):
+        super().__init__(maxsize)
+
+    @staticmethod
+    def key(query: str) -> str:
+        return hashlib.sha256(query.encode()).hexdigest()
+
+    def get_or_compute(self, query: str, embed: Callable[[str], List[float]]) -> List[float]:
+        """Return the cached embedding for query, calling embed(query) on a miss"""
+        key = self.key(query)
+        vector = self.get(key)
+        if vector is None:
+            vector = tuple(embed(query))
+            self.set(key, vector)
+        return list(vector)
+
+
+class SearchResultCache(LRUCache):
+    """
+    (query, limit) -> search results, for a few minutes.
+
+    Results depend on the index contents, so callers clear this cache after
+    anything that writes to or rebuilds the database.
+    """
+
+    def __init__(self, maxsize: int = 1000, ttl: float = 300.0):
+        super().__init__(maxsize, ttl)
+
+    @staticmethod
+    def key(query: str, limit: int) -> tuple:
+        return hashlib.sha256(query.encode()).hexdigest(), limit
+
+    def get_or_search(self, query: str, limit: int, search: Callable[[], List[Dict]]) -> List[Dict]:
+        """Return cached results for (query, limit), calling search() on a miss"""
+        key = self.key(query, limit)
+        results = self.get(key)
+        if results is None:
+            results = search()
+            self.set(key, results)
+        return results
+
+
+# Global singletons
+_query_embedding_cache: Optional[QueryEmbeddingCache] = None
+_search_result_cache: Optional[SearchResultCache] = None
+
+
+def get_query_embedding_cache() -> QueryEmbeddingCache:
+    """Get the process-wide query embedding cache."""
+    global _query_embedding_cache
+    if _query_embedding_cache is None:
+        _query_embedding_cache = QueryEmbeddingCache()
+    return _query_embedding_cache
+
+
+def get_search_result_cache() -> SearchResultCache:
+    """Get the process-wide search result cache."""
+    global _search_result_cache
+    if _search_result_cache is None:
+        _search_result_cache = SearchResultCache()
+    return _search_result_cache
@@ -4,11 +4,13 @@ MCP Server for RepoLens with optimized search and caching.
 
 from mcp.server.fastmcp import FastMCP
 from typing import Optional, Dict, Any
+import heapq
 import threading
 from .watcher import start_watching as start_watching_proc, LibrarianWatcher
 from .db import LanceDBManager
 from .embeddings import EmbeddingEngine
 from .cache import EmbeddingCache, FileHashCache
+from .query_cache import get_query_embedding_cache
 
 # Initialize core components with caching
 engine = EmbeddingEngine(use_cache=True)  # Singleton with caching enabled
@@ -30,7 +32,8 @@ def start_watching(root_dir: str) -> str:
         return "Watcher already running."
 
     def run_watcher():
-        start_watching_proc(root_dir)
+        # Share the server's engine rather than opening a second provider
+        start_watching_proc(root_dir, embeddings=engine)
 
     watcher_thread = threading.Thread(target=run_watcher, daemon=True)
     watcher_thread.start()
@@ -50,8 +53,10 @@ def search_codebase(query: str, file_type: Optional[str] = None, limit: int = 10
     Returns:
         Formatted search results with context headers
     """
-    # 1. Embed query with prefix (uses cached engine)
-    query_vector = engine.embed_sync(query, prefix="search_query: ")
+    # 1. Embed query with prefix (repeat queries hit the in-memory cache)
+    query_vector = get_query_embedding_cache().get_or_compute(
+        f"search_query: {query}", engine.embed_sync
+    )
 
     # 2. Search (fetch more to allow re-ranking)
     results = db.search(query_vector, limit=limit * 3, file_type=file_type)
@@ -59,30 +64,21 @@ def search_codebase(query: str, file_type: Optional[str] = None, limit: int = 10
     if not results:
         return "No results found."
 
-    # 3. Re-rank with architecture boosting
-    scored_results = []
-    for r in results:
-        dist = r.get('_distance', 1.0)
-        # Boost architecture nodes by reducing their distance
-        if r.get('is_architecture_node'):
-            dist = dist / 1.5
-        scored_results.append((dist, r))
+    # 3. Re-rank with architecture boosting: architecture nodes get their
+    # distance reduced, then only the top limit are selected (partial sort).
+    # Rows of a vector search always carry _distance and every table column.
+    def boosted_distance(r):
+        dist = r['_distance']
+        return dist / 1.5 if r['is_architecture_node'] else dist
 
-    # Sort by boosted distance
-    scored_results.sort(key=lambda x: x[0])
-
-    # Take top limit
-    final_results = [x[1] for x in scored_results[:limit]]
+    final_results = heapq.nsmallest(limit, results, key=boosted_distance)
 
     # Format results
-    output = []
-    for r in final_results:
-        arch_flag = "[ARCH] " if r.get("is_architecture_node") else ""
-        header = r.get('context_header', 'Unknown')
-        content = r.get('content', '')
-        output.append(f"{arch_flag}{header}\n{content}\n---")
-
-    return "\n".join(output)
+    return "\n".join(
+        f"{'[ARCH] ' if r['is_architecture_node'] else ''}"
+        f"{r['context_header'] or 'Unknown'}\n{r['content'] or ''}\n---"
+        for r in final_results
+    )
 
 
 @mcp.tool()
@@ -96,28 +92,15 @@ def get_architecture(directory: str) -> str:
     Returns:
         Formatted summaries for files in the directory
     """
-    # Sanitize input to prevent injection
-    safe_directory = directory.replace("'", "''").replace("%", "\\%")
-
     try:
-        results = db.table.search().where(
-            f"filepath LIKE '%{safe_directory}%' AND summary != ''"
-        ).limit(50).to_list()
-
-        # Deduplicate by filepath
-        seen = set()
-        summaries = []
-        for r in results:
-            filepath = r.get('filepath', '')
-            if filepath and filepath not in seen:
-                summary = r.get('summary', '')
-                summaries.append(f"File: {filepath}\nSummary: {summary}")
-                seen.add(filepath)
+        summaries = db.get_summaries(directory, limit=50)
 
         if not summaries:
             return "No architecture summaries found for this directory."
 
-        return "\n\n".join(summaries)
+        return "\n\n".join(
+            f"File: {filepath}\nSummary: {summary}" for filepath, summary in summaries.items()
+        )
     except Exception as e:
         return f"Error retrieving architecture: {e}"
 
@@ -2,38 +2,191 @@
 File watcher with delta indexing and multi-language support.
 """
 
-import hashlib
+import heapq
 import logging
+import multiprocessing
 import os
-import queue
 import threading
 import time
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import Dict, List, Optional, Tuple
+from concurrent.futures import (
+    FIRST_COMPLETED, Executor, ProcessPoolExecutor, ThreadPoolExecutor, as_completed, wait
+)
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
 
 from watchdog.events import FileSystemEventHandler
 from watchdog.observers import Observer
 
-from .architect import ArchitectAnalyzer
+from .architect import SUMMARY_MAX_CHARS, ArchitectAnalyzer
 from .cache import FileHashCache
-from .chunking import ChunkerFactory, get_factory
-from .consts import DEBOUNCE_SECONDS
-from .db import CodeChunk, LanceDBManager
-from .embeddings import EmbeddingEngine
+from .chunking import ChunkData, ChunkerFactory, get_factory
+from .consts import DEBOUNCE_SECONDS, EMBEDDING_BATCH_SIZE
+from .db import LanceDBManager
+from .embeddings import MAX_EMBEDDING_TEXT_LENGTH, EmbeddingEngine, split_text_into_spans
 
 logger = logging.getLogger(__name__)
 
+# Quiet period before a saved file is indexed; editors emit several
+# modify events per save, and only the final state needs indexing
+HOT_PATH_DEBOUNCE_SECONDS = 0.25
+
+# Files at least this large are chunked in a worker process; for smaller ones
+# pickling the chunks back costs more than the GIL contention it avoids
+PROCESS_POOL_MIN_FILE_BYTES = 100 * 1024
+
+
+@dataclass
+class PreparedFile:
+    """A file that has been read and chunked but not yet embedded."""
+    filepath: str
+    content_hash: str
+    mtime: float
+    size: int
+    mtime_ns: int
+    chunks: List[ChunkData] = field(default_factory=list)
+
+
+def _get_chunker(filepath: str):
+    """Chunker for filepath; raises ValueError for unsupported file types."""
+    chunker = get_factory().get_chunker(filepath)
+    if not chunker:
+        raise ValueError(f"Unsupported file type: {filepath}")
+    return chunker
+
+
+def read_file(filepath: str) -> Tuple[bytes, os.stat_result]:
+    """
+    Read a file's raw bytes along with its stat.
+
+    fstat on the open file saves a path lookup and describes the same file
+    that was read, even if it is replaced meanwhile.
+    """
+    with open(filepath, 'rb') as f:
+        stat = os.fstat(f.fileno())
+        data = f.read()
+    return data, stat
+
+
+def prepare_file(filepath: str) -> PreparedFile:
+    """
+    Read and chunk a file without embedding it.
+
+    Oversized chunks are split so every embedding text fits the model's
+    context. Raises on unsupported or unreadable files. This is a module
+    level function so indexing can run it in worker processes.
+    """
+    _get_chunker(filepath)
+    data, stat = read_file(filepath)
+    return prepare_data(filepath, data, stat.st_mtime, stat.st_size, stat.st_mtime_ns)
+
+
+def prepare_data(filepath: str, data: bytes, mtime: float, size: int, mtime_ns: int) -> PreparedFile:
+    """
+    Chunk the already-read bytes of filepath (see prepare_file()).
+
+    Takes only plain values so a worker process receives the file's bytes
+    and sends back its chunks, without touching the file again.
+    """
+    chunker = _get_chunker(filepath)
+    content = data.decode('utf-8', errors='ignore').replace('\r\n', '\n').replace('\r', '\n')
+
+    # Hash the raw bytes, as FileHashCache does when re-checking a touched file
+    content_hash = FileHashCache.hash_content(data)
+    prepared = PreparedFile(filepath, content_hash, mtime, size, mtime_ns)
+
+    raw_chunks = chunker.chunk_file(filepath, content)
+    if not raw_chunks:
+        return prepared
+
+    # Split oversized chunks to avoid embedding truncation
+    # If a chunk's embedding_text is too long, split it into multiple chunks
+    processed_chunks = prepared.chunks
+    for raw_chunk in raw_chunks:
+        # Check if this chunk's embedding text is too long
+        if len(raw_chunk.embedding_text) > MAX_EMBEDDING_TEXT_LENGTH:
+            # Split the content into multiple (overlapping) sub-chunks
+            content = raw_chunk.content
+            spans = split_text_into_spans(content, MAX_EMBEDDING_TEXT_LENGTH)
+            part_count = len(spans)
+            chunk_cls = type(raw_chunk)
+
+            logger.info(f"Split large chunk into {part_count} parts: {raw_chunk.context_header}")
+
+            # Create a separate chunk for each part
+            for i, (span_start, span_end) in enumerate(spans, 1):
+                content_part = content[span_start:span_end]
+                start_line = min(raw_chunk.start_line + content.count('\n', 0, span_start),
+                                 raw_chunk.end_line)
+                end_line = min(start_line + content_part.count('\n'), raw_chunk.end_line)
+
+                # Create modified context header to indicate part number
+                part_header = f"{raw_chunk.context_header} [part {i}/{part_count}]"
+
+                # Pre-calculate embedding text to pass to constructor
+                part_embedding_text = f"{raw_chunk.filepath}\n{part_header}\n{content_part}"
+
+                # Create new chunk with part suffix and ALL required fields
+                part_chunk = chunk_cls(
+                    id=f"{raw_chunk.id}_part{i}",
+                    content=content_part,
+                    filepath=raw_chunk.filepath,
+                    context_header=part_header,
+                    chunk_type=raw_chunk.chunk_type,        # Required: pass original type
+                    start_line=start_line,                  # Required: lines this part covers
+                    end_line=end_line,
+                    is_architecture_node=raw_chunk.is_architecture_node if i == 1 else False,
+                    embedding_text=part_embedding_text,     # Required: pass calculated text
+                    summary=raw_chunk.summary if i == 1 else f"{raw_chunk.summary} (continued)",
+                    file_type=raw_chunk.file_type
+                )
+
+                processed_chunks.append(part_chunk)
+        else:
+            # Chunk is fine, use as-is
+            processed_chunks.append(raw_chunk)
+
+    return prepared
+
+
+def init_chunk_worker():
+    """Process pool initializer: build the chunkers once per worker."""
+    get_factory()
+
+
+def bounded_map(executor: Executor, fn: Callable, items: Iterable, max_inflight: int) -> Iterator[Tuple]:
+    """
+    Run fn over items on executor, yielding (item, future) pairs as they complete.
+
+    At most max_inflight tasks are pending at once, so memory stays
+    proportional to the worker count instead of the number of items and
+    workers start on the first item without waiting for the rest.
+    """
+    inflight = {}
+    for item in items:
+        if len(inflight) >= max_inflight:
+            done, _ = wait(inflight, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield inflight.pop(future), future
+        inflight[executor.submit(fn, item)] = item
+
+    for future in as_completed(inflight):
+        yield inflight[future], future
+
 
 class IndexingPipeline:
     """
     Pipeline for indexing files with multi-language support.
 
     Uses the ChunkerFactory to select the appropriate chunker based on file extension.
+    An existing EmbeddingEngine can be passed in to share its provider
+    connections and caches (e.g. the MCP server's).
     """
 
-    def __init__(self, max_workers: int = 12):
+    def __init__(self, max_workers: int = 12, embeddings: Optional[EmbeddingEngine] = None):
         self.chunker_factory = get_factory()
-        self.embeddings = EmbeddingEngine(max_workers=max_workers, use_cache=True)
+        # An engine passed in belongs to the caller, who closes it
+        self._owns_embeddings = embeddings is None
+        self.embeddings = embeddings or EmbeddingEngine(max_workers=max_workers, use_cache=True)
 
         # Initialize DB with correct dimension from embedding engine
         self.db = LanceDBManager()
@@ -43,117 +196,166 @@ class IndexingPipeline:
 
         self.file_cache = FileHashCache()
 
-        self.chunk_queue = queue.Queue(maxsize=100)
-        self.embed_queue = queue.Queue(maxsize=50)
-        self._shutdown = False
+        # Worker processes for chunking large files, started on first use
+        self._process_pool: Optional[ProcessPoolExecutor] = None
+        self._process_pool_lock = threading.Lock()
+
+    def _get_process_pool(self) -> ProcessPoolExecutor:
+        with self._process_pool_lock:
+            if self._process_pool is None:
+                # Spawn rather than fork: this process has LanceDB (not fork
+                # safe), HTTP clients and watcher threads running
+                self._process_pool = ProcessPoolExecutor(
+                    max_workers=os.cpu_count() or 1,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=init_chunk_worker
+                )
+            return self._process_pool
+
+    def _prepare_routed(self, filepath: str) -> PreparedFile:
+        """
+        prepare_file() on a worker thread, handing large files to a worker
+        process after reading them (the read's fstat gives the size).
+        """
+        _get_chunker(filepath)
+        data, stat = read_file(filepath)
+        args = (filepath, data, stat.st_mtime, stat.st_size, stat.st_mtime_ns)
+        if stat.st_size >= PROCESS_POOL_MIN_FILE_BYTES:
+            return self._get_process_pool().submit(prepare_data, *args).result()
+        return prepare_data(*args)
+
+    def close(self):
+        """Stop the chunking worker processes, if any, and the engine this pipeline created."""
+        with self._process_pool_lock:
+            if self._process_pool is not None:
+                self._process_pool.shutdown(cancel_futures=True)
+                self._process_pool = None
+        if self._owns_embeddings:
+            self.embeddings.close()
 
     def is_supported(self, filepath: str) -> bool:
         """Check if file type is supported for indexing."""
         return self.chunker_factory.is_supported(filepath)
 
-    def process_file(self, filepath: str) -> Tuple[int, int, Optional[str]]:
-        """
-        Process a single file through the pipeline.
-        Returns (success: 0 or 1, chunk_count, error_message or None)
+    def prepare_file(self, filepath: str) -> PreparedFile:
+        """Read and chunk a file without embedding it (see prepare_file())."""
+        return prepare_file(filepath)
+
+    def embed_and_write(self, batch: List[PreparedFile]) -> List[Tuple[int, int, Optional[str]]]:
         """
-        try:
-            # Get chunker for this file type
-            chunker = self.chunker_factory.get_chunker(filepath)
-            if not chunker:
-                return 0, 0, f"Unsupported file type: {filepath}"
+        Embed the chunks of several prepared files in one embed_batch call,
+        then write them to the database together.
 
-            with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
-                content = f.read()
+        Returns a (success, chunk_count, error_message) tuple per file, in
+        batch order. Embedding failures propagate to the caller since they
+        affect the whole batch.
+        """
+        return self.write_batch(batch, self.embed_chunks(batch))
 
-            stat = os.stat(filepath)
-            content_hash = hashlib.sha256(content.encode()).hexdigest()[:32]
+    def embed_chunks(self, batch: List[PreparedFile]) -> Sequence[Sequence[float]]:
+        """
+        Embed every chunk of batch, in order, in one embed_batch call.
 
-            raw_chunks = chunker.chunk_file(filepath, content)
-            if not raw_chunks:
-                return 1, 0, None
+        Returns one row per chunk as a float32 array; write_batch() hands it
+        to LanceDB without going through Python float lists.
+        """
+        # Batch embed using embedding_text (includes context header)
+        texts = [c.embedding_text for prepared in batch for c in prepared.chunks]
+        return self.embeddings.embed_batch_np(texts, prefix="search_document: ")
 
-            # Split oversized chunks to avoid embedding truncation
-            # If a chunk's embedding_text is too long, split it into multiple chunks
-            processed_chunks = []
-            for raw_chunk in raw_chunks:
-                from .embeddings import split_text_into_chunks, MAX_EMBEDDING_TEXT_LENGTH
-
-                # Check if this chunk's embedding text is too long
-                if len(raw_chunk.embedding_text) > MAX_EMBEDDING_TEXT_LENGTH:
-                    # Split the content into multiple sub-chunks
-                    content_parts = split_text_into_chunks(raw_chunk.content, MAX_EMBEDDING_TEXT_LENGTH)
-
-                    logger.info(f"Split large chunk into {len(content_parts)} parts: {raw_chunk.context_header}")
-
-                    # Create a separate chunk for each part
-                    for i, content_part in enumerate(content_parts, 1):
-                        # Create modified context header to indicate part number
-                        part_header = f"{raw_chunk.context_header} [part {i}/{len(content_parts)}]"
-
-                        # Pre-calculate embedding text to pass to constructor
-                        part_embedding_text = f"{raw_chunk.filepath}\n{part_header}\n{content_part}"
-
-                        # Create new chunk with part suffix and ALL required fields
-                        part_chunk = type(raw_chunk)(
-                            id=f"{raw_chunk.id}_part{i}",
-                            content=content_part,
-                            filepath=raw_chunk.filepath,
-                            context_header=part_header,
-                            chunk_type=raw_chunk.chunk_type,        # Required: pass original type
-                            start_line=raw_chunk.start_line,        # Required: use original start line
-                            end_line=raw_chunk.end_line,            # Required: use original end line
-                            is_architecture_node=raw_chunk.is_architecture_node if i == 1 else False,
-                            embedding_text=part_embedding_text,     # Required: pass calculated text
-                            summary=raw_chunk.summary if i == 1 else f"{raw_chunk.summary} (continued)",
-                            file_type=raw_chunk.file_type
-                        )
-
-                        processed_chunks.append(part_chunk)
-                else:
-                    # Chunk is fine, use as-is
-                    processed_chunks.append(raw_chunk)
-
-            # Batch embed using embedding_text (includes context header)
-            texts = [c.embedding_text for c in processed_chunks]
-            embeddings = self.embeddings.embed_batch(texts, prefix="search_document: ")
-
-            # Build CodeChunk objects
-            chunks = []
-            for raw_chunk, embedding in zip(processed_chunks, embeddings):
-                chunk = CodeChunk(
-                    id=raw_chunk.id,
-                    content=raw_chunk.content,
-                    filepath=raw_chunk.filepath,
-                    context_header=raw_chunk.context_header,
-                    summary=raw_chunk.summary,
-                    is_architecture_node=raw_chunk.is_architecture_node,
-                    vector=embedding,
-                    file_type=raw_chunk.file_type
-                )
-                chunks.append(chunk)
+    def write_batch(
+        self, batch: List[PreparedFile], vectors: Sequence[Sequence[float]]
+    ) -> List[Tuple[int, int, Optional[str]]]:
+        """
+        Replace the database rows of every file in batch and record their hashes.
 
-            # Upsert to database
-            self.db.upsert_chunks(chunks, filepath)
+        vectors holds one embedding per chunk, in batch order. All files go
+        to LanceDB in a single write; if that fails the files are retried one
+        at a time so a single bad file does not fail the rest.
+        """
+        columns = {name: [] for name in (
+            "id", "content", "filepath", "context_header", "summary",
+            "is_architecture_node", "file_type"
+        )}
+        for prepared in batch:
+            for chunk in prepared.chunks:
+                columns["id"].append(chunk.id)
+                columns["content"].append(chunk.content)
+                columns["filepath"].append(chunk.filepath)
+                columns["context_header"].append(chunk.context_header)
+                columns["summary"].append(chunk.summary)
+                columns["is_architecture_node"].append(chunk.is_architecture_node)
+                columns["file_type"].append(chunk.file_type)
+
+        written = [prepared for prepared in batch if prepared.chunks]
+        try:
+            self.db.replace_files([prepared.filepath for prepared in written], columns, vectors)
+        except Exception as e:
+            if len(written) <= 1:
+                for prepared in written:
+                    self._log_error(prepared.filepath, e)
+                return [(0, 0, str(e)) if prepared.chunks else (1, 0, None) for prepared in batch]
+            return self._write_files_individually(batch, vectors)
+
+        self.file_cache.update_files_batch([
+            (p.filepath, p.content_hash, p.mtime, p.size, len(p.chunks), p.mtime_ns)
+            for p in written
+        ])
+        return [(1, len(prepared.chunks), None) for prepared in batch]
+
+    def _write_files_individually(
+        self, batch: List[PreparedFile], vectors: Sequence[Sequence[float]]
+    ) -> List[Tuple[int, int, Optional[str]]]:
+        """Fallback for write_batch: write each file on its own."""
+        results = []
+        offset = 0
+        for prepared in batch:
+            count = len(prepared.chunks)
+            if not count:
+                results.append((1, 0, None))
+                continue
+
+            results.extend(self.write_batch([prepared], vectors[offset:offset + count]))
+            offset += count
+
+        return results
+
+    @staticmethod
+    def _log_error(filepath: str, error: Exception):
+        # Only log full error for non-500 errors (500s are logged in embeddings)
+        if "500" not in str(error):
+            logger.error(f"Pipeline error for {filepath}: {error}")
 
-            # Update file hash cache
-            self.file_cache.update_file(
-                filepath, content_hash, stat.st_mtime, stat.st_size, len(chunks)
-            )
+    def process_file(self, filepath: str) -> Tuple[int, int, Optional[str]]:
+        """
+        Process a single file through the pipeline.
+        Returns (success: 0 or 1, chunk_count, error_message or None)
+        """
+        try:
+            prepared = self.prepare_file(filepath)
+            if not prepared.chunks:
+                return 1, 0, None
 
-            return 1, len(chunks), None
+            return self.embed_and_write([prepared])[0]
 
         except Exception as e:
             # Log error but don't crash - continue with other files
-            error_msg = str(e)
-            # Only log full error for non-500 errors (500s are logged in embeddings)
-            if "500" not in error_msg:
-                logger.error(f"Pipeline error for {filepath}: {e}")
-            return 0, 0, error_msg
+            self._log_error(filepath, e)
+            return 0, 0, str(e)
 
     def process_files_batch(self, filepaths: List[str], max_workers: int = 8) -> Tuple[int, int, int]:
         """
         Process multiple files in parallel.
         Returns (files_processed, total_chunks, files_failed)
+
+        Files are read and chunked in parallel, those of at least
+        PROCESS_POOL_MIN_FILE_BYTES in worker processes so their chunkers do
+        not take turns on the GIL. Their chunks are then embedded and written
+        EMBEDDING_BATCH_SIZE at a time across files, so the embedding backend
+        sees a few large requests instead of one per file.
+        The three stages overlap: workers keep chunking while a batch is
+        embedded, and each batch is written by a background thread (one
+        write in flight) while the next one is embedded.
         """
         if not filepaths:
             return 0, 0, 0
@@ -162,14 +364,64 @@ class IndexingPipeline:
         total_chunks = 0
         total_failed = 0
 
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            futures = {executor.submit(self.process_file, fp): fp for fp in filepaths}
-            for future in as_completed(futures):
-                success, chunks, error = future.result()
+        def tally(results):
+            nonlocal total_files, total_chunks, total_failed
+            for success, chunks, _ in results:
                 total_files += success
                 total_chunks += chunks
-                if not success:
-                    total_failed += 1
+                total_failed += not success
+
+        def failed(batch, error):
+            for prepared in batch:
+                self._log_error(prepared.filepath, error)
+            tally([(0, 0, str(error))] * len(batch))
+
+        write = None
+
+        def finish_write():
+            nonlocal write
+            if write is not None:
+                written, future = write
+                write = None
+                try:
+                    tally(future.result())
+                except Exception as e:
+                    failed(written, e)
+
+        def flush(batch):
+            nonlocal write
+            try:
+                vectors = self.embed_chunks(batch)
+            except Exception as e:
+                failed(batch, e)
+                return
+            finish_write()
+            write = (batch, writer.submit(self.write_batch, batch, vectors))
+
+        batch: List[PreparedFile] = []
+        batch_chunks = 0
+        with ThreadPoolExecutor(max_workers=max_workers) as executor, \
+                ThreadPoolExecutor(max_workers=1) as writer:
+            # Bounded so at most a few files' chunks wait in memory at once
+            prepared_files = bounded_map(executor, self._prepare_routed, filepaths, 2 * max_workers)
+            for filepath, future in prepared_files:
+                try:
+                    prepared = future.result()
+                except Exception as e:
+                    self._log_error(filepath, e)
+                    tally([(0, 0, str(e))])
+                    continue
+
+                batch.append(prepared)
+                batch_chunks += len(prepared.chunks)
+                if batch_chunks >= EMBEDDING_BATCH_SIZE:
+                    flush(batch)
+                    batch = []
+                    batch_chunks = 0
+
+            if batch:
+                flush(batch)
+            finish_write()
 
         return total_files, total_chunks, total_failed
 
@@ -177,6 +429,10 @@ class IndexingPipeline:
         """Filter to only files that have changed since last index"""
         return self.file_cache.get_changed_files(filepaths)
 
+    def iter_changed_files(self, filepaths: Iterable[str]) -> Iterator[str]:
+        """Streaming variant of get_changed_files"""
+        return self.file_cache.iter_changed_files(filepaths)
+
 
 class LibrarianWatcher(FileSystemEventHandler):
     """
@@ -189,12 +445,13 @@ class LibrarianWatcher(FileSystemEventHandler):
     - Better debouncing
     """
 
-    def __init__(self, root_dir: str, use_delta_indexing: bool = True):
+    def __init__(self, root_dir: str, use_delta_indexing: bool = True,
+                 embeddings: Optional[EmbeddingEngine] = None):
         self.root_dir = root_dir
         self.use_delta_indexing = use_delta_indexing
 
         # Shared pipeline
-        self.pipeline = IndexingPipeline(max_workers=12)
+        self.pipeline = IndexingPipeline(max_workers=12, embeddings=embeddings)
 
         # Direct access to pipeline components
         self.embeddings = self.pipeline.embeddings
@@ -204,10 +461,20 @@ class LibrarianWatcher(FileSystemEventHandler):
         self.architect = ArchitectAnalyzer()
         self.executor = ThreadPoolExecutor(max_workers=12)
 
-        # Debounce/Queue for Tier 2 (Architect)
-        self.pending_summaries = {}  # filepath -> timestamp
+        # Debounce/Queue for Tier 2 (Architect): filepath -> monotonic time of
+        # its last event, plus a min-heap of (ready_time, filepath) with one
+        # entry per pending file so the loop can sleep until the next deadline
+        self.pending_summaries: Dict[str, float] = {}
+        self._summary_heap: List[Tuple[float, str]] = []
+        self._summary_wakeup = threading.Event()
         self._lock = threading.Lock()
 
+        # Debounce for Tier 1 (hot path): filepath -> monotonic time of its
+        # last event, flushed by a single timer; flushes run one at a time
+        self._hot_pending: Dict[str, float] = {}
+        self._hot_timer: Optional[threading.Timer] = None
+        self._hot_flush_lock = threading.Lock()
+
     def on_modified(self, event):
         if event.is_directory:
             return
@@ -222,7 +489,7 @@ class LibrarianWatcher(FileSystemEventHandler):
         if not filename.endswith(".cs"):
             return
 
-        self.process_hot_path(filename)
+        self.schedule_hot_path(filename)
         self.schedule_cold_path(filename)
 
     def on_created(self, event):
@@ -234,11 +501,43 @@ class LibrarianWatcher(FileSystemEventHandler):
         Uses the optimized pipeline.
         Returns chunk count.
         """
-        success, chunks = self.pipeline.process_file(filepath)
+        success, chunks, _ = self.pipeline.process_file(filepath)
         if success:
             logger.info(f"[Hot Path] Indexed {filepath} ({chunks} chunks)")
         return chunks
 
+    def schedule_hot_path(self, filepath: str):
+        """Queue a file for the hot path once its events stop for HOT_PATH_DEBOUNCE_SECONDS"""
+        with self._lock:
+            self._hot_pending[filepath] = time.monotonic()
+            if self._hot_timer is None:
+                self._start_hot_timer(HOT_PATH_DEBOUNCE_SECONDS)
+
+    def _start_hot_timer(self, delay: float):
+        """Arm the hot path timer (caller holds self._lock)"""
+        self._hot_timer = threading.Timer(delay, self._flush_hot_path)
+        self._hot_timer.daemon = True
+        self._hot_timer.start()
+
+    def _flush_hot_path(self):
+        """Index every pending file that has been quiet long enough, in one batch"""
+        with self._lock:
+            self._hot_timer = None
+            now = time.monotonic()
+            ready = [fp for fp, ts in self._hot_pending.items()
+                     if now - ts >= HOT_PATH_DEBOUNCE_SECONDS]
+            for fp in ready:
+                del self._hot_pending[fp]
+            if self._hot_pending:
+                oldest = min(self._hot_pending.values())
+                self._start_hot_timer(max(0.0, oldest + HOT_PATH_DEBOUNCE_SECONDS - now))
+
+        if not ready:
+            return
+        with self._hot_flush_lock:
+            files, chunks, failed = self.pipeline.process_files_batch(ready)
+        logger.info(f"[Hot Path] Indexed {files} files ({chunks} chunks), {failed} failed")
+
     def process_files_parallel(self, filepaths: List[str], use_delta: bool = True) -> Tuple[int, int]:
         """
         Process multiple files in parallel with optional delta indexing.
@@ -256,32 +555,59 @@ class LibrarianWatcher(FileSystemEventHandler):
 
     def schedule_cold_path(self, filepath: str):
         """Schedule file for cold path (architect) processing"""
+        now = time.monotonic()
         with self._lock:
-            self.pending_summaries[filepath] = time.time()
+            queued = filepath in self.pending_summaries
+            self.pending_summaries[filepath] = now
+            if not queued:
+                heapq.heappush(self._summary_heap, (now + DEBOUNCE_SECONDS, filepath))
+                # Every deadline is now + DEBOUNCE_SECONDS, so only an empty
+                # heap means the loop is asleep without a deadline to wake for
+                if len(self._summary_heap) == 1:
+                    self._summary_wakeup.set()
+
+    def _pop_due_summaries(self) -> Tuple[List[str], Optional[float]]:
+        """
+        Pop files that have been quiet for DEBOUNCE_SECONDS.
+
+        Returns (due filepaths, seconds until the next deadline or None).
+        """
+        now = time.monotonic()
+        due = []
+        with self._lock:
+            while self._summary_heap and self._summary_heap[0][0] <= now:
+                _, fp = heapq.heappop(self._summary_heap)
+                ready_at = self.pending_summaries[fp] + DEBOUNCE_SECONDS
+                if ready_at > now:
+                    # Touched again since it was queued: move its deadline
+                    heapq.heappush(self._summary_heap, (ready_at, fp))
+                else:
+                    del self.pending_summaries[fp]
+                    due.append(fp)
+            delay = self._summary_heap[0][0] - now if self._summary_heap else None
+        return due, delay
 
     def run_cold_path_loop(self):
         """Background loop for cold path processing"""
         while True:
-            now = time.time()
-            to_process = []
-
-            with self._lock:
-                for fp, ts in list(self.pending_summaries.items()):
-                    if now - ts > DEBOUNCE_SECONDS:
-                        to_process.append(fp)
-                        del self.pending_summaries[fp]
+            # Clear before looking so a file scheduled meanwhile wakes the wait
+            self._summary_wakeup.clear()
+            to_process, delay = self._pop_due_summaries()
 
             for fp in to_process:
                 self.executor.submit(self._run_architect, fp)
 
-            time.sleep(1.0)
+            # Capped so the main thread still sees Ctrl+C promptly on Windows,
+            # where an untimed wait can't be interrupted
+            self._summary_wakeup.wait(1.0 if delay is None else min(delay, 1.0))
 
     def _run_architect(self, filepath: str):
         """Run architect analysis on a file (cold path)"""
         try:
             logger.info(f"[Cold Path] Architect analyzing {filepath}...")
+            # The prompt is truncated anyway, so don't read past that point
             with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
-                content = f.read()
+                content = f.read(SUMMARY_MAX_CHARS)
 
             summary = self.architect.generate_summary(content)
             if summary:
@@ -298,10 +624,19 @@ class LibrarianWatcher(FileSystemEventHandler):
             "files": self.pipeline.file_cache.get_stats()
         }
 
+    def close(self):
+        """Cancel pending hot path work and stop the worker threads and processes."""
+        with self._lock:
+            if self._hot_timer is not None:
+                self._hot_timer.cancel()
+                self._hot_timer = None
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        self.pipeline.close()
+
 
-def start_watching(path: str):
-    """Start the file watcher"""
-    event_handler = LibrarianWatcher(path)
+def start_watching(path: str, embeddings: Optional[EmbeddingEngine] = None):
+    """Start the file watcher (reusing embeddings, if given)"""
+    event_handler = LibrarianWatcher(path, embeddings=embeddings)
     observer = Observer()
     observer.schedule(event_handler, path, recursive=True)
     observer.start()
@@ -310,4 +645,6 @@ def start_watching(path: str):
         event_handler.run_cold_path_loop()
     except KeyboardInterrupt:
         observer.stop()
-    observer.join()
+        observer.join()
+    finally:
+        event_handler.close()
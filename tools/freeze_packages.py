@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Freeze the package list declared in pyproject.toml.
+
+setuptools used to discover packages on every build; the layout rarely
+changes, so we walk the tree once here and write the result to the
+[tool.setuptools] packages key. Run this after adding or removing a
+package, and with --check in CI to make sure the declared list is still
+accurate.
+"""
+
+import argparse
+import re
+import sys
+from pathlib import Path
+
+from setuptools import find_namespace_packages
+
+ROOT = Path(__file__).resolve().parent.parent
+PYPROJECT = ROOT / "pyproject.toml"
+
+# The generated list always sits directly under the [tool.setuptools] header
+PACKAGES_RE = re.compile(r"(\[tool\.setuptools\]\n)packages = \[.*?\]\n", re.DOTALL)
+
+
+def discover() -> list:
+    """Find all packages under src/."""
+    packages = find_namespace_packages(
+        where=str(ROOT), include=["src", "src.*"], exclude=["*.__pycache__"]
+    )
+    return sorted(packages)
+
+
+def render(packages: list) -> str:
+    lines = ["packages = ["]
+    lines.extend(f'    "{name}",' for name in packages)
+    lines.append("]\n")
+    return "\n".join(lines)
+
+
+def update(text: str, packages: list) -> str:
+    """Return pyproject text with the packages list replaced (or added)."""
+    block = render(packages)
+    if PACKAGES_RE.search(text):
+        return PACKAGES_RE.sub(lambda m: m.group(1) + block, text, count=1)
+    return text.rstrip("\n") + "\n\n[tool.setuptools]\n" + block
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--check", action="store_true",
+        help="Exit non-zero if pyproject.toml is out of date instead of rewriting it"
+    )
+    args = parser.parse_args()
+
+    current = PYPROJECT.read_text(encoding="utf-8")
+    expected = update(current, discover())
+
+    if args.check:
+        if current != expected:
+            print("pyproject.toml package list is out of date, run: "
+                  "python tools/freeze_packages.py")
+            return 1
+        return 0
+
+    if current != expected:
+        PYPROJECT.write_text(expected, encoding="utf-8")
+        print(f"Updated {PYPROJECT.name}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())